@@ -186,9 +186,13 @@ class AutoPlotMainWindow(PlotWindow):
         """
         When closing the inspectr window, do some house keeping:
         * stop the monitor, if running
+        * close the nodes, which stops their worker threads
         """
         if self.monitorToolBar is not None:
             self.monitorToolBar.stop()
+        for node in list(self.fc.nodes().values()):
+            if isinstance(node, Node):
+                node.close()
         return super().closeEvent(event)
 
     def showTime(self) -> None:
@@ -320,6 +324,9 @@ def autoplotQcodesDataset(log: bool = False,
         ('Scale units', ScaleUnits),
         ('plot', PlotNode)
     )
+    # gridding large datasets can take a while, don't block the GUI meanwhile.
+    fc.nodes()['Grid'].processInThread = True
+    fc.nodes()['Grid'].incremental = True
 
     widgetOptions = {
         "Data selection": dict(visible=True,
@@ -339,7 +346,9 @@ def autoplotQcodesDataset(log: bool = False,
 
 def autoplotDDH5(filepath: str = '',
                  groupname: str = 'data',
-                 plotWidgetClass: Optional[Type[PlotWidget]] = None) \
+                 plotWidgetClass: Optional[Type[PlotWidget]] = None,
+                 lazy: bool = False,
+                 swmr: bool = False) \
         -> Tuple[Flowchart, AutoPlotMainWindow]:
 
     fc = linearFlowchart(
@@ -350,6 +359,11 @@ def autoplotDDH5(filepath: str = '',
         ('Dimension assignment', XYSelector),
         ('plot', PlotNode)
     )
+    # gridding large datasets can take a while, don't block the GUI meanwhile.
+    fc.nodes()['Grid'].processInThread = True
+    # incremental gridding would read all lazy data into memory.
+    fc.nodes()['Grid'].incremental = not lazy
+    fc.nodes()['Histogram'].processInThread = True
 
     widgetOptions = {
         "Data selection": dict(visible=True,
@@ -367,6 +381,9 @@ def autoplotDDH5(filepath: str = '',
                              plotWidgetClass=plotWidgetClass)
     win.show()
 
+    fc.nodes()['Data loader'].incremental = True
+    fc.nodes()['Data loader'].lazy = lazy
+    fc.nodes()['Data loader'].swmr = swmr
     fc.nodes()['Data loader'].filepath = filepath
     fc.nodes()['Data loader'].groupname = groupname
     win.refreshData()
@@ -385,9 +402,9 @@ def autoplotDDH5App(*args: Any) -> Tuple[Flowchart, AutoPlotMainWindow]:
         return autoplotDDH5(filepath, groupname)  # use default backend
 
 
-def main(f: str, g: str) -> int:
+def main(f: str, g: str, lazy: bool = False, swmr: bool = False) -> int:
     app = QtWidgets.QApplication([])
-    fc, win = autoplotDDH5(f, g)
+    fc, win = autoplotDDH5(f, g, lazy=lazy, swmr=swmr)
 
     return app.exec_()
 
@@ -400,6 +417,12 @@ def script() -> None:
                         default='')
     parser.add_argument('--groupname', help='group in the hdf5 file',
                         default='data')
+    parser.add_argument('--lazy', action='store_true',
+                        help='read data from the file only when needed '
+                             '(for files that do not fit into memory)')
+    parser.add_argument('--swmr', action='store_true',
+                        help='read the file in SWMR mode '
+                             '(for files written by a DDH5Writer in SWMR mode)')
     args = parser.parse_args()
 
-    main(args.filepath, args.groupname)
+    main(args.filepath, args.groupname, args.lazy, args.swmr)
@@ -14,6 +14,7 @@ import importlib
 import logging
 import re
 import pprint
+import threading
 import json
 from enum import Enum, auto
 from pathlib import Path
@@ -25,6 +26,7 @@ from typing import (
     Any,
     Union,
     Generator,
+    Set,
     Iterable,
     Tuple,
     Sequence,
@@ -33,7 +35,7 @@ from typing import (
 from functools import partial
 from itertools import cycle
 
-from watchdog.events import FileSystemEvent, FileSystemMovedEvent
+from watchdog.events import FileSystemEvent, FileSystemMovedEvent, FileCreatedEvent, FileDeletedEvent
 
 from .. import log as plottrlog
 from .. import QtCore, QtWidgets, Signal, Slot, QtGui, plottrPath
@@ -44,6 +46,7 @@ from ..data.datadict_storage import all_datadicts_from_hdf5, datadict_from_hdf5
 from ..data.datadict import DataDict
 from ..utils.misc import unwrap_optional
 from ..apps.watchdog_classes import WatcherClient
+from ..apps.monitr_index import FolderIndex, default_index_path
 from ..gui.widgets import Collapsible
 from .json_viewer import JsonModel, JsonTreeView
 from ..icons import (
@@ -193,7 +196,7 @@ class Item(QtGui.QStandardItem):
         self.path = path
         self.files = {}
         self.tags: List[str] = []
-        self.tags_widget = ItemTagLabel(self.tags)
+        self._tags_widget: Optional[ItemTagLabel] = None
         self.star = False
         self.trash = False
         self.complete = False
@@ -244,10 +247,18 @@ class Item(QtGui.QStandardItem):
                 self.interrupted = True
                 self.tags.remove("__interrupted__")
 
-            self.tags_widget = ItemTagLabel(self.tags)
-
         self.setText(str(self.path.name))
 
+    @property
+    def tags_widget(self) -> "ItemTagLabel":
+        """
+        The widget displaying the tags of the item. It only gets created once it is needed, i.e., when the item is
+        shown in a view.
+        """
+        if self._tags_widget is None:
+            self._tags_widget = ItemTagLabel(self.tags)
+        return self._tags_widget
+
     def add_file(self, path: Path) -> None:
         """
         Adds a file to the item files. If the file is a tag, changes the widget and runs the model tags_changed
@@ -257,6 +268,7 @@ class Item(QtGui.QStandardItem):
         """
         file_type = ContentType.sort(path)
         self.files[path] = file_type
+        self._update_filter_index()
 
         if file_type == ContentType.tag:
             model = self.model()
@@ -328,7 +340,8 @@ class Item(QtGui.QStandardItem):
 
             else:
                 self.tags.append(path.stem)
-                self.tags_widget.add_tag(path.stem)
+                if self._tags_widget is not None:
+                    self._tags_widget.add_tag(path.stem)
                 model.tag_added(path.stem)
 
             model.item_files_changed(self)
@@ -342,13 +355,15 @@ class Item(QtGui.QStandardItem):
         """
         file_type = ContentType.sort(path)
         self.files.pop(path)
+        self._update_filter_index()
         if file_type == ContentType.tag:
             model = self.model()
             assert isinstance(model, FileModel)
 
             if path.stem in self.tags:
                 self.tags.remove(path.stem)
-                self.tags_widget.delete_tag(path.stem)
+                if self._tags_widget is not None:
+                    self._tags_widget.delete_tag(path.stem)
                 model.tag_deleted(path.stem)
 
             if path.name == "__star__.tag":
@@ -362,6 +377,14 @@ class Item(QtGui.QStandardItem):
 
             model.item_files_changed(self)
 
+    def _update_filter_index(self) -> None:
+        """
+        Updates the entries of this item in the filter index of its model.
+        """
+        model = self.model()
+        if isinstance(model, FileModel):
+            model.filter_index.update_item(self)
+
     def change_path(self, path: Path) -> None:
         """Changes the internal path of the item as well as the text of it."""
         self.path = path
@@ -381,15 +404,148 @@ class Item(QtGui.QStandardItem):
                 model = self.model()
                 assert isinstance(model, FileModel)
                 del model.main_dictionary[self.path]
+                model.filter_index.remove_item(self.path)
                 parent.removeRow(self.row())
 
     def create_tags(self) -> None:
         """
         Creates the tags widget. When filtering the widgets gets deleted.
         """
-        # Deleting the tags_widget widget.
-        self.tags_widget = None  # type: ignore[assignment] # This variable gets re populated immediately afterwards.
-        self.tags_widget = ItemTagLabel(self.tags)
+        self._tags_widget = ItemTagLabel(self.tags)
+
+
+class FilterIndex:
+    """
+    Inverted index of the items of a FileModel, used by the FilterWorker to find the candidates for a query without
+    checking every item.
+
+    It holds:
+        * For every content type, the names of the files of that type, with the set of paths of the items
+          that contain a file with that name.
+        * For every trigram (3 consecutive characters, lower case) of the item paths relative to the monitored folder,
+          the set of paths of the items that contain it.
+
+    The index gives candidates only, matches still need to be checked against the items themselves. Items that got
+    removed from the model but not from the index are therefore harmless.
+
+    The index is changed by the GUI thread and queried by the FilterWorker thread, all access goes through a lock.
+    Queries return new sets that the caller owns.
+
+    :param monitor_path: The monitored folder.
+    """
+
+    #: Characters that have a special meaning in a regular expression. Queries without them are literal strings.
+    regex_characters = set(".^$*+?{}[]\\|()")
+
+    def __init__(self, monitor_path: Path):
+        self.monitor_path = monitor_path
+        self.root_str = str(monitor_path).lower() + os.sep
+        self.file_names: Dict[ContentType, Dict[str, Set[Path]]] = {}
+        self.trigrams: Dict[str, Set[Path]] = {}
+        # What has been indexed for each item path, so that entries can be removed again.
+        self.entries: Dict[Path, Tuple[List[Tuple[ContentType, str]], Set[str]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trigrams(text: str) -> Set[str]:
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def _relative_name(self, path: Path) -> str:
+        path_str = str(path).lower()
+        if path_str.startswith(self.root_str):
+            return path_str[len(self.root_str) :]
+        return path_str
+
+    def clear(self) -> None:
+        with self._lock:
+            self.file_names = {}
+            self.trigrams = {}
+            self.entries = {}
+
+    def update_item(self, item: "Item") -> None:
+        """
+        Adds an item to the index, or updates its entries after its path or files changed.
+
+        :param item: The item to index.
+        """
+        files = [
+            (file_type, file.name) for file, file_type in item.files.items()
+        ]
+        trigrams = self._trigrams(self._relative_name(item.path))
+        with self._lock:
+            self._remove_entries(item.path)
+            for file_type, name in files:
+                self.file_names.setdefault(file_type, {}).setdefault(
+                    name, set()
+                ).add(item.path)
+            for trigram in trigrams:
+                self.trigrams.setdefault(trigram, set()).add(item.path)
+            self.entries[item.path] = (files, trigrams)
+
+    def remove_item(self, path: Path) -> None:
+        """
+        Removes the entries of the item with `path` from the index.
+
+        :param path: The path of the item.
+        """
+        with self._lock:
+            self._remove_entries(path)
+
+    def _remove_entries(self, path: Path) -> None:
+        if path not in self.entries:
+            return
+        files, trigrams = self.entries.pop(path)
+        for file_type, name in files:
+            paths = self.file_names[file_type][name]
+            paths.discard(path)
+            if not paths:
+                del self.file_names[file_type][name]
+        for trigram in trigrams:
+            paths = self.trigrams[trigram]
+            paths.discard(path)
+            if not paths:
+                del self.trigrams[trigram]
+
+    def name_candidates(self, query: str) -> Optional[Set[Path]]:
+        """
+        Gets the paths of the items whose path might match the name query.
+
+        :param query: The query, a regular expression that is searched in the path of the items.
+        :return: Set with the candidate paths, or None if the index cannot narrow down the candidates (e.g., because
+            the query is not a literal string).
+        """
+        query = query.lower()
+        if len(query) < 3 or any(c in self.regex_characters for c in query):
+            return None
+        # Matches that overlap with the path of the monitored folder cannot be found with the index.
+        if query in self.root_str or any(
+            self.root_str.endswith(query[:i]) for i in range(1, len(query))
+        ):
+            return None
+
+        candidates: Optional[Set[Path]] = None
+        with self._lock:
+            for trigram in self._trigrams(query):
+                paths = self.trigrams.get(trigram, set())
+                candidates = set(paths) if candidates is None else candidates & paths
+                if not candidates:
+                    return set()
+        return candidates
+
+    def file_candidates(self, file_type: ContentType, query: str) -> Set[Path]:
+        """
+        Gets the paths of the items that contain a file of type `file_type` whose name matches the query.
+
+        :param file_type: The content type of the files.
+        :param query: The query, a regular expression that is searched in the file names.
+        """
+        match_pattern = re.compile(query, flags=re.IGNORECASE)
+        candidates: Set[Path] = set()
+        with self._lock:
+            for name, paths in self.file_names.get(file_type, {}).items():
+                if match_pattern.search(name):
+                    candidates.update(paths)
+        return candidates
 
 
 class FileModel(QtGui.QStandardItemModel):
@@ -404,6 +560,13 @@ class FileModel(QtGui.QStandardItemModel):
     :param columns: The number of initial columns.
     :param Parent: The parent of the model.
     :param watcher_on: If False, the model will not start the watcher.
+    :param index_path: Location of a persistent index of the monitored folder (see
+        :class:`~plottr.apps.monitr_index.FolderIndex`). If given, the model is loaded from the index, and only folders
+        that have changed since the index was last updated are scanned. If ``None``, the whole monitored folder is
+        walked on every load.
+    :param lazy: If True, only the items of the top level folders are created when loading. The children of an item
+        are created when the item is expanded in a view (see ``canFetchMore`` and ``fetchMore``), or when they are
+        needed otherwise, e.g., because a file in them changed.
     """
 
     # Signal(Path) -- Emitted when there has been an update to the currently selected folder.
@@ -449,14 +612,26 @@ class FileModel(QtGui.QStandardItemModel):
         columns: int,
         parent: Optional[Any] = None,
         watcher_on: bool = True,
+        index_path: Optional[Union[str, Path]] = None,
+        lazy: bool = False,
     ):
         super().__init__(rows, columns, parent=parent)
         self.monitor_path = Path(monitor_path)
+        self.lazy = lazy
+
+        # Children of items that have not been created yet, with the path of the parent item as key. Values are
+        # dictionaries with the path of the child folder as key and its files dictionary (or None, if the folder does
+        # not contain data itself) as value.
+        self.pending_children: Dict[Path, Dict[Path, Optional[Dict[Path, ContentType]]]] = {}
+        self.folder_index: Optional[FolderIndex] = None
+        if index_path is not None:
+            self.folder_index = FolderIndex(self.monitor_path, index_path)
         self.header_labels = ["File path", "Tags"]
         self.currently_selected_folder = None
 
         # The main dictionary has all the datasets (folders) Path as keys, with the actual item as its value.
         self.main_dictionary: Dict[Path, Item] = {}
+        self.filter_index = FilterIndex(self.monitor_path)
         self.tags_dict: Dict[str, int] = {}
         self.tags_model = QtGui.QStandardItemModel()
         self.tags_model.dataChanged.connect(self.on_checked_tag_change)
@@ -519,17 +694,36 @@ class FileModel(QtGui.QStandardItemModel):
         """
         self.clear()
         self.main_dictionary = {}
-        self.load_data()
+        self.filter_index.clear()
+        self.pending_children = {}
+        self.load_data(rescan=True)
         self.model_refreshed.emit()
 
-    def load_data(self) -> None:
+    def load_data(self, rescan: bool = False) -> None:
         """
         Goes through all the files in the monitor path and loads the model.
+
+        If the model has an index, the files are taken from the index instead. Only the folders that contain other
+        folders are checked for changes, unless the index is empty or `rescan` is True, in which case the whole
+        monitored folder is walked and the index rebuilt.
+
+        :param rescan: If True, rebuild the index before loading.
         """
         # Sets the header data.
         self.setHorizontalHeaderLabels(self.header_labels)
 
-        walk_results = [i for i in os.walk(self.monitor_path)]
+        walk_results: List[Tuple[str, List[str], List[str]]]
+        if self.folder_index is not None:
+            if rescan or self.folder_index.is_empty():
+                self.folder_index.rebuild()
+            else:
+                self.folder_index.validate_parents()
+            walk_results = [
+                (str(folder), [], [file.name for file in files])
+                for folder, files in self.folder_index.folder_files().items()
+            ]
+        else:
+            walk_results = [i for i in os.walk(self.monitor_path)]
 
         # Sorts the results of the walk. Creates a dictionary of all the current files and directories in the
         # monitor_path with the following structure:
@@ -547,7 +741,129 @@ class FileModel(QtGui.QStandardItemModel):
         }
 
         for folder_path, files_dict in data_dictionary.items():
-            self.sort_and_add_item(folder_path, files_dict)
+            if self.lazy and folder_path.parent != self.monitor_path:
+                self._defer_item(folder_path, files_dict)
+            else:
+                self.sort_and_add_item(folder_path, files_dict)
+
+    def _defer_item(self, folder_path: Path, files_dict: Dict[Path, ContentType]) -> None:
+        """
+        Registers `folder_path` as a child that will be created once its parent gets expanded. Folders between it
+        and the top level folder are registered as well, and the top level folder item is created if needed.
+
+        :param folder_path: The path of the folder.
+        :param files_dict: The files dictionary of the folder, see ``sort_and_add_item``.
+        """
+        if any(part.startswith(".") for part in folder_path.parts):
+            return
+
+        self.pending_children.setdefault(folder_path.parent, {})[folder_path] = files_dict
+        parent = folder_path.parent
+        while parent.parent != self.monitor_path:
+            siblings = self.pending_children.setdefault(parent.parent, {})
+            if parent in siblings:
+                return
+            siblings[parent] = None
+            parent = parent.parent
+
+        if parent not in self.main_dictionary:
+            self.sort_and_add_item(parent, self._folder_files(parent))
+
+    @staticmethod
+    def _folder_files(folder_path: Path) -> Dict[Path, ContentType]:
+        return {
+            file: ContentType.sort(file)
+            for file in folder_path.iterdir()
+            if file.is_file()
+        }
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        """
+        Override of QStandardItemModel. Items whose children have not been created yet have children too.
+        """
+        if self.canFetchMore(parent):
+            return True
+        return super().hasChildren(parent)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """
+        Override of QStandardItemModel. Returns True if the children of the item at `parent` have not been
+        created yet.
+        """
+        if not self.pending_children or not parent.isValid():
+            return False
+        item = self.itemFromIndex(parent)
+        return isinstance(item, Item) and item.path in self.pending_children
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """
+        Override of QStandardItemModel. Creates the children of the item at `parent`.
+        """
+        item = self.itemFromIndex(parent)
+        if isinstance(item, Item):
+            self.fetch_children(item.path)
+
+    def fetch_children(self, folder_path: Path) -> None:
+        """
+        Creates the items for the children of the item of `folder_path` that have not been created yet.
+
+        :param folder_path: The path of the parent item.
+        """
+        children = self.pending_children.pop(folder_path, {})
+        for child_path, files_dict in sorted(children.items()):
+            if child_path in self.main_dictionary or not child_path.is_dir():
+                continue
+            if files_dict is None:
+                files_dict = self._folder_files(child_path)
+            self.sort_and_add_item(child_path, files_dict)
+
+    def fetch_all(self) -> None:
+        """
+        Creates all items that have not been created yet.
+        """
+        while self.pending_children:
+            self.fetch_children(min(self.pending_children))
+
+    def fetch_path(self, path: Path) -> None:
+        """
+        Makes sure that the items of all the folders leading to `path` have been created, if they are known to the
+        model.
+
+        :param path: Path of a file or folder in the monitored folder.
+        """
+        if not self.pending_children:
+            return
+        for parent in reversed(path.parents):
+            if parent in self.pending_children:
+                self.fetch_children(parent)
+
+    def _forget_pending_children(self, folder_path: Path) -> None:
+        """
+        Removes all children of `folder_path` that have not been created yet.
+        """
+        for parent in [p for p in self.pending_children if _is_relative_to(p, folder_path)]:
+            del self.pending_children[parent]
+
+    def _move_pending_children(self, src_path: Path, dest_path: Path) -> None:
+        """
+        Updates the paths of children that have not been created yet after the folder `src_path` got moved to
+        `dest_path`.
+        """
+
+        def rebase(path: Path) -> Path:
+            if _is_relative_to(path, src_path):
+                return dest_path.joinpath(path.relative_to(src_path))
+            return path
+
+        self.pending_children = {
+            rebase(parent): {
+                rebase(child): (
+                    None if files is None else {rebase(f): t for f, t in files.items()}
+                )
+                for child, files in children.items()
+            }
+            for parent, children in self.pending_children.items()
+        }
 
     def sort_and_add_item(
         self, folder_path: Path, files_dict: Optional[Dict] = None
@@ -630,6 +946,7 @@ class FileModel(QtGui.QStandardItemModel):
 
         self.new_item.emit(item)
         self.main_dictionary[folder_path] = item
+        self.filter_index.update_item(item)
         if parent_path is None:
             row = self.rowCount()
             self.setItem(row, 0, item)
@@ -649,6 +966,8 @@ class FileModel(QtGui.QStandardItemModel):
         # LOGGER.debug(f'file created: {event}')
 
         path = Path(str(event.src_path))
+        self._update_index(path)
+        self.fetch_path(path)
         # If a folder is created, it will be added when a data file will be created.
         if not path.is_dir() and not any(part.startswith(".") for part in path.parts):
             # If the file created is a lock, we ignore it.
@@ -697,12 +1016,16 @@ class FileModel(QtGui.QStandardItemModel):
         # LOGGER.debug(f'file deleted: {event}')
 
         path = Path(str(event.src_path))
+        self._update_index(path)
+        self.fetch_path(path)
+        self._forget_pending_children(path)
         # If the path deleted it's a folder, then it should be in the mian dictionary, or we don't care about it.
         if path in self.main_dictionary:
             item = self.main_dictionary[path]
 
             self._delete_all_children_from_main_dictionary(item)
             del self.main_dictionary[path]
+            self.filter_index.remove_item(path)
 
             # Checks if we need to remove a row from a parent item or the root model itself.
             if item.parent() is None:
@@ -734,6 +1057,7 @@ class FileModel(QtGui.QStandardItemModel):
                                 else:
                                     parent.parent().removeRow(parent.row())
                                 del self.main_dictionary[parent.path]
+                                self.filter_index.remove_item(parent.path)
                         else:
                             parent.delete_file(path)
                     # Send signal indicating that current folder requires update.
@@ -763,6 +1087,7 @@ class FileModel(QtGui.QStandardItemModel):
                 if child_item.hasChildren():
                     self._delete_all_children_from_main_dictionary(child_item)
                 del self.main_dictionary[child_item.path]
+                self.filter_index.remove_item(child_item.path)
 
     @Slot(FileSystemEvent)
     def on_file_moved(self, event: FileSystemMovedEvent) -> None:
@@ -783,13 +1108,20 @@ class FileModel(QtGui.QStandardItemModel):
         ):
             src_path = Path(str(event.src_path))
             dest_path = Path(str(event.dest_path))
+            self._update_index(src_path, dest_path)
+            if event.is_directory:
+                self._move_pending_children(src_path, dest_path)
+            self.fetch_path(src_path)
+            self.fetch_path(dest_path)
 
             # If a directory is moved, only need to change the old path for the new path
             if event.is_directory:
                 if src_path in self.main_dictionary:
                     changed_item = self.main_dictionary.pop(src_path)
                     self.main_dictionary[dest_path] = changed_item
+                    self.filter_index.remove_item(src_path)
                     changed_item.change_path(dest_path)
+                    self.filter_index.update_item(changed_item)
 
             # Checking for a file becoming a data file.
             elif not SupportedDataTypes.check_valid_data(
@@ -801,10 +1133,12 @@ class FileModel(QtGui.QStandardItemModel):
                     parent = self.main_dictionary[src_path.parent]
                     del parent.files[src_path]
                     parent.files[dest_path] = ContentType.sort(dest_path)
+                    self.filter_index.update_item(parent)
                 elif dest_path.parent in self.main_dictionary:
                     parent = self.main_dictionary[dest_path.parent]
                     del parent.files[src_path]
                     parent.files[dest_path] = ContentType.sort(dest_path)
+                    self.filter_index.update_item(parent)
 
                 # New folder to keep track.
                 else:
@@ -828,6 +1162,7 @@ class FileModel(QtGui.QStandardItemModel):
                 if parent is not None:
                     del parent.files[src_path]
                     parent.files[dest_path] = ContentType.sort(dest_path)
+                    self.filter_index.update_item(parent)
 
                     # Checks if there are other data files in the parent.
                     parent_files = [key for key in parent.files.keys()]
@@ -838,6 +1173,7 @@ class FileModel(QtGui.QStandardItemModel):
                         # If the parent has other children, it means there are more data files down the file tree
                         # and the model should keep track of these folders.
                         del self.main_dictionary[parent.path]
+                        self.filter_index.remove_item(parent.path)
 
                         # Checks if we need to remove a row from a parent item or the root model itself.
                         if parent.parent() is None:
@@ -955,6 +1291,7 @@ class FileModel(QtGui.QStandardItemModel):
         """
         self.removeRow(row)
         del self.main_dictionary[path]
+        self.filter_index.remove_item(path)
 
     def update_currently_selected_folder(self, path: Path) -> None:
         """
@@ -964,10 +1301,46 @@ class FileModel(QtGui.QStandardItemModel):
         :param path: The path of the currently selected folder.
         """
         if path in self.main_dictionary:
-            item = self.main_dictionary[path]
-            self.modified_exceptions = self._get_all_files_of_item(item)
+            self._validate_index(path)
+            # validating may have removed the folder if it no longer contains data.
+            item = self.main_dictionary.get(path)
+            if item is not None:
+                self.modified_exceptions = self._get_all_files_of_item(item)
         self.currently_selected_folder = path
 
+    def _update_index(self, *paths: Path) -> None:
+        """
+        Updates the index entries of the folders containing `paths` after a change reported by the watcher.
+
+        :param paths: The paths of the files or folders that have been created, deleted or moved.
+        """
+        if self.folder_index is None:
+            return
+        for path in paths:
+            if is_file_lock(path) or any(part.startswith(".") for part in path.parts):
+                continue
+            self.folder_index.update_folder(path.parent)
+
+    def _validate_index(self, path: Path) -> None:
+        """
+        Checks the folder `path` and all its children in the model for changes that happened while they were not
+        watched (i.e., when monitr was not running), and updates the model accordingly.
+
+        :param path: The path of the folder to check.
+        """
+        if self.folder_index is None:
+            return
+        folders = [path] + [p for p in self.main_dictionary if _is_relative_to(p, path) and p != path]
+        for folder in self.folder_index.validate(folders):
+            if folder not in self.main_dictionary:
+                continue
+            known = set(self.main_dictionary[folder].files.keys())
+            present = set(self.folder_index.files(folder))
+            for file in present - known:
+                self.on_file_created(FileCreatedEvent(str(file)))
+            for file in known - present:
+                self.on_file_deleted(FileDeletedEvent(str(file)))
+
     def _get_all_files_of_item(
         self, item: Item, partial_list: List[Path] = []
     ) -> List[Path]:
@@ -1109,8 +1482,11 @@ class FileModel(QtGui.QStandardItemModel):
 
     def quit(self) -> None:
         """
-        Stops the watcher and the watcher thread.
+        Stops the watcher and the watcher thread, and closes the index.
         """
+        if self.folder_index is not None:
+            self.folder_index.close()
+            self.folder_index = None
         self.watcher.observer.stop()
         assert self.watcher_thread is not None
         self.watcher_thread.quit()
@@ -1261,6 +1637,7 @@ class FileTreeView(QtWidgets.QTreeView):
         self.model_.new_tag.connect(self.on_add_tag_action)
         self.model_.tag_deleted_signal.connect(self.on_delete_tag_action)
         self.model_.item_files_updated.connect(self.on_adjust_column_width)
+        self.expanded.connect(self.on_item_expanded)
         # self.model_.model_refreshed.connect(self.set_all_tags)
 
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
@@ -1290,7 +1667,8 @@ class FileTreeView(QtWidgets.QTreeView):
 
     def set_all_tags(self) -> None:
         """
-        Sets the tag label widget for all the rows.
+        Sets the tag label widget for all the visible rows. Rows become visible when their parent gets expanded, the
+        tag widgets for these are set in ``on_item_expanded``.
         """
         for i in range(self.model_.rowCount()):
             item = self.model_.item(i, 0)
@@ -1300,8 +1678,8 @@ class FileTreeView(QtWidgets.QTreeView):
 
     def _set_widget_for_item_and_children(self, item: Item) -> None:
         """
-        Helper function of set_all_tags, goes through the passed item and all of its children and sets all of the
-        tag widget from column 0 for the items in row 1.
+        Helper function of set_all_tags, goes through the passed item and all of its visible children and sets all of
+        the tag widget from column 0 for the items in row 1.
 
         :param item: The item that its setting the widget for.
         """
@@ -1313,14 +1691,45 @@ class FileTreeView(QtWidgets.QTreeView):
 
         tags_index = self.model_.indexFromItem(tags_item)
         proxy_tag_index = self.proxy_model.mapFromSource(tags_index)
+        # Rows that are hidden by the filtering do not need a widget.
+        if not proxy_tag_index.isValid():
+            return
         item.create_tags()  # The tags get created every time because they get deleted after filtering.
         self.setIndexWidget(proxy_tag_index, item.tags_widget)
-        if item.hasChildren():
+        if item.hasChildren() and self.isExpanded(proxy_tag_index.siblingAtColumn(0)):
             for i in range(item.rowCount()):
                 child = item.child(i)
                 assert isinstance(child, Item)
                 self._set_widget_for_item_and_children(child)
 
+    @Slot(QtCore.QModelIndex)
+    def on_item_expanded(self, proxy_index: QtCore.QModelIndex) -> None:
+        """
+        Gets called when an item gets expanded. Creates the children of the item in the model if they do not exist
+        yet, and sets the tag widgets for them.
+
+        :param proxy_index: The proxy index of the expanded item.
+        """
+        source_index = self.proxy_model.mapToSource(proxy_index)
+        if self.model_.canFetchMore(source_index):
+            self.model_.fetchMore(source_index)
+        item = self.model_.itemFromIndex(source_index)
+        if isinstance(item, Item):
+            for i in range(item.rowCount()):
+                child = item.child(i)
+                assert isinstance(child, Item)
+                self._set_widget_for_item_and_children(child)
+        self.on_adjust_column_width()
+
+    @Slot()
+    def expand_all(self) -> None:
+        """
+        Creates all the items of the model and expands them.
+        """
+        self.model_.fetch_all()
+        self.expandAll()
+        self.set_all_tags()
+
     @Slot(QtCore.QPoint)
     def on_context_menu_requested(self, pos: QtCore.QPoint) -> None:
         """
@@ -1531,14 +1940,16 @@ class FilterWorker(QtCore.QObject):
         """
         queries_dict = self.parse_queries(filter, tag_filter)
 
-        current_dict = model.main_dictionary.copy()
+        # The GUI thread keeps changing the main dictionary, we work on a snapshot of it.
+        all_items = model.main_dictionary.copy()
+        current_dict = all_items.copy()
 
         if self.thread().isInterruptionRequested():
             return None
 
         trashed_dict: Optional[Dict[Path, Item]] = {}
         if star_status or trash_status:
-            for path, item in model.main_dictionary.items():
+            for path, item in all_items.items():
                 if self.thread().isInterruptionRequested():
                     return None
                 if trash_status:
@@ -1565,23 +1976,32 @@ class FilterWorker(QtCore.QObject):
                         if self.thread().isInterruptionRequested():
                             return None
                         match_pattern = re.compile(query, flags=re.IGNORECASE)
+                        candidates = model.filter_index.name_candidates(query)
                         new_matches = {
                             path: item
-                            for path, item in current_dict.items()
+                            for path, item in self._candidate_items(
+                                current_dict, candidates
+                            )
                             if match_pattern.search(str(path))
                         }
                         current_dict = new_matches
                 else:
+                    sorted_query_type = ContentType.sort(query_type)
                     for query in queries:
                         if self.thread().isInterruptionRequested():
                             return None
                         match_pattern = re.compile(query, flags=re.IGNORECASE)
+                        candidates = model.filter_index.file_candidates(
+                            sorted_query_type, query
+                        )
                         new_matches = {
                             path: item
-                            for path, item in current_dict.items()
-                            for file_path, file_type in item.files.items()
+                            for path, item in self._candidate_items(
+                                current_dict, candidates
+                            )
+                            for file_path, file_type in list(item.files.items())
                             if (
-                                file_type == ContentType.sort(query_type)
+                                file_type == sorted_query_type
                                 and match_pattern.search(str(file_path.name))
                             )
                         }
@@ -1609,6 +2029,23 @@ class FilterWorker(QtCore.QObject):
 
         return current_dict, queries_dict
 
+    @staticmethod
+    def _candidate_items(
+        current_dict: Dict[Path, Item], candidates: Optional[Set[Path]]
+    ) -> List[Tuple[Path, Item]]:
+        """
+        Gets the items of current_dict that are in the candidates from the filter index. Iterates over the smaller
+        of the two.
+
+        :param current_dict: The items that have passed the filtering so far.
+        :param candidates: The candidate paths from the filter index. If None, all items in current_dict are returned.
+        """
+        if candidates is None:
+            return list(current_dict.items())
+        if len(candidates) < len(current_dict):
+            return [(path, current_dict[path]) for path in candidates if path in current_dict]
+        return [(path, item) for path, item in current_dict.items() if path in candidates]
+
     def _add_parent(
         self,
         item: Item,
@@ -2008,7 +2445,7 @@ class FileExplorer(QtWidgets.QWidget):
 
         self.star_button.clicked.connect(self.on_star_trash_refresh_clicked)
         self.trash_button.clicked.connect(self.on_star_trash_refresh_clicked)
-        self.expand_button.clicked.connect(self.file_tree.expandAll)
+        self.expand_button.clicked.connect(self.file_tree.expand_all)
         self.collapse_button.clicked.connect(self.file_tree.collapseAll)
         self.copy_button.clicked.connect(self.on_copy_button_clicked)
 
@@ -2046,6 +2483,15 @@ class FileExplorer(QtWidgets.QWidget):
 
         :param filter: The string of the line edit.
         """
+        # Filtering needs to look at all items, including the ones of a lazy model that have not been created yet.
+        if (
+            filter.strip() != ""
+            or len(self.selected_tags) > 0
+            or self.star_button.isChecked()
+            or self.trash_button.isChecked()
+        ):
+            cast(FileModel, self.model).fetch_all()
+
         if self.loading_label is None:
             self.loading_label = IconLabel(
                 self.loading_movie, self.star_button.height()
@@ -3186,7 +3632,11 @@ class LoaderWorker(QtCore.QObject):
 # TODO: Instead of saving  the currently selected folder, save the currently and previously selected item.
 class Monitr(QtWidgets.QMainWindow):
     def __init__(
-        self, monitorPath: str = ".", parent: Optional[QtWidgets.QMainWindow] = None
+        self,
+        monitorPath: str = ".",
+        parent: Optional[QtWidgets.QMainWindow] = None,
+        index_path: Optional[Union[str, Path]] = None,
+        lazy: bool = False,
     ):
         super().__init__(parent=parent)
 
@@ -3202,7 +3652,9 @@ class Monitr(QtWidgets.QMainWindow):
         )  # Currently Ids only increase with every new app.
         self.current_app_id = 0
 
-        self.model = FileModel(self.monitor_path, 0, 2)
+        self.model = FileModel(
+            self.monitor_path, 0, 2, index_path=index_path, lazy=lazy
+        )
         self.model.update_me.connect(self.on_update_right_side_window)
         self.model.update_data.connect(self.on_update_data_widget)
         self.proxy_model = SortFilterProxyModel(parent=self)  # Used for filtering.
@@ -3812,6 +4264,16 @@ def script() -> int:
         type=float,
         help="interval at which to look for changes in the monitored path (in seconds)",
     )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="do not use a persistent index of the monitored path, but scan all folders on startup",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="only load the content of folders in the file tree when they are expanded",
+    )
     args = parser.parse_args()
 
     path = os.path.abspath(args.path)
@@ -3820,6 +4282,7 @@ def script() -> int:
         sys.exit()
 
     app = QtWidgets.QApplication([])
-    win = Monitr(path)
+    index_path = None if args.no_index else default_index_path(path)
+    win = Monitr(path, index_path=index_path, lazy=args.lazy)
     win.show()
     return app.exec_()
@@ -0,0 +1,232 @@
+"""plottr.apps.monitr_index -- persistent index of the folders monitored by monitr.
+
+Walking a large data root (in particular on network drives) is slow. The :class:`FolderIndex` keeps a record of all
+folders below the monitored root, their modification times, and the names of the files they contain in an SQLite
+database. Monitr loads its file tree from the index, and only re-scans folders whose modification time has changed.
+"""
+
+import hashlib
+import os
+import sqlite3
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, List, Optional, Union, Iterable
+
+from .. import configPaths
+
+
+logger = getLogger(__name__)
+
+#: Version of the database layout. Indices with a different version are rebuilt.
+INDEX_VERSION = 1
+
+
+def default_index_path(root: Union[str, Path]) -> Path:
+    """Get the default location of the index for a monitored folder.
+
+    Indices are stored in the user's plottr directory (``~/.plottr/monitr``), one file per monitored folder.
+
+    :param root: The monitored folder.
+    :return: Path of the index file.
+    """
+    root_id = hashlib.sha1(str(Path(root).absolute()).encode()).hexdigest()[:16]
+    return Path(configPaths()[1], 'monitr', f'index_{root_id}.sqlite')
+
+
+def _is_hidden(name: str) -> bool:
+    return name.startswith('.')
+
+
+class FolderIndex:
+    """
+    Persistent record of all (non-hidden) folders below `root`, with their modification time and the names of the
+    files in them.
+
+    Folder paths are stored relative to `root`, so an index stays valid when the root is moved or mounted
+    elsewhere.
+
+    :param root: The monitored folder.
+    :param index_path: Location of the SQLite file. If ``None``, use :func:`default_index_path`.
+    """
+
+    def __init__(self, root: Union[str, Path], index_path: Optional[Union[str, Path]] = None):
+        self.root = Path(root)
+        if index_path is None:
+            index_path = default_index_path(self.root)
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.connection = sqlite3.connect(str(self.index_path))
+        self._init_db()
+
+    def _init_db(self) -> None:
+        cur = self.connection.cursor()
+        cur.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT)")
+        row = cur.execute("SELECT value FROM info WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != INDEX_VERSION:
+            cur.execute("DROP TABLE IF EXISTS folders")
+            cur.execute("DROP TABLE IF EXISTS files")
+            cur.execute("INSERT OR REPLACE INTO info VALUES ('version', ?)", (str(INDEX_VERSION),))
+        cur.execute("CREATE TABLE IF NOT EXISTS folders "
+                    "(path TEXT PRIMARY KEY, parent TEXT, mtime REAL)")
+        cur.execute("CREATE INDEX IF NOT EXISTS folders_parent ON folders (parent)")
+        cur.execute("CREATE TABLE IF NOT EXISTS files "
+                    "(folder TEXT, name TEXT, PRIMARY KEY (folder, name))")
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    # conversion between absolute paths and the keys in the database
+
+    def _key(self, path: Path) -> str:
+        rel = Path(path).relative_to(self.root).as_posix()
+        return '' if rel == '.' else rel
+
+    def _path(self, key: str) -> Path:
+        return self.root.joinpath(key) if key != '' else self.root
+
+    @staticmethod
+    def _parent_key(key: str) -> Optional[str]:
+        if key == '':
+            return None
+        return key.rpartition('/')[0]
+
+    # reading
+
+    def is_empty(self) -> bool:
+        """Whether the index does not contain any folders yet."""
+        return self.connection.execute("SELECT 1 FROM folders LIMIT 1").fetchone() is None
+
+    def files(self, folder: Path) -> List[Path]:
+        """Get the files in `folder` according to the index."""
+        rows = self.connection.execute("SELECT name FROM files WHERE folder = ?", (self._key(folder),))
+        return [folder.joinpath(name) for name, in rows]
+
+    def folder_files(self) -> Dict[Path, List[Path]]:
+        """Get all folders in the index together with the files they contain.
+
+        :return: Dictionary with folder paths as keys, sorted by path, and the list of files in each folder as values.
+        """
+        ret: Dict[Path, List[Path]] = {}
+        keys = [k for k, in self.connection.execute("SELECT path FROM folders ORDER BY path")]
+        for k in keys:
+            ret[self._path(k)] = []
+        for k, name in self.connection.execute("SELECT folder, name FROM files"):
+            folder = self._path(k)
+            if folder in ret:
+                ret[folder].append(folder.joinpath(name))
+        return ret
+
+    # updating
+
+    def rebuild(self) -> None:
+        """Discard the index and walk the whole root folder."""
+        with self.connection:
+            self.connection.execute("DELETE FROM folders")
+            self.connection.execute("DELETE FROM files")
+            self._scan_tree(self.root)
+
+    def update_folder(self, folder: Path) -> None:
+        """Update the index entry of a single folder by re-listing its content.
+
+        Sub-folders that are new are added recursively, sub-folders that do not exist anymore are removed. If `folder`
+        itself does not exist anymore, it is removed from the index, and its parent is updated.
+
+        :param folder: The folder to update.
+        """
+        if folder != self.root and self.root not in folder.parents:
+            return
+        if any(_is_hidden(part) for part in Path(self._key(folder)).parts):
+            return
+
+        with self.connection:
+            if not folder.is_dir():
+                self._remove_tree(self._key(folder))
+                if folder != self.root:
+                    self.update_folder(folder.parent)
+                return
+            self._scan_folder(folder)
+
+    def remove_folder(self, folder: Path) -> None:
+        """Remove a folder and all its sub-folders from the index."""
+        with self.connection:
+            self._remove_tree(self._key(folder))
+
+    def validate(self, folders: Iterable[Path]) -> List[Path]:
+        """Compare the modification times of `folders` with the recorded ones, and update the ones that changed.
+
+        Note that the modification time of a folder changes only when files or folders are directly added to or removed
+        from it -- not when this happens further down in the tree.
+
+        :param folders: The folders to check.
+        :return: The folders that have changed.
+        """
+        changed = []
+        for folder in folders:
+            row = self.connection.execute("SELECT mtime FROM folders WHERE path = ?",
+                                          (self._key(folder),)).fetchone()
+            try:
+                mtime: Optional[float] = os.stat(folder).st_mtime
+            except OSError:
+                mtime = None
+            if row is None or mtime is None or row[0] != mtime:
+                self.update_folder(folder)
+                changed.append(folder)
+        return changed
+
+    def validate_parents(self) -> List[Path]:
+        """Check all folders that contain sub-folders (and the root) for changes.
+
+        New datasets are typically created as new folders in existing folders (like a folder per day), so this finds
+        new data without needing to look at every dataset folder.
+
+        :return: The folders that have changed.
+        """
+        keys = [k for k, in self.connection.execute(
+            "SELECT DISTINCT parent FROM folders WHERE parent IS NOT NULL")]
+        folders = [self.root] + [self._path(k) for k in keys if k != '']
+        return self.validate(folders)
+
+    def _scan_folder(self, folder: Path) -> None:
+        key = self._key(folder)
+        files = []
+        subfolders = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not _is_hidden(entry.name):
+                        subfolders.append(entry.name)
+                else:
+                    files.append(entry.name)
+
+        self.connection.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+                                (key, self._parent_key(key), os.stat(folder).st_mtime))
+        self.connection.execute("DELETE FROM files WHERE folder = ?", (key,))
+        self.connection.executemany("INSERT INTO files VALUES (?, ?)", [(key, name) for name in files])
+
+        known = {k for k, in self.connection.execute("SELECT path FROM folders WHERE parent = ?", (key,))}
+        present = {folder.joinpath(name) for name in subfolders}
+        for k in known - {self._key(p) for p in present}:
+            self._remove_tree(k)
+        for p in present:
+            if self._key(p) not in known:
+                self._scan_tree(p)
+
+    def _scan_tree(self, top: Path) -> None:
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if not _is_hidden(d)]
+            key = self._key(Path(dirpath))
+            self.connection.execute("INSERT OR REPLACE INTO folders VALUES (?, ?, ?)",
+                                    (key, self._parent_key(key), os.stat(dirpath).st_mtime))
+            self.connection.execute("DELETE FROM files WHERE folder = ?", (key,))
+            self.connection.executemany("INSERT INTO files VALUES (?, ?)", [(key, name) for name in filenames])
+
+    def _remove_tree(self, key: str) -> None:
+        if key == '':
+            self.connection.execute("DELETE FROM folders")
+            self.connection.execute("DELETE FROM files")
+            return
+        pattern = key.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '/%'
+        self.connection.execute("DELETE FROM folders WHERE path = ? OR path LIKE ? ESCAPE '\\'", (key, pattern))
+        self.connection.execute("DELETE FROM files WHERE folder = ? OR folder LIKE ? ESCAPE '\\'", (key, pattern))
@@ -6,6 +6,12 @@ config = {
 
     'default-plotwidget': MPLAutoPlot,
 
+    # 2D data with more points is drawn at the resolution of the screen
+    # (pyqtgraph) or of the axes (matplotlib) only, reduced by pooling with
+    # 'mean' or 'max'. used by both plot backends.
+    'image_lod_threshold': 2**22,
+    'image_lod_pooling': 'mean',
+
     'matplotlibrc': {
         'axes.grid': True,
         'axes.prop_cycle': cycler('color', ['1f77b4', 'ff7f0e', '2ca02c', 'd62728', '9467bd', '8c564b',
@@ -38,6 +44,9 @@ config = {
                         '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'],
         'line_symbols': ['o', ],
         'line_symbol_size': 7,
+        # 1D traces with more points are drawn without symbols, clipped to
+        # the view and decimated to its pixel width.
+        'line_lod_threshold': 10000,
         'minimum_plot_size': (400, 400),
         'default_colormap': 'magma',
     }
@@ -7,10 +7,11 @@ import warnings
 import copy as cp
 import re
 import logging
+import operator
 import pandas as pd
 import numpy as np
-from functools import reduce
-from typing import List, Tuple, Dict, Sequence, Union, Any, Iterator, Optional, TypeVar
+from numpy.lib.mixins import NDArrayOperatorsMixin
+from typing import List, Tuple, Dict, Sequence, Union, Any, Iterator, Optional, TypeVar, Hashable, Callable
 
 from plottr.utils import num, misc
 
@@ -67,6 +68,270 @@ def meta_name_to_key(name: str) -> str:
     return '__' + name + '__'
 
 
+def readonly_view(values: Any) -> Any:
+    """
+    Get a read-only view of data values.
+
+    The view shares memory with ``values``, but cannot be changed in place.
+    For masked arrays, both data and mask are protected. Values that are not
+    arrays (like lists) are copied instead.
+
+    :param values: The data values.
+    :return: Read-only view of the values.
+    """
+    if isinstance(values, np.ma.MaskedArray):
+        data = values.data.view()
+        data.flags.writeable = False
+        mask = np.ma.getmask(values)
+        if mask is not np.ma.nomask:
+            mask = mask.view()
+            mask.flags.writeable = False
+        return np.ma.MaskedArray(data, mask=mask, fill_value=values.fill_value,
+                                 copy=False)
+    elif isinstance(values, np.ndarray):
+        view = values.view()
+        view.flags.writeable = False
+        return view
+    elif isinstance(values, list):
+        return list(values)
+    return values
+
+
+def _freeze(value: Any) -> Hashable:
+    """Get a hashable stand-in for ``value``, for use in fingerprints of datasets."""
+    if isinstance(value, np.ndarray):
+        return 'ndarray', value.dtype.str, value.shape, value.tobytes()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()),
+                            key=lambda item: item[0]))
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _values_identity(values: Any) -> Hashable:
+    """Identify data values by the memory they use (not by their content)."""
+    if isinstance(values, np.ndarray):
+        key: Tuple[Any, ...] = (type(values), values.__array_interface__['data'][0],
+                                values.shape, values.strides, values.dtype.str)
+        if isinstance(values, np.ma.MaskedArray):
+            mask = np.ma.getmask(values)
+            key += (None if mask is np.ma.nomask else _values_identity(mask),)
+        return key
+    return type(values), id(values)
+
+
+class LazyValues(NDArrayOperatorsMixin):
+    """
+    Base class for data values that are only read when they are needed.
+
+    Lazy values represent an array whose first ('outer') axes map onto the
+    rows of some storage, like a dataset in a file, while the remaining
+    ('inner') axes are the shape of a single row. Indexing the outer axes
+    with integers and slices, reshaping the outer axes, and removing outer
+    axes of length 1 (``squeeze``) return new lazy values without reading
+    anything. Everything else (numpy functions, arithmetic, other array
+    attributes) reads the required data and works on a numpy array.
+
+    Subclasses implement ``_read``.
+
+    :param nrows: Number of rows in the storage.
+    :param inner_shape: Shape of a single row.
+    :param dtype: Data type of the values.
+    """
+
+    def __init__(self, nrows: int, inner_shape: Tuple[int, ...], dtype: Any):
+        self.dtype = np.dtype(dtype)
+        self.inner_shape = tuple(inner_shape)
+        # row of the first element, and (length, stride in rows) of the outer axes.
+        self._offset = 0
+        self._outer: Tuple[Tuple[int, int], ...] = ((nrows, 1),)
+
+    def _read(self, rows: Union[slice, np.ndarray]) -> np.ndarray:
+        """
+        Read rows from the storage.
+
+        :param rows: A slice with non-negative start and stop, and positive
+            step, or a sorted array of unique row indices.
+        :return: Array of shape ``(number of rows,) + inner_shape``.
+        """
+        raise NotImplementedError
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(n for n, _ in self._outer) + self.inner_shape
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def itemsize(self) -> int:
+        return self.dtype.itemsize
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.itemsize
+
+    def __len__(self) -> int:
+        if self.ndim == 0:
+            raise TypeError('len() of unsized object')
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(shape={self.shape}, dtype={self.dtype})"
+
+    def __getattr__(self, name: str) -> Any:
+        # make all other array attributes work, on the complete data.
+        if name.startswith('_') or not hasattr(np.ndarray, name):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        arr = self.load()
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr
+
+    def __array_ufunc__(self, ufunc: Any, method: Any, /, *inputs: Any, **kwargs: Any) -> Any:
+        inputs = tuple(np.asarray(x) if isinstance(x, LazyValues) else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def _view(self, offset: int, outer: Tuple[Tuple[int, int], ...]) -> 'LazyValues':
+        ret = cp.copy(self)
+        ret._offset = offset
+        ret._outer = outer
+        return ret
+
+    def _collapsed(self) -> Optional[Tuple[int, int]]:
+        """
+        Number of rows and their stride if the rows of all outer axes are
+        equally spaced, ``None`` otherwise.
+        """
+        outer = [(n, s) for n, s in self._outer if n != 1]
+        if len(outer) == 0:
+            return 1, 1
+        for (_, s0), (n1, s1) in zip(outer[:-1], outer[1:]):
+            if s0 != n1 * s1:
+                return None
+        return int(np.prod([n for n, _ in outer])), outer[-1][1]
+
+    def load(self) -> np.ndarray:
+        """
+        Read all values.
+
+        :return: The values as numpy array.
+        """
+        nrows = int(np.prod([n for n, _ in self._outer]))
+        if nrows == 0:
+            return np.empty(self.shape, dtype=self.dtype)
+
+        collapsed = self._collapsed()
+        if collapsed is not None:
+            n, stride = collapsed
+            if stride > 0:
+                data = self._read(slice(self._offset, self._offset + (n - 1) * stride + 1, stride))
+            else:
+                first = self._offset + (n - 1) * stride
+                data = self._read(slice(first, self._offset + 1, -stride))[::-1]
+        else:
+            rows: np.ndarray = np.full((), self._offset, dtype=np.int64)
+            for n, stride in self._outer:
+                rows = rows[..., None] + np.arange(n) * stride
+            rows = rows.reshape(-1)
+            unique_rows, inverse = np.unique(rows, return_inverse=True)
+            first, last = unique_rows[0], unique_rows[-1]
+            # reading a block is usually faster than picking single rows.
+            if last - first + 1 <= 2 * unique_rows.size:
+                data = self._read(slice(first, last + 1, 1))[rows - first]
+            else:
+                data = self._read(unique_rows)[inverse.reshape(-1)]
+        return data.reshape(self.shape)
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = [k is Ellipsis for k in key].index(True)
+            nfill = self.ndim - len(key) + 1
+            key = key[:i] + (slice(None),) * nfill + key[i + 1:]
+
+        nouter = len(self._outer)
+        outer_key, inner_key = key[:nouter], key[nouter:]
+        if not all(isinstance(k, slice) or (isinstance(k, (int, np.integer))
+                                            and not isinstance(k, (bool, np.bool_)))
+                   for k in outer_key):
+            return self.load()[key]
+        outer_key = outer_key + (slice(None),) * (nouter - len(outer_key))
+
+        offset = self._offset
+        outer = []
+        for (n, stride), k in zip(self._outer, outer_key):
+            if isinstance(k, slice):
+                start, stop, step = k.indices(n)
+                outer.append((len(range(start, stop, step)), stride * step))
+                offset += start * stride
+            else:
+                i = operator.index(k)
+                if not -n <= i < n:
+                    raise IndexError(f'index {i} is out of bounds for axis with size {n}')
+                offset += (i % n) * stride
+        view = self._view(offset, tuple(outer))
+
+        if len(outer) == 0 or len(inner_key) > 0:
+            return view.load()[(slice(None),) * len(outer) + inner_key]
+        return view
+
+    def reshape(self, *shape: Any, **kwargs: Any) -> Any:
+        """
+        Reshape the values. Stays lazy if only the outer axes are reshaped
+        (in C order), and the rows of all outer axes are equally spaced.
+        """
+        if len(shape) == 1 and isinstance(shape[0], (tuple, list)):
+            shape = tuple(shape[0])
+        collapsed = self._collapsed()
+        ninner = len(self.inner_shape)
+        outer_shape = list(shape[:len(shape) - ninner])
+        if (collapsed is not None and len(kwargs) == 0
+                and tuple(shape[len(shape) - ninner:]) == self.inner_shape
+                and outer_shape.count(-1) <= 1):
+            n, stride = collapsed
+            if -1 in outer_shape:
+                known = int(np.prod([m for m in outer_shape if m != -1]))
+                if known > 0 and n % known == 0:
+                    outer_shape[outer_shape.index(-1)] = n // known
+            if int(np.prod(outer_shape)) == n and min(outer_shape, default=0) >= 0:
+                outer = []
+                for i, m in enumerate(outer_shape):
+                    outer.append((m, stride * int(np.prod(outer_shape[i + 1:]))))
+                return self._view(self._offset, tuple(outer))
+        return self.load().reshape(*shape, **kwargs)
+
+    def squeeze(self, axis: Union[None, int, Tuple[int, ...]] = None) -> Any:
+        """Remove axes of length 1. Stays lazy if only outer axes are removed."""
+        if axis is None:
+            axes = tuple(i for i, n in enumerate(self.shape) if n == 1)
+        elif isinstance(axis, tuple):
+            axes = tuple(a % self.ndim for a in axis)
+        else:
+            axes = (axis % self.ndim,)
+        if any(a >= len(self._outer) for a in axes):
+            return self.load().squeeze(axis=axis)
+        if any(self._outer[a][0] != 1 for a in axes):
+            raise ValueError('cannot select an axis to squeeze out '
+                             'which has size not equal to one')
+        return self._view(self._offset, tuple(o for i, o in enumerate(self._outer)
+                                              if i not in axes))
+
+
 T = TypeVar('T', bound='DataDictBase')
 
 
@@ -80,11 +345,82 @@ class DataDictBase(dict):
 
     This base class does not make assumptions about the structure of the
     values. This is implemented in inheriting classes.
+
+    Results of ``validate``, ``axes``, ``dependents``, ``shapes``, and
+    ``structure_fingerprint`` are cached, and only recomputed when the
+    dataset has changed (see ``version``).
     """
 
     def __init__(self, **kw: Any):
         super().__init__(self, **kw)
         self.d_ = DataDictBase._DataAccess(self) 
+        self._version = 0
+        self._cache_version: Optional[int] = None
+        self._cache_fields: Optional[Tuple[Any, ...]] = None
+        self._cache: Dict[Hashable, Any] = {}
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._version += 1
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._version += 1
+
+    # Change tracking
+
+    def _fields_key(self) -> Tuple[Any, ...]:
+        """A key that changes whenever fields, their values, axes, units, or labels are replaced."""
+        return tuple(
+            (k, id(v), len(v), tuple(v.get('axes', ())), v.get('unit'), v.get('label'),
+             id(v.get('values')), type(v.get('values')), getattr(v.get('values'), 'shape', None))
+            for k, v in self.items() if not is_meta_key(k)
+        )
+
+    def _current_cache(self) -> Dict[Hashable, Any]:
+        """Get the cache for the current state. It is emptied if the dataset has changed."""
+        fields = self._fields_key()
+        if fields != self._cache_fields:
+            # a change made directly to the field dictionaries.
+            if self._cache_fields is not None:
+                self._version += 1
+            self._cache_fields = fields
+            self._cache_version = None
+        if self._cache_version != self._version:
+            self._cache_version = self._version
+            self._cache = {}
+        return self._cache
+
+    def _cached(self, name: Hashable, func: Callable[[], Any]) -> Any:
+        cache = self._current_cache()
+        if name not in cache:
+            cache[name] = func()
+        return cache[name]
+
+    @property
+    def version(self) -> int:
+        """
+        A counter that increases whenever the dataset changes.
+
+        Changes are detected when items are set or deleted, when fields,
+        values, or axes are replaced, and when meta data is changed through
+        ``add_meta`` or ``delete_meta``. Changes of the content of value
+        arrays that are made in place are not detected.
+        """
+        self._current_cache()
+        return self._version
+
+    # only the validate method of the actual class of the dataset marks it as
+    # valid, so that checks of subclasses are never skipped.
+
+    def _is_validated(self, validator: Callable[..., bool]) -> bool:
+        if type(self).validate is not validator:
+            return False
+        return self._current_cache().get('validated', False)
+
+    def _set_validated(self, validator: Callable[..., bool]) -> None:
+        if type(self).validate is validator:
+            self._current_cache()['validated'] = True
 
     def __eq__(self, other: object) -> bool:
         """Check for content equality of two datadicts."""
@@ -271,6 +607,7 @@ class DataDictBase(dict):
             self[key] = value
         else:
             self[data][key] = value
+            self._version += 1
 
     set_meta = add_meta
 
@@ -288,6 +625,7 @@ class DataDictBase(dict):
             del self[key]
         else:
             del self[data][key]
+            self._version += 1
 
     def clear_meta(self, data: Union[str, None] = None) -> None:
         """
@@ -347,6 +685,7 @@ class DataDictBase(dict):
                 ret[d] = cp.deepcopy(self[d])
             else:
                 ret[d] = self[d]
+        self._share_row_checks(ret)
 
         if include_meta:
             for k, v in self.meta_items():
@@ -380,22 +719,63 @@ class DataDictBase(dict):
         if len(data) < 2:
             return True
 
-        def empty_structure(d: T) -> T:
-            s = misc.unwrap_optional(d.structure(include_meta=False, add_shape=check_shape))
-            for k, v in s.data_items():
-                if 'values' in v:
-                    del s[k]['values']
-            return s
-
-        s0 = empty_structure(data[0])
+        fp0 = data[0].structure_fingerprint()
         for d in data[1:]:
             if d is None:
                 return False
-            if s0 != empty_structure(d):
+            if fp0 != d.structure_fingerprint():
+                return False
+            if check_shape and data[0].shapes() != d.shapes():
                 return False
 
         return True
 
+    def structure_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Get a hashable summary of the structure of the dataset.
+
+        Two datasets have the same fingerprint if they have the same data
+        fields, with the same axes, units, and labels (i.e., if they have the
+        same structure in the sense of ``same_structure``). Values and meta
+        data are ignored.
+
+        :return: The fingerprint.
+        """
+        def fingerprint() -> Tuple[Any, ...]:
+            return tuple(sorted(
+                (n, tuple(sorted((k, _freeze(x)) for k, x in v.items()
+                                 if k != 'values' and not self._is_meta_key(k))))
+                for n, v in self.data_items()
+            ))
+
+        self.validate()
+        return self._cached('fingerprint', fingerprint)
+
+    def content_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Get a hashable summary of the structure, meta data, and values of the dataset.
+
+        Values are not compared by content, but by the memory they use: two
+        datasets have the same fingerprint if they have the same type,
+        structure, and meta data, and their values are the same memory, like a
+        dataset and its ``shallow_copy``. Memory of values that do not exist
+        anymore can be reused by new values, so fingerprints should only be
+        compared while the values of both datasets exist. Changing values in
+        place is not detected.
+
+        :return: The fingerprint.
+        """
+        def fingerprint() -> Tuple[Any, ...]:
+            meta = tuple(sorted((k, _freeze(v)) for k, v in self.meta_items(clean_keys=False)))
+            fields = tuple(sorted(
+                (n, tuple(sorted((k, _freeze(x)) for k, x in v.items() if self._is_meta_key(k))),
+                 _values_identity(v.get('values')))
+                for n, v in self.data_items()
+            ))
+            return type(self), self.structure_fingerprint(), meta, fields
+
+        return self._cached('content_fingerprint', fingerprint)
+
     def structure(self: T, add_shape: bool = False,
                   include_meta: bool = True,
                   same_type: bool = False,
@@ -517,6 +897,15 @@ class DataDictBase(dict):
                      otherwise only the axes of the dependent ``data``.
         :return: The list of axes.
         """
+        if isinstance(data, str):
+            key: Hashable = ('axes', data)
+        elif data is None:
+            key = ('axes', None)
+        else:
+            key = ('axes', tuple(data))
+        return list(self._cached(key, lambda: self._axes(data)))
+
+    def _axes(self, data: Union[Sequence[str], str, None] = None) -> List[str]:
         lst = []
         if data is None:
             for k, v in self.data_items():
@@ -544,11 +933,10 @@ class DataDictBase(dict):
 
         :return: A list of the names of dependents.
         """
-        ret = []
-        for n, v in self.data_items():
-            if len(v.get('axes', [])) != 0:
-                ret.append(n)
-        return ret
+        def dependents() -> List[str]:
+            return [n for n, v in self.data_items() if len(v.get('axes', [])) != 0]
+
+        return list(self._cached('dependents', dependents))
 
     def shapes(self) -> Dict[str, Tuple[int, ...]]:
         """
@@ -558,11 +946,10 @@ class DataDictBase(dict):
                  np.shape-tuple of the data with name ``key``.
 
         """
-        shapes = {}
-        for k, v in self.data_items():
-            shapes[k] = np.array(self.data_vals(k)).shape
+        def shapes() -> Dict[str, Tuple[int, ...]]:
+            return {k: np.shape(self.data_vals(k)) for k, _ in self.data_items()}
 
-        return shapes
+        return dict(self._cached('shapes', shapes))
 
     # validation and sanitizing
 
@@ -582,9 +969,13 @@ class DataDictBase(dict):
         :return: ``True`` if valid, ``False`` if invalid.
         :raises: ``ValueError`` if invalid.
         """
+        if self._is_validated(DataDictBase.validate):
+            return True
+
         self._update_data_access()
 
         msg = '\n'
+        all_axes = None
         for n, v in self.data_items():
 
             if 'axes' in v:
@@ -593,7 +984,10 @@ class DataDictBase(dict):
                         msg += " * '{}' has axis '{}', but no field " \
                                "with name '{}' registered.\n".format(
                             n, na, na)
-                    elif na not in self.axes():
+                        continue
+                    if all_axes is None:
+                        all_axes = self._axes()
+                    if na not in all_axes:
                         msg += " * '{}' has axis '{}', but no independent " \
                                "with name '{}' registered.\n".format(
                             n, na, na)
@@ -607,13 +1001,15 @@ class DataDictBase(dict):
                 v['label'] = ''
 
             vals = v.get('values', [])
-            if type(vals) not in [np.ndarray, np.ma.core.MaskedArray]:
+            if type(vals) not in [np.ndarray, np.ma.core.MaskedArray] \
+                    and not isinstance(vals, LazyValues):
                 vals = np.array(vals)
             v['values'] = vals
 
         if msg != '\n':
             raise ValueError(msg)
 
+        self._set_validated(DataDictBase.validate)
         return True
 
     def remove_unused_axes(self: T) -> T:
@@ -706,6 +1102,63 @@ class DataDictBase(dict):
             ret[k]['values'] = self.data_vals(k).copy()
         return ret
 
+    def shallow_copy(self: T) -> T:
+        """
+        Make a copy of the dataset that shares the data values with the original.
+
+        The data fields are new dictionaries, so fields, axes, units, and meta
+        data can be changed freely in the copy. The values are read-only
+        views of the original values (see ``readonly_view``): replacing them
+        is fine, but to change them in place, use ``writable_vals`` first,
+        which makes a private copy of only that field (copy-on-write).
+        Global meta values are not copied.
+
+        :return: The copy of the dataset.
+        """
+        ret = self.__class__()
+        for k, v in self.items():
+            if self._is_meta_key(k):
+                ret[k] = v
+                continue
+            field = dict(v)
+            if 'axes' in field:
+                field['axes'] = list(field['axes'])
+            if 'values' in field:
+                field['values'] = readonly_view(field['values'])
+            ret[k] = field
+        self._share_row_checks(ret)
+        return ret
+
+    def _share_row_checks(self, other: 'DataDictBase') -> None:
+        """
+        Let ``other``, which has been created from this dataset, use the
+        results of checks for invalid records of the shared values.
+        Only implemented by classes that have records.
+
+        :param other: The new dataset.
+        """
+        pass
+
+    def writable_vals(self, key: str) -> np.ndarray:
+        """
+        Return the values of field ``key``, such that they can be changed in place.
+
+        If the values are read-only (because they are shared with another
+        dataset, see ``shallow_copy``), they are replaced by a copy first.
+
+        :param key: Name of the data field.
+        :return: Values of the data field.
+        """
+        vals = self.data_vals(key)
+        if isinstance(vals, np.ndarray) and not (
+                vals.flags.writeable and
+                (not isinstance(vals, np.ma.MaskedArray)
+                 or np.ma.getmask(vals) is np.ma.nomask
+                 or np.ma.getmask(vals).flags.writeable)):
+            vals = vals.copy()
+            self[key]['values'] = vals
+        return vals
+
     def astype(self: T, dtype: np.dtype) -> T:
         """
         Convert all data values to given dtype.
@@ -721,21 +1174,57 @@ class DataDictBase(dict):
 
         return self
 
+    def is_lazy(self) -> bool:
+        """
+        Check whether any values are loaded lazily (see ``LazyValues``).
+
+        :return: ``True`` if any values are lazy.
+        """
+        return any(isinstance(v['values'], LazyValues) for _, v in self.data_items())
+
+    def load_values(self: T) -> T:
+        """
+        Read all lazily loaded values (see ``LazyValues``), and mask their
+        invalid entries like ``mask_invalid``.
+
+        :return: The dataset with all values as arrays.
+        """
+        for k, v in self.data_items():
+            if isinstance(v['values'], LazyValues):
+                v['values'] = v['values'].load()
+                self._mask_invalid_values(k)
+        return self
+
     def mask_invalid(self: T) -> T:
         """
         Mask all invalid data in all values.
-        :return: Copy of the dataset with invalid entries (nan/None) masked.
+
+        The values are replaced by masked arrays that share the data with the
+        original values; only the masks are new. Lazily loaded values (see
+        ``LazyValues``) are not changed.
+
+        :return: The dataset with invalid entries (nan/None) masked.
         """
         for d, _ in self.data_items():
-            arr = self.data_vals(d)
-            vals = np.ma.masked_where(num.is_invalid(arr), arr, copy=True)
-            try:
-                vals.fill_value = np.nan
-            except TypeError:
-                vals.fill_value = -9999
-            self[d]['values'] = vals
+            if not isinstance(self.data_vals(d), LazyValues):
+                self._mask_invalid_values(d)
 
         return self
+
+    def _mask_invalid_values(self, key: str) -> None:
+        """Mask the invalid entries of the values of field ``key``."""
+        arr = np.asanyarray(self.data_vals(key))
+        data = np.ma.getdata(arr)
+        mask = num.is_invalid(data)
+        if isinstance(arr, np.ma.MaskedArray):
+            mask = mask | np.ma.getmaskarray(arr)
+        vals = np.ma.MaskedArray(data, mask=mask if mask.any() else np.ma.nomask,
+                                 copy=False)
+        try:
+            vals.fill_value = np.nan
+        except TypeError:
+            vals.fill_value = -9999
+        self[key]['values'] = vals
     
     class _DataAccess:
         def __init__(self, parent: "DataDictBase") -> None:
@@ -778,8 +1267,40 @@ class DataDict(DataDictBase):
     The class further implements simple appending of datadicts through the
     ``DataDict.append`` method, as well as allowing addition of DataDict
     instances.
+
+    Appending (through ``append`` or ``add_data``) does not copy the existing
+    data each time: values are kept in backing arrays whose capacity is
+    doubled when they are full, and the ``values`` of each field are views
+    of the filled part of these arrays. Adding data point by point is
+    therefore linear, not quadratic, in the number of records.
+
+    Optionally, all fields can be stored together as the columns of one
+    structured array (see ``use_record_storage``, ``from_structured_array``,
+    and ``add_records``). The values of the fields are then views of this
+    array, and appending records or getting all records as a structured
+    array (``to_structured_array``) work on a single array.
     """
 
+    #: Capacity (number of records) of a backing array when it is first created.
+    min_capacity = 16
+
+    #: Number of checked values per field for which the invalid records are remembered.
+    max_checked_values = 2
+
+    def __init__(self, **kw: Any):
+        super().__init__(**kw)
+        # backing arrays of the data fields, and the views of them that are
+        # currently set as values.
+        self._buffers: Dict[str, np.ndarray] = {}
+        self._views: Dict[str, np.ndarray] = {}
+        # structured array holding the records of all fields, if used.
+        self._record_buffer: Optional[np.ndarray] = None
+        # results of looking for invalid records (see
+        # ``remove_invalid_entries``): per field, the most recently checked
+        # values, the number of records checked, and the indices of the
+        # invalid ones. shared with datasets created from this one.
+        self._invalid_records: Dict[str, List[Tuple[np.ndarray, int, np.ndarray]]] = {}
+
     def __add__(self, newdata: 'DataDict') -> 'DataDict':
         """
         Adding two datadicts by appending each data array.
@@ -795,18 +1316,49 @@ class DataDict(DataDictBase):
         # FIXME: remove shape
         s = misc.unwrap_optional(self.structure(add_shape=False))
         if DataDictBase.same_structure(self, newdata):
+            self._share_row_checks(s)
             for k, v in self.data_items():
-                val0 = self[k]['values']
-                val1 = newdata[k]['values']
+                checked = self._checked_records(k)
                 s[k]['values'] = np.append(
                     self[k]['values'],
                     newdata[k]['values'],
                     axis=0
                 )
+                s._set_checked_records(k, *checked)
             return s
         else:
             raise ValueError('Incompatible data structures.')
 
+    def appended(self, newdata: 'DataDict') -> 'DataDict':
+        """
+        Get a new dataset with the values of ``newdata`` appended to the ones
+        of this dataset, which is not changed.
+
+        Unlike adding (``+``), this does not copy the existing values if
+        possible: the new dataset is a shallow copy that takes over the
+        backing arrays (see ``append``), while the values of this dataset
+        remain views of their first records, which are never written again.
+        Appending repeatedly, as in ``data = data.appended(new)``, is therefore
+        linear in the number of records. If this dataset is appended to later,
+        it allocates new backing arrays.
+
+        :param newdata: DataDict to be appended.
+        :returns: combined DataDict.
+        :raises: ``ValueError`` if the structures are incompatible.
+        """
+        if not DataDictBase.same_structure(self, newdata):
+            raise ValueError('Incompatible data structures.')
+
+        ret = self.shallow_copy()
+        for k in list(self._buffers.keys()):
+            if self._views.get(k) is self.data_vals(k):
+                ret._buffers[k] = self._buffers[k]
+                ret._views[k] = ret.data_vals(k)
+            self._buffers.pop(k)
+            self._views.pop(k, None)
+        ret._append_values(newdata)
+        return ret
+
     def append(self, newdata: "DataDict") -> None:
         """
         Append a datadict to this one by appending data values.
@@ -816,22 +1368,84 @@ class DataDict(DataDictBase):
         """
         if not DataDictBase.same_structure(self, newdata):
             raise ValueError('Incompatible data structures.')
+        self._append_values(newdata)
+
+    def _append_values(self, newdata: "DataDict") -> None:
+        """Append the data values of ``newdata``, without checking the structure."""
+        if self._grow_records({k: v['values'] for k, v in newdata.data_items()}):
+            return
 
-        newvals = {}
+        newvals: Dict[str, Any] = {}
+        newbuffers: Dict[str, np.ndarray] = {}
         for k, v in newdata.data_items():
             if isinstance(self[k]['values'], list) and isinstance(
                     v['values'], list):
                 newvals[k] = self[k]['values'] + v['values']
             else:
-                newvals[k] = np.append(
-                    self[k]['values'],
-                    v['values'],
-                    axis=0
-                )
+                grown = self._grow_values(k, v['values'])
+                if grown is None:
+                    newvals[k] = np.append(
+                        self[k]['values'],
+                        v['values'],
+                        axis=0
+                    )
+                else:
+                    newbuffers[k], newvals[k] = grown
+
+        # only actually change the data once all fields could be appended.
+        for k, vals in newvals.items():
+            checked = self._checked_records(k)
+            self[k]['values'] = vals
+            self._set_checked_records(k, *checked)
+            if k in newbuffers:
+                self._buffers[k] = newbuffers[k]
+                self._views[k] = vals
+            else:
+                self._buffers.pop(k, None)
+                self._views.pop(k, None)
 
-        # only actually
-        for k, v in newvals.items():
-            self[k]['values'] = v
+    def _grow_values(self, key: str, newvals: Any) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Append values to the backing array of field ``key``.
+
+        The existing values of the field are not changed; they still are a
+        view of the first records of the backing array. If the backing
+        array is not large enough, or if the values of the field are not
+        a view of it (because they have been set from outside), a new backing
+        array with (at least) twice the capacity is allocated.
+
+        :param key: Name of the data field.
+        :param newvals: The values to append.
+        :return: The backing array and the view of it that holds all
+                 values, or ``None`` if the values cannot be appended in
+                 this way (like for masked arrays or incompatible shapes).
+        """
+        vals = self[key]['values']
+        if not isinstance(newvals, np.ndarray):
+            newvals = np.array(newvals)
+        if (type(vals) is not np.ndarray
+                or isinstance(newvals, np.ma.MaskedArray)
+                or vals.ndim == 0
+                or newvals.ndim != vals.ndim
+                or newvals.shape[1:] != vals.shape[1:]):
+            return None
+
+        try:
+            dtype = np.result_type(vals, newvals)
+        except TypeError:
+            return None
+
+        n0, n1 = vals.shape[0], vals.shape[0] + newvals.shape[0]
+        buf = self._buffers.get(key)
+        if (buf is None or self._views.get(key) is not vals
+                or vals.base is not buf or buf.dtype != dtype or buf.shape[0] < n1):
+            capacity = 2 * (n0 if buf is None else buf.shape[0])
+            capacity = max(self.min_capacity, n1, capacity)
+            newbuf = np.empty((capacity,) + vals.shape[1:], dtype=dtype)
+            newbuf[:n0] = vals
+            buf = newbuf
+        buf[n0:n1] = newvals
+        return buf, buf[:n1]
 
     def add_data(self, **kw: Any) -> None:
         # TODO: fill non-given data with nan or none
@@ -855,12 +1469,215 @@ class DataDict(DataDictBase):
         if dd.validate():
             nrecords = self.nrecords()
             if nrecords is not None and nrecords > 0:
-                self.append(dd)
+                # dd has been created from our structure, no need to compare.
+                self._append_values(dd)
             else:
                 for key, val in dd.data_items():
                     self[key]['values'] = val['values']
             self.validate()
 
+    # record storage
+
+    def uses_record_storage(self) -> bool:
+        """
+        Check whether the values of all fields are views of one structured array.
+
+        :return: ``True`` if the data is stored as records.
+        """
+        buf = self._record_buffer
+        if buf is None:
+            return False
+        names = [k for k, _ in self.data_items()]
+        return (buf.dtype.names is not None
+                and sorted(names) == sorted(buf.dtype.names)
+                and all(self._views.get(k) is self.data_vals(k) for k in names))
+
+    def _record_dtype(self) -> Optional[np.dtype]:
+        """
+        Structured dtype with one field per data field, or ``None`` if not
+        all values can be stored in a structured array.
+        """
+        fields = []
+        for k, v in self.data_items():
+            vals = v['values']
+            if type(vals) is not np.ndarray or vals.ndim == 0:
+                return None
+            fields.append((k, vals.dtype, vals.shape[1:]))
+        if len(fields) == 0:
+            return None
+        return np.dtype(fields)
+
+    def _set_record_buffer(self, buf: np.ndarray, nrecords: int) -> None:
+        """Set the values of all fields to views of the first records of ``buf``."""
+        self._record_buffer = buf
+        for k in misc.unwrap_optional(buf.dtype.names):
+            checked = self._checked_records(k)
+            vals = buf[k][:nrecords]
+            self[k]['values'] = vals
+            self._set_checked_records(k, *checked)
+            self._views[k] = vals
+            self._buffers.pop(k, None)
+
+    def _grow_records(self, newvals: Dict[str, Any]) -> bool:
+        """
+        Append values to the record array, if the data uses record storage.
+
+        Like for the backing arrays of single fields, the capacity of the
+        record array is doubled when it is full.
+
+        :param newvals: The values to append, for each field.
+        :return: ``True`` if the values have been appended, ``False`` if
+                 the data does not use record storage or the values are not
+                 compatible with it.
+        """
+        if not self.uses_record_storage():
+            return False
+        buf = misc.unwrap_optional(self._record_buffer)
+        names = misc.unwrap_optional(buf.dtype.names)
+        if sorted(newvals.keys()) != sorted(names):
+            return False
+
+        arrays: Dict[str, np.ndarray] = {}
+        fields = []
+        for k in names:
+            vals = newvals[k]
+            if isinstance(vals, np.ma.MaskedArray):
+                return False
+            vals = np.asarray(vals)
+            if vals.ndim == 0 or vals.shape[1:] != buf.dtype[k].shape:
+                return False
+            try:
+                dtype = np.result_type(buf.dtype[k].base, vals)
+            except TypeError:
+                return False
+            arrays[k] = vals
+            fields.append((k, dtype, buf.dtype[k].shape))
+        nnew = set(len(v) for v in arrays.values())
+        if len(nnew) != 1:
+            return False
+
+        n0 = misc.unwrap_optional(self.nrecords())
+        n1 = n0 + nnew.pop()
+        dtype = np.dtype(fields)
+        if dtype != buf.dtype or buf.shape[0] < n1:
+            capacity = max(self.min_capacity, n1, 2 * buf.shape[0])
+            newbuf = np.empty(capacity, dtype=dtype)
+            if dtype == buf.dtype:
+                newbuf[:n0] = buf[:n0]
+            else:
+                for k in names:
+                    newbuf[k][:n0] = buf[k][:n0]
+            buf = newbuf
+        for k, vals in arrays.items():
+            buf[k][n0:n1] = vals
+        self._set_record_buffer(buf, n1)
+        return True
+
+    def use_record_storage(self) -> bool:
+        """
+        Store the values of all fields as the columns of one structured array.
+
+        Copies the data once. Afterwards, the values of the fields are views
+        of the columns, and appended data is written into the same array.
+        Setting the values of a field from outside ends the record storage.
+
+        :return: ``True`` if the data is now stored as records, ``False`` if
+                 this is not possible (for instance, for masked arrays or
+                 lists as values).
+        """
+        if self.uses_record_storage():
+            return True
+        dtype = self._record_dtype()
+        nrecords = self.nrecords()
+        if dtype is None or nrecords is None:
+            return False
+        buf = np.empty(max(self.min_capacity, nrecords), dtype=dtype)
+        for k, _ in self.data_items():
+            buf[k][:nrecords] = self.data_vals(k)
+        self._set_record_buffer(buf, nrecords)
+        return True
+
+    def to_structured_array(self) -> np.ndarray:
+        """
+        Get all records as a structured array with one field per data field.
+
+        If the data uses record storage, this is a read-only view of the
+        stored records, i.e., no data is copied.
+
+        :return: The structured array.
+        :raises: ``ValueError`` if the values cannot be stored in a structured array.
+        """
+        nrecords = self.nrecords()
+        if self.uses_record_storage() and nrecords is not None:
+            return readonly_view(misc.unwrap_optional(self._record_buffer)[:nrecords])
+
+        dtype = self._record_dtype()
+        if dtype is None or nrecords is None:
+            raise ValueError('Data cannot be converted to a structured array.')
+        ret = np.empty(nrecords, dtype=dtype)
+        for k, _ in self.data_items():
+            ret[k] = self.data_vals(k)
+        return ret
+
+    @classmethod
+    def from_structured_array(cls, records: np.ndarray,
+                              axes: Optional[Dict[str, List[str]]] = None,
+                              units: Optional[Dict[str, str]] = None) -> 'DataDict':
+        """
+        Create a dataset from a structured array, one data field per column.
+
+        The values of the fields are views of ``records``; no data is copied.
+        Appending data later does not change ``records``.
+
+        :param records: The structured array.
+        :param axes: The axes of the dependents, by name of the dependent.
+        :param units: The units of the data fields, by name.
+        :return: The new dataset, using record storage.
+        :raises: ``ValueError`` if ``records`` is not a 1d structured array.
+        """
+        if records.dtype.names is None or records.ndim != 1:
+            raise ValueError('Records must be a 1d structured array.')
+        axes = {} if axes is None else axes
+        units = {} if units is None else units
+
+        ret = cls()
+        for k in records.dtype.names:
+            ret[k] = dict(values=records[k], axes=list(axes.get(k, [])),
+                          unit=units.get(k, ''))
+        ret._set_record_buffer(records, records.shape[0])
+        ret.validate()
+        return ret
+
+    def add_records(self, records: np.ndarray) -> None:
+        """
+        Append multiple records at once.
+
+        If the dataset is empty, or if it uses record storage, the records
+        are written into the record array (see ``use_record_storage``).
+
+        :param records: A 1d structured array with one field per data field.
+        :raises: ``ValueError`` if the fields of ``records`` do not match the
+                 data fields.
+        """
+        names = [k for k, _ in self.data_items()]
+        if (records.dtype.names is None or records.ndim != 1
+                or sorted(records.dtype.names) != sorted(names)):
+            raise ValueError('Records must be a 1d structured array with '
+                             f'fields {names}.')
+
+        nrecords = self.nrecords()
+        if nrecords is not None and nrecords > 0:
+            dd = misc.unwrap_optional(self.structure(same_type=True))
+            for k in names:
+                dd[k]['values'] = records[k]
+            self._append_values(dd)
+        else:
+            buf = np.empty(max(self.min_capacity, records.shape[0]),
+                           dtype=records.dtype)
+            buf[:records.shape[0]] = records
+            self._set_record_buffer(buf, records.shape[0])
+        self.validate()
+
     # shape information and expansion
 
     def nrecords(self) -> Optional[int]:
@@ -956,6 +1773,9 @@ class DataDict(DataDictBase):
         :return: ``True`` if valid.
         :raises: ``ValueError`` if invalid.
         """
+        if self._is_validated(DataDict.validate):
+            return True
+
         if super().validate():
             nvals = None
             nvalsrc = None
@@ -963,7 +1783,8 @@ class DataDict(DataDictBase):
 
             for n, v in self.data_items():
                 if type(v['values']) not in [np.ndarray,
-                                             np.ma.core.MaskedArray]:
+                                             np.ma.core.MaskedArray] \
+                        and not isinstance(v['values'], LazyValues):
                     self[n]['values'] = np.array(v['values'])
 
                 if nvals is None:
@@ -978,6 +1799,7 @@ class DataDict(DataDictBase):
             if msg != '\n':
                 raise ValueError(msg)
 
+        self._set_validated(DataDict.validate)
         return True
 
     def sanitize(self) -> "DataDict":
@@ -992,52 +1814,90 @@ class DataDict(DataDictBase):
         ret = super().sanitize()
         return ret.remove_invalid_entries()
 
+    def _share_row_checks(self, other: DataDictBase) -> None:
+        if isinstance(other, DataDict):
+            other._invalid_records = self._invalid_records
+
+    def _checked_records(self, key: str) -> Tuple[int, np.ndarray]:
+        """
+        Get the result of previous checks for invalid records of field ``key``.
+
+        The result of a check of some values applies as long as the values of
+        the field (or the ones of a dataset sharing the checks) start with the
+        same memory, i.e., are the checked array or a view of the same
+        memory with at least as many records. Modifying values in place after
+        they have been checked is not detected.
+
+        :param key: Name of the data field.
+        :return: The number of leading records that have been checked, and the
+                 indices of the fully invalid records among them.
+        """
+        vals = self.data_vals(key)
+        if not isinstance(vals, np.ndarray):
+            return 0, np.zeros(0, dtype=int)
+
+        data = np.ma.getdata(vals)
+        for checked, n, idxs in self._invalid_records.get(key, []):
+            if vals is checked:
+                return n, idxs
+            cdata = np.ma.getdata(checked)
+            if (data.__array_interface__['data'][0] == cdata.__array_interface__['data'][0]
+                    and data.dtype == cdata.dtype and data.strides == cdata.strides
+                    and data.shape[1:] == cdata.shape[1:] and data.shape[0] >= n):
+                return n, idxs
+        return 0, np.zeros(0, dtype=int)
+
+    def _set_checked_records(self, key: str, n: int, idxs: np.ndarray) -> None:
+        """
+        Record that the first ``n`` records of the current values of field
+        ``key`` have been checked, and that the ones at ``idxs`` are invalid.
+        """
+        vals = self.data_vals(key)
+        if n > 0 and isinstance(vals, np.ndarray):
+            entries = [e for e in self._invalid_records.get(key, []) if e[0] is not vals]
+            entries.insert(0, (vals, n, idxs))
+            self._invalid_records[key] = entries[:self.max_checked_values]
+
     def remove_invalid_entries(self) -> 'DataDict':
         """
         Remove all rows that are ``None`` or ``np.nan`` in *all* dependents.
 
+        Only records that have not been checked before are inspected, so
+        sanitizing growing data repeatedly does not look at the old records
+        again. If no rows are invalid, the values are not changed. Lazily
+        loaded values (see ``LazyValues``) are not checked.
+
         :return: The cleaned DataDict.
         """
-        ishp = self._inner_shapes()
-        idxs = []
-
-        # collect rows that are completely invalid
+        remove: Optional[np.ndarray] = None
+        checked: Dict[str, Tuple[int, np.ndarray]] = {}
         for d in self.dependents():
-
-            #  need to discriminate whether there are nested dims or not
-            if len(ishp[d]) == 0:
-                rows = self.data_vals(d)
+            vals = self.data_vals(d)
+            if isinstance(vals, LazyValues):
+                # we would need to read all data to find invalid records.
+                remove = np.zeros(0, dtype=int)
+                continue
+            n, idxs = self._checked_records(d)
+            nrows = len(vals) if np.ndim(vals) > 0 else 0
+            if nrows > n:
+                new_idxs = np.nonzero(num.invalid_rows(vals[n:]))[0] + n
+                idxs = np.concatenate((idxs, new_idxs))
+                n = nrows
+                self._set_checked_records(d, n, idxs)
+            checked[d] = (n, idxs)
+
+            if remove is None:
+                remove = idxs
             else:
-                datavals = self.data_vals(d)
-                rows = datavals.reshape(-1, int(np.prod(ishp[d])))
-
-            _idxs: np.ndarray = np.array([])
+                remove = np.intersect1d(remove, idxs, assume_unique=True)
 
-            # get indices of all rows that are fully None
-            if len(ishp[d]) == 0:
-                _newidxs = np.atleast_1d(np.asarray(rows is None)).nonzero()[0]
-            else:
-                _newidxs = np.atleast_1d(np.asarray(np.all(rows is None, axis=-1))).nonzero()[0]
-            _idxs = np.append(_idxs, _newidxs)
-
-            # get indices for all rows that are fully NaN. works only
-            # for some dtypes, so except TypeErrors.
-            try:
-                if len(ishp[d]) == 0:
-                    _newidxs = np.where(np.isnan(rows))[0]
-                else:
-                    _newidxs = np.where(np.all(np.isnan(rows), axis=-1))[0]
-                _idxs = np.append(_idxs, _newidxs)
-            except TypeError:
-                pass
-
-            idxs.append(_idxs)
-
-        if len(idxs) > 0:
-            remove_idxs = reduce(np.intersect1d,
-                                 tuple(np.array(idxs).astype(int)))
+        if remove is not None and remove.size > 0:
             for k, v in self.data_items():
-                v['values'] = np.delete(v['values'], remove_idxs, axis=0)
+                v['values'] = np.delete(v['values'], remove, axis=0)
+            for d, (n, idxs) in checked.items():
+                idxs = np.setdiff1d(idxs, remove, assume_unique=True)
+                idxs = idxs - np.searchsorted(remove, idxs)
+                self._set_checked_records(d, n - remove.size, idxs)
 
         return self
 
@@ -1057,7 +1917,7 @@ class MeshgridDataDict(DataDictBase):
         :returns: The shape as tuple. ``None`` if no data in the set.
         """
         for d, _ in self.data_items():
-            return np.array(self.data_vals(d)).shape
+            return np.shape(self.data_vals(d))
         return None
 
     def validate(self) -> bool:
@@ -1071,6 +1931,9 @@ class MeshgridDataDict(DataDictBase):
         :return: ``True`` if valid.
         :raises: ``ValueError`` if invalid.
         """
+        if self._is_validated(MeshgridDataDict.validate):
+            return True
+
         if not super().validate():
             return False
 
@@ -1092,7 +1955,8 @@ class MeshgridDataDict(DataDictBase):
         data_items = dict(self.data_items())
 
         for n, v in data_items.items():
-            if type(v['values']) not in [np.ndarray, np.ma.core.MaskedArray]:
+            if type(v['values']) not in [np.ndarray, np.ma.core.MaskedArray] \
+                    and not isinstance(v['values'], LazyValues):
                 self[n]['values'] = np.array(v['values'])
 
             if shp is None:
@@ -1120,7 +1984,14 @@ class MeshgridDataDict(DataDictBase):
 
                         try:
                             if axis_data.shape[axis_num] > 1:
-                                steps = np.unique(np.sign(np.diff(axis_data, axis=axis_num)))
+                                diff_axis = axis_num
+                                if isinstance(axis_data, LazyValues):
+                                    # only check one line, to not read all data.
+                                    line = tuple(slice(None) if i == axis_num else 0
+                                                 for i in range(axis_data.ndim))
+                                    axis_data = axis_data[line]
+                                    diff_axis = 0
+                                steps = np.unique(np.sign(np.diff(axis_data, axis=diff_axis)))
                                 
                                 # for incomplete data, there maybe nan steps -- we need to remove those, 
                                 # doesn't mean anything is wrong.
@@ -1142,6 +2013,7 @@ class MeshgridDataDict(DataDictBase):
             if msg != '\n':
                 raise ValueError(msg)
 
+        self._set_validated(MeshgridDataDict.validate)
         return True
 
     def reorder_axes(self, data_names: Union[str, Sequence[str], None] = None,
@@ -1264,6 +2136,9 @@ def guess_shape_from_datadict(data: DataDict) -> \
         axes: Dict[str, np.ndarray] = {}
         for a in axnames:
             axdata = data.data_vals(a)
+            if isinstance(axdata, LazyValues):
+                # the guess needs all values, read them only once.
+                axdata = axdata.load()
             axes[a] = axdata
         shapes[d] = num.guess_grid_from_sweep_direction(**axes)
 
@@ -1297,7 +2172,9 @@ def datadict_to_meshgrid(data: DataDict,
         already has. For numpy-array data, this might already be present.
         If ``False``, flatten and reshape.
     :param copy: if ``True``, then we make a copy of the data arrays.
-        if ``False``, data array is modified in-place.
+        if ``False``, the values of complete grids are views of the input
+        values (if they can be reshaped without copying); incomplete grids
+        are always padded into new arrays.
 
     :raises: GriddingError (subclass of ValueError) if the data cannot be gridded.
     :returns: The generated ``MeshgridDataDict``.
@@ -1333,14 +2210,20 @@ def datadict_to_meshgrid(data: DataDict,
     axlist = data.axes(data.dependents()[0])
 
     for k, v in data.data_items():
-        vals = num.array1d_to_meshgrid(v['values'], target_shape, copy=copy)
+        vals = v['values']
+        if isinstance(vals, LazyValues) and vals.size == int(np.prod(target_shape)):
+            # complete grids of lazy values stay lazy.
+            vals = vals.reshape(target_shape)
+        else:
+            vals = num.array1d_to_meshgrid(vals, target_shape, copy=copy)
 
         # if an inner axis order is given, we transpose to transform from that
         # to the specified order.
         if inner_axis_order is not None:
             transpose_idxs = misc.reorder_indices(
                 inner_axis_order, axlist)
-            vals = vals.transpose(transpose_idxs)
+            if transpose_idxs != tuple(range(len(transpose_idxs))):
+                vals = vals.transpose(transpose_idxs)
 
         newdata[k]['values'] = vals
 
@@ -1349,16 +2232,23 @@ def datadict_to_meshgrid(data: DataDict,
     return newdata
 
 
-def meshgrid_to_datadict(data: MeshgridDataDict) -> DataDict:
+def meshgrid_to_datadict(data: MeshgridDataDict, copy: bool = True) -> DataDict:
     """
     Make a DataDict from a MeshgridDataDict by reshaping the data.
 
     :param data: Input ``MeshgridDataDict``.
+    :param copy: if ``True``, then we make a copy of the data arrays.
+        if ``False``, the values are views of the input values, if they can
+        be flattened without copying.
     :return: Flattened ``DataDict``.
     """
     newdata = DataDict(**misc.unwrap_optional(data.structure(add_shape=False)))
     for k, v in data.data_items():
-        val = v['values'].copy().reshape(-1)
+        vals = v['values']
+        val = vals.reshape(-1)
+        # reshaping has already made a copy if the input was not contiguous.
+        if copy and isinstance(val, np.ndarray) and np.may_share_memory(val, vals):
+            val = val.copy()
         newdata[k]['values'] = val
 
     newdata = newdata.sanitize()
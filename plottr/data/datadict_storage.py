@@ -6,6 +6,8 @@ Provides file-storage tools for the DataDict class.
     Any function in this module that interacts with a ddh5 file, will create a lock file while it is using the file.
     The lock file has the following format: ~<file_name>.lock. The file lock will get deleted even if the program
     crashes. If the process is suddenly stopped however, we cannot guarantee that the file lock will be deleted.
+    Such stale lock files are removed by :class:`FileOpener` if the process that created them is not running
+    anymore.
 """
 import os
 import logging
@@ -14,13 +16,15 @@ import datetime
 import uuid
 import json
 import shutil
+import socket
 from enum import Enum
-from typing import Any, Union, Optional, Dict, Type, Collection
+from typing import Any, Union, Optional, Dict, Type, Collection, Tuple, Iterator
 from types import TracebackType
 from pathlib import Path
 
 import numpy as np
 import h5py
+import psutil
 
 from qcodes.utils import NumpyJSONEncoder
 from plottr import QtGui, Signal, Slot, QtWidgets, QtCore
@@ -30,7 +34,8 @@ from ..node import (
     emitGuiUpdate,
 )
 
-from .datadict import DataDict, is_meta_key, DataDictBase
+from .datadict import DataDict, is_meta_key, DataDictBase, LazyValues
+from ..utils import misc
 
 __author__ = 'Wolfgang Pfaff'
 __license__ = 'MIT'
@@ -38,6 +43,10 @@ __license__ = 'MIT'
 DATAFILEXT = 'ddh5'
 TIMESTRFORMAT = "%Y-%m-%d %H:%M:%S"
 
+#: Name of the dataset attribute that holds the number of valid rows for
+#: datasets that are allocated with more rows than they contain data.
+LENGTHATTR = 'valid_length'
+
 logger = logging.getLogger(__name__)
 
 # FIXME: need correct handling of dtypes and list/array conversion
@@ -128,6 +137,22 @@ def add_cur_time_attr(h5obj: Any, name: str = 'creation',
     set_attr(h5obj, prefix + name + '_time_str' + suffix, tstr)
 
 
+def dataset_length(ds: h5py.Dataset) -> int:
+    """Get the number of valid rows of a dataset.
+
+    Only reads the dataset header and attributes, not the data.
+    Datasets that have been over-allocated (see :func:`datadict_to_hdf5`)
+    have more rows than valid data; the valid length is then stored as
+    attribute.
+
+    :param ds: The HDF5 dataset.
+    :return: The number of rows that contain data.
+    """
+    if LENGTHATTR in ds.attrs:
+        return int(ds.attrs[LENGTHATTR])
+    return ds.shape[0]
+
+
 # elementary reading/writing
 
 def _data_file_path(file: Union[str, Path], init_directory: bool = False) -> Path:
@@ -147,13 +172,26 @@ def datadict_to_hdf5(datadict: DataDict,
                      path: Union[str, Path],
                      groupname: str = 'data',
                      append_mode: AppendMode = AppendMode.new,
-                     file_timeout: Optional[float] = None) -> None:
+                     file_timeout: Optional[float] = None,
+                     growth_factor: Optional[float] = None,
+                     chunk_rows: Optional[int] = None,
+                     compression: Optional[str] = None,
+                     compression_opts: Any = None) -> None:
     """Write a DataDict to DDH5
 
     Note: Meta data is only written during initial writing of the dataset.
     If we're appending to existing datasets, we're not setting meta
     data anymore.
 
+    When appending frequently (for instance, one row at a time), resizing the
+    datasets for every write is slow. If a `growth_factor` is given, datasets
+    are allocated with more rows than needed: whenever a dataset is too small,
+    it is resized to ``growth_factor`` times the required size. The number of
+    valid rows is then stored in the dataset attribute
+    ``valid_length`` (see :func:`dataset_length`), which the readers in this
+    module respect. Datasets that are over-allocated once remain so, also when
+    appending to them without `growth_factor`.
+
     :param datadict: Datadict to write to disk.
     :param path: Path of the file (extension may be omitted).
     :param groupname: Name of the top level group to store the data in.
@@ -167,59 +205,115 @@ def datadict_to_hdf5(datadict: DataDict,
     :param file_timeout: How long the function will wait for the ddh5 file to unlock. Only relevant if you are
         writing to a file that already exists and some other program is trying to read it at the same time.
         If none uses the default value from the :class:`FileOpener`.
-
+    :param growth_factor: If not ``None``, over-allocate datasets by this factor
+        (must be larger than 1) when they need to grow.
+    :param chunk_rows: Number of rows per HDF5 chunk for newly created datasets.
+        If ``None``, h5py chooses the chunk shape.
+    :param compression: Compression filter for newly created datasets
+        (e.g., 'gzip' or 'lzf'; see :meth:`h5py.Group.create_dataset`).
+    :param compression_opts: Options for the compression filter.
     """
+    if growth_factor is not None and growth_factor <= 1:
+        raise ValueError('growth_factor must be larger than 1.')
+
     filepath = _data_file_path(path, True)
     if not filepath.exists():
         append_mode = AppendMode.none
 
     with FileOpener(filepath, 'a', file_timeout) as f:
-        if append_mode is AppendMode.none:
-            init_file(f, groupname)
-        assert groupname in f
-        grp = f[groupname]
+        _write_datadict(f, datadict, groupname, append_mode,
+                        growth_factor=growth_factor,
+                        chunk_rows=chunk_rows,
+                        compression=compression,
+                        compression_opts=compression_opts)
+
+
+def _write_datadict(f: h5py.File,
+                    datadict: DataDict,
+                    groupname: str,
+                    append_mode: AppendMode,
+                    growth_factor: Optional[float] = None,
+                    chunk_rows: Optional[int] = None,
+                    compression: Optional[str] = None,
+                    compression_opts: Any = None,
+                    swmr: bool = False) -> None:
+    """Write a DataDict into an open HDF5 file.
+
+    See :func:`datadict_to_hdf5` for the parameters.
+    If `swmr` is ``True``, the file is in SWMR write mode. We then only append to
+    existing datasets, and do not touch any attributes.
+    """
+    if swmr and (append_mode is AppendMode.none or growth_factor is not None):
+        raise ValueError('In SWMR mode, we can only append to existing datasets.')
+
+    if append_mode is AppendMode.none:
+        init_file(f, groupname)
+    assert groupname in f
+    grp = f[groupname]
 
-        # add top-level meta data.
+    # add top-level meta data.
+    if not swmr:
         for k, v in datadict.meta_items(clean_keys=False):
             set_attr(grp, k, v)
 
-        for k, v in datadict.data_items():
-            data = v['values']
-            shp = data.shape
-            nrows = shp[0]
-
-            # create new dataset, add axes and unit metadata
-            if k not in grp:
-                maxshp = tuple([None] + list(shp[1:]))
-                ds = grp.create_dataset(k, maxshape=maxshp, data=data)
-
-                # add meta data
-                add_cur_time_attr(ds)
-
-                if v.get('axes', []):
-                    set_attr(ds, 'axes', v['axes'])
-                if v.get('unit', "") != "":
-                    set_attr(ds, 'unit', v['unit'])
-
-                for kk, vv in datadict.meta_items(k, clean_keys=False):
-                    set_attr(ds, kk, vv)
-                ds.flush()
-
-            # if the dataset already exits, append data according to
-            # chosen append mode.
+    for k, v in datadict.data_items():
+        data = v['values']
+        shp = data.shape
+        nrows = shp[0]
+
+        # create new dataset, add axes and unit metadata
+        if k not in grp:
+            if swmr:
+                raise ValueError('Cannot create new datasets in SWMR mode.')
+            maxshp = tuple([None] + list(shp[1:]))
+            chunks: Optional[Tuple[int, ...]] = None
+            if chunk_rows is not None:
+                chunks = tuple([chunk_rows] + list(shp[1:]))
+            ds = grp.create_dataset(k, maxshape=maxshp, data=data,
+                                    chunks=chunks, compression=compression,
+                                    compression_opts=compression_opts)
+            if growth_factor is not None:
+                ds.attrs[LENGTHATTR] = nrows
+
+            # add meta data
+            add_cur_time_attr(ds)
+
+            if v.get('axes', []):
+                set_attr(ds, 'axes', v['axes'])
+            if v.get('unit', "") != "":
+                set_attr(ds, 'unit', v['unit'])
+
+            for kk, vv in datadict.meta_items(k, clean_keys=False):
+                set_attr(ds, kk, vv)
+            ds.flush()
+
+        # if the dataset already exits, append data according to
+        # chosen append mode.
+        else:
+            ds = grp[k]
+            dslen = dataset_length(ds)
+
+            if append_mode == AppendMode.new:
+                newlen = nrows
+                newdata = data[dslen:]
+            elif append_mode == AppendMode.all:
+                newlen = dslen + nrows
+                newdata = data[:]
             else:
-                ds = grp[k]
-                dslen = ds.shape[0]
-
-                if append_mode == AppendMode.new:
-                    newshp = tuple([nrows] + list(shp[1:]))
-                    ds.resize(newshp)
-                    ds[dslen:] = data[dslen:]
-                elif append_mode == AppendMode.all:
-                    newshp = tuple([dslen + nrows] + list(shp[1:]))
-                    ds.resize(newshp)
-                    ds[dslen:] = data[:]
-                ds.flush()
+                continue
+
+            overallocated = growth_factor is not None or LENGTHATTR in ds.attrs
+            if swmr and overallocated:
+                raise ValueError('Over-allocated datasets are not supported in SWMR mode.')
+            if newlen > ds.shape[0] or not overallocated:
+                capacity = newlen
+                if growth_factor is not None:
+                    capacity = max(newlen, int(np.ceil(ds.shape[0] * growth_factor)))
+                ds.resize(tuple([capacity] + list(shp[1:])))
+            ds[dslen:newlen] = newdata
+            if overallocated:
+                ds.attrs[LENGTHATTR] = newlen
+            ds.flush()
 
 
 def init_file(f: h5py.File,
@@ -237,13 +331,57 @@ def init_file(f: h5py.File,
         f.flush()
 
 
+class HDF5Values(LazyValues):
+    """Values of a dataset in a ddh5 file that are only read when needed (see
+    :class:`.LazyValues`).
+
+    The file is opened with a :class:`FileOpener` for each read, and closed
+    right after, so no file handle is kept open.
+
+    :param path: Path of the file.
+    :param groupname: Name of the group that contains the dataset.
+    :param name: Name of the dataset.
+    :param startidx: First row of the dataset that belongs to the values.
+    :param stopidx: Row after the last one that belongs to the values.
+    :param inner_shape: Shape of a single row.
+    :param dtype: Data type of the dataset.
+    :param file_timeout: Passed on to :class:`FileOpener`.
+    :param swmr: Passed on to :class:`FileOpener`.
+    """
+
+    def __init__(self, path: Union[str, Path], groupname: str, name: str,
+                 startidx: int, stopidx: int,
+                 inner_shape: Tuple[int, ...], dtype: Any,
+                 file_timeout: Optional[float] = None, swmr: bool = False):
+        super().__init__(stopidx - startidx, inner_shape, dtype)
+        self.path = Path(path)
+        self.groupname = groupname
+        self.name = name
+        self.startidx = startidx
+        self.file_timeout = file_timeout
+        self.swmr = swmr
+
+    def _read(self, rows: Union[slice, np.ndarray]) -> np.ndarray:
+        if isinstance(rows, slice):
+            rows = slice(rows.start + self.startidx, rows.stop + self.startidx, rows.step)
+        else:
+            rows = rows + self.startidx
+        with FileOpener(self.path, 'r', self.file_timeout, swmr=self.swmr) as f:
+            ds = f[self.groupname][self.name]
+            if self.swmr:
+                ds.refresh()
+            return np.asarray(ds[rows])
+
+
 def datadict_from_hdf5(path: Union[str, Path],
                        groupname: str = 'data',
                        startidx: Union[int, None] = None,
                        stopidx: Union[int, None] = None,
                        structure_only: bool = False,
                        ignore_unequal_lengths: bool = True,
-                       file_timeout: Optional[float] = None) -> DataDict:
+                       file_timeout: Optional[float] = None,
+                       swmr: bool = False,
+                       lazy: bool = False) -> DataDict:
     """Load a DataDict from file.
 
     :param path: Full filepath without the file extension.
@@ -255,6 +393,10 @@ def datadict_from_hdf5(path: Union[str, Path],
         unequal length; will return the longest consistent DataDict possible.
     :param file_timeout: How long the function will wait for the ddh5 file to unlock. If none uses the default
         value from the :class:`FileOpener`.
+    :param swmr: If ``True``, open the file in SWMR read mode (see :class:`FileOpener`). This does not
+        wait for lock files, and allows reading while a :class:`DDH5Writer` in SWMR mode writes to the file.
+    :param lazy: If ``True``, don't read the data values now. The values are :class:`HDF5Values`, that read only
+        the data that is actually used, when it is used. This allows working with files that do not fit into memory.
     :return: Validated DataDict.
     """
     filepath = _data_file_path(path)
@@ -265,13 +407,18 @@ def datadict_from_hdf5(path: Union[str, Path],
         startidx = 0
 
     res = {}
-    with FileOpener(filepath, 'r', file_timeout) as f:
+    with FileOpener(filepath, 'r', file_timeout, swmr=swmr) as f:
         if groupname not in f:
             raise ValueError('Group does not exist.')
 
         grp = f[groupname]
         keys = list(grp.keys())
-        lens = [len(grp[k][:]) for k in keys]
+        if swmr:
+            for k in keys:
+                grp[k].refresh()
+        # only inspect the dataset headers here; reading the data just to
+        # determine its length is prohibitively slow for large files.
+        lens = [dataset_length(grp[k]) for k in keys]
 
         if len(set(lens)) > 1:
             if not ignore_unequal_lengths:
@@ -299,10 +446,14 @@ def datadict_from_hdf5(path: Union[str, Path],
             if 'unit' in ds.attrs:
                 entry['unit'] = deh5ify(ds.attrs['unit'])
 
-            if not structure_only:
+            if lazy and not structure_only:
+                entry['values'] = HDF5Values(filepath, groupname, k, startidx,
+                                             max(startidx, stopidx), ds.shape[1:],
+                                             ds.dtype, file_timeout, swmr)
+            elif not structure_only:
                 entry['values'] = ds[startidx:stopidx]
 
-            entry['__shape__'] = ds[:].shape
+            entry['__shape__'] = tuple([dataset_length(ds)] + list(ds.shape[1:]))
 
             # and now the meta data
             for attr in ds.attrs:
@@ -332,7 +483,7 @@ def all_datadicts_from_hdf5(path: Union[str, Path], file_timeout: Optional[float
         raise ValueError("Specified file does not exist.")
 
     ret = {}
-    with FileOpener(filepath, 'r', file_timeout) as f:
+    with FileOpener(filepath, 'r', file_timeout, swmr=kwargs.get('swmr', False)) as f:
         keys = [k for k in f.keys()]
     for k in keys:
         ret[k] = datadict_from_hdf5(path=path, groupname=k, file_timeout=file_timeout, **kwargs)
@@ -346,28 +497,58 @@ class FileOpener:
     Context manager for opening files, creates its own file lock to indicate other programs that the file is being
     used. The lock file follows the following structure: "~<file_name>.lock".
 
+    While waiting for a file to be unlocked, the time in between checks increases exponentially, starting at 1 ms,
+    up to `test_delay`. The lock file contains the host name and process ID of the process holding the lock, and a
+    random token that identifies the lock. That allows detecting lock files that were left behind by processes that
+    crashed; such stale lock files are removed automatically.
+
     :param path: The file path.
     :param mode: The opening file mode. Only the following modes are supported: 'r', 'w', 'w-', 'a'. Defaults to 'r'.
     :param timeout: Time, in seconds, the context manager waits for the file to unlock. Defaults to 30.
-    :param test_delay: Length of time in between checks. I.e. how long the FileOpener waits to see if a file got
-        unlocked again
+    :param test_delay: Maximum length of time in between checks. I.e. how long the FileOpener waits at most to see
+        if a file got unlocked again
+    :param swmr: Open the file for reading in HDF5's single-writer/multiple-reader (SWMR) mode. No lock file is
+        used in that case, since HDF5 makes sure that readers see consistent data while the file is being
+        written. Only supported for mode 'r'. A file that a writer has open in SWMR mode has no lock file, and can
+        only be read in SWMR mode; in mode 'r', such files are therefore opened in SWMR mode also if `swmr` is
+        ``False``.
+    :param stale_lock_age: If not ``None``, lock files older than this (in seconds) are considered stale, also when
+        we cannot determine whether the process that created them is still running (e.g., because it runs on a
+        different machine).
    """
 
+    #: Time (in seconds) in between the first checks for the lock.
+    min_delay = 0.001
+
+    #: Time (in seconds) after which the lock file used for removing a stale lock file is considered stale itself.
+    #: Removing a lock file takes much less than that.
+    stale_reclaim_age = 10.
+
     def __init__(self, path: Union[Path, str],
                  mode: str = 'r',
                  timeout: Optional[float] = None,
-                 test_delay: float = 0.1):
+                 test_delay: float = 0.1,
+                 swmr: bool = False,
+                 stale_lock_age: Optional[float] = None):
         self.path = Path(path)
         self.lock_path = self.path.parent.joinpath("~" + str(self.path.stem) + '.lock')
         if mode not in ['r', 'w', 'w-', 'a']:
             raise ValueError("Only 'r', 'w', 'w-', 'a' modes are supported.")
+        if swmr and mode != 'r':
+            raise ValueError("SWMR is only supported for mode 'r'.")
         self.mode = mode
+        self.swmr = swmr
+        self._locked = False
         self.default_timeout = 30.
         if timeout is None:
             self.timeout = self.default_timeout
         else:
             self.timeout = timeout
         self.test_delay = test_delay
+        self.stale_lock_age = stale_lock_age
+
+        #: Time (in seconds) spent waiting for the lock and for opening the file.
+        self.wait_time = 0.
 
         self.file: Optional[h5py.File] = None
 
@@ -383,32 +564,186 @@ class FileOpener:
             assert self.file is not None
             self.file.close()
         finally:
-            if self.lock_path.is_file():
+            self._release_lock()
+
+    def _delays(self) -> Iterator[float]:
+        delay = min(self.min_delay, self.test_delay)
+        while True:
+            yield delay
+            delay = min(2 * delay, self.test_delay)
+
+    def _acquire_lock(self) -> bool:
+        try:
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        # This happens if some other process holds the lock.
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{socket.gethostname()}\n{os.getpid()}\n{uuid.uuid4().hex}\n")
+        self._locked = True
+        return True
+
+    def _release_lock(self) -> None:
+        if self._locked and self.lock_path.is_file():
+            self.lock_path.unlink()
+        self._locked = False
+
+    def lock_is_stale(self) -> bool:
+        """Check whether the lock file has been left behind by a process that does not exist anymore.
+
+        :return: ``True`` if the lock file was created by a process on this machine that is not running
+            anymore, or if it is older than `stale_lock_age`.
+        """
+        lock = self._read_lock()
+        return lock is not None and self._is_stale(*lock)
+
+    def _read_lock(self) -> Optional[Tuple[str, os.stat_result]]:
+        """Get the content and status of the lock file, or ``None`` if it can't be read."""
+        try:
+            stat = self.lock_path.stat()
+            return self.lock_path.read_text(), stat
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _is_stale(self, content: str, stat: os.stat_result) -> bool:
+        if self.stale_lock_age is not None and time.time() - stat.st_mtime > self.stale_lock_age:
+            return True
+
+        # a lock file that is still being written (or one of an older plottr version) has no owner.
+        owner = content.split()
+        if len(owner) < 2 or owner[0] != socket.gethostname():
+            return False
+        try:
+            pid = int(owner[1])
+        except ValueError:
+            return False
+        return not psutil.pid_exists(pid)
+
+    def _remove_stale_lock(self, lock: Tuple[str, os.stat_result]) -> bool:
+        """Remove the lock file, if it is the one that has been found to be stale.
+
+        Several processes may find the same stale lock at the same time. When one of them has removed it and
+        created its own lock, the others must not remove that one. Removing stale locks is therefore
+        serialized with a second lock file, "<lock>.reclaim", that is created exclusively. Holding it, we check
+        again that the lock file is still the stale one before deleting it. Lock files that are not stale are
+        never touched.
+
+        :param lock: content and status of the stale lock file, as returned by :meth:`_read_lock`.
+        :return: ``True`` if the stale lock file has been removed.
+        """
+        reclaim_path = self.lock_path.with_name(self.lock_path.name + '.reclaim')
+        try:
+            fd = os.open(reclaim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            # somebody else is removing it, unless they crashed while doing so.
+            self._remove_stale_reclaim(reclaim_path)
+            return False
+
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(f"{socket.gethostname()}\n{os.getpid()}\n")
+
+            current = self._read_lock()
+            if current is None or not self._same_lock(current, lock) or not self._is_stale(*current):
+                return False
+            try:
                 self.lock_path.unlink()
+            except FileNotFoundError:
+                return False
+            return True
+        finally:
+            reclaim_path.unlink()
 
-    def open_when_unlocked(self) -> h5py.File:
+    @staticmethod
+    def _same_lock(lock: Tuple[str, os.stat_result], other: Tuple[str, os.stat_result]) -> bool:
+        (content, stat), (other_content, other_stat) = lock, other
+        return (content == other_content and stat.st_ino == other_stat.st_ino
+                and stat.st_mtime_ns == other_stat.st_mtime_ns)
+
+    def _remove_stale_reclaim(self, reclaim_path: Path) -> None:
+        """Remove the reclaim lock file if it has been left behind by a process that crashed while removing a
+        stale lock file."""
+        try:
+            stat = reclaim_path.stat()
+            content = reclaim_path.read_text()
+        except (OSError, UnicodeDecodeError):
+            return
+        if self._is_stale(content, stat) or time.time() - stat.st_mtime > self.stale_reclaim_age:
+            try:
+                reclaim_path.unlink()
+            except OSError:
+                pass
+            logger.warning(f"Removed stale lock file '{reclaim_path}'.")
+
+    def _wait(self, t0: float, delays: Iterator[float], msg: str) -> None:
+        if time.time() - t0 > self.timeout:
+            raise RuntimeError(msg)
+        time.sleep(next(delays))  # don't overwhelm the FS by very fast repeated calls.
+
+    def open_swmr(self) -> h5py.File:
         t0 = time.time()
+        delays = self._delays()
         while True:
-            if not self.lock_path.is_file():
-                try:
-                    self.lock_path.touch(exist_ok=False)
-                # This happens if some other process beat this one and created the file beforehand
-                except FileExistsError:
-                    continue
-
-                while True:
+            try:
+                f = h5py.File(str(self.path), 'r', libver='latest', swmr=True)
+                self._record_wait_time(t0)
+                return f
+            except (OSError, PermissionError, RuntimeError):
+                pass
+            self._wait(t0, delays, 'Timeout while trying to open file in SWMR mode')
+
+    def _open_swmr_written(self) -> Optional[h5py.File]:
+        """Open the file in SWMR read mode, if we are reading and the file can be opened that way.
+
+        Used when the file can't be opened normally: that is the case while a writer in SWMR mode has it open.
+        """
+        if self.mode != 'r':
+            return None
+        try:
+            f = h5py.File(str(self.path), 'r', libver='latest', swmr=True)
+        except (OSError, PermissionError, RuntimeError):
+            return None
+        logger.debug(f"Opened '{self.path}' in SWMR mode, since it is being written in SWMR mode.")
+        return f
+
+    def open_when_unlocked(self) -> h5py.File:
+        if self.swmr:
+            return self.open_swmr()
+
+        t0 = time.time()
+        delays = self._delays()
+        try:
+            while True:
+                if self._locked or self._acquire_lock():
                     try:
                         f = h5py.File(str(self.path), self.mode)
+                        self._record_wait_time(t0)
                         return f
                     except (OSError, PermissionError, RuntimeError):
                         pass
-                    time.sleep(self.test_delay)  # don't overwhelm the FS by very fast repeated calls.
-                    if time.time() - t0 > self.timeout:
-                        raise RuntimeError('Waiting or file unlock timeout')
+                    f = self._open_swmr_written()
+                    if f is not None:
+                        self._release_lock()
+                        self._record_wait_time(t0)
+                        return f
+                    self._wait(t0, delays, 'Waiting or file unlock timeout')
+
+                else:
+                    lock = self._read_lock()
+                    if lock is not None and self._is_stale(*lock) and self._remove_stale_lock(lock):
+                        logger.warning(f"Removed stale lock file '{self.lock_path}'.")
+                    else:
+                        self._wait(t0, delays, 'Lock file remained for longer than timeout time')
 
-            time.sleep(self.test_delay)  # don't overwhelm the FS by very fast repeated calls.
-            if time.time() - t0 > self.timeout:
-                raise RuntimeError('Lock file remained for longer than timeout time')
+        # we don't want to leave our lock behind if we could not open the file.
+        except BaseException:
+            self._release_lock()
+            raise
+
+    def _record_wait_time(self, t0: float) -> None:
+        self.wait_time = time.time() - t0
+        if self.wait_time > self.test_delay:
+            logger.debug(f"Waited {self.wait_time:.3f} s for access to '{self.path}'.")
 
 
 # Node for monitoring #
@@ -421,20 +756,32 @@ class DDH5LoaderWidget(NodeWidget):
 
         self.fileinput = QtWidgets.QLineEdit()
         self.groupinput = QtWidgets.QLineEdit('data')
+        self.incrementalinput = QtWidgets.QCheckBox('Load only new data')
+        self.lazyinput = QtWidgets.QCheckBox('Read data only when needed')
+        self.swmrinput = QtWidgets.QCheckBox('Read in SWMR mode (no waiting for the writer)')
         self.reload = QtWidgets.QPushButton('Reload')
 
         self.optSetters = {
             'filepath': self.fileinput.setText,
             'groupname': self.groupinput.setText,
+            'incremental': self.incrementalinput.setChecked,
+            'lazy': self.lazyinput.setChecked,
+            'swmr': self.swmrinput.setChecked,
         }
         self.optGetters = {
             'filepath': self.fileinput.text,
             'groupname': self.groupinput.text,
+            'incremental': self.incrementalinput.isChecked,
+            'lazy': self.lazyinput.isChecked,
+            'swmr': self.swmrinput.isChecked,
         }
 
         flayout = QtWidgets.QFormLayout()
         flayout.addRow('File path:', self.fileinput)
         flayout.addRow('Group:', self.groupinput)
+        flayout.addRow(self.incrementalinput)
+        flayout.addRow(self.lazyinput)
+        flayout.addRow(self.swmrinput)
 
         vlayout = QtWidgets.QVBoxLayout()
         vlayout.addLayout(flayout)
@@ -448,6 +795,15 @@ class DDH5LoaderWidget(NodeWidget):
         self.groupinput.textEdited.connect(
             lambda x: self.signalOption('groupname')
         )
+        self.incrementalinput.toggled.connect(
+            lambda x: self.signalOption('incremental')
+        )
+        self.lazyinput.toggled.connect(
+            lambda x: self.signalOption('lazy')
+        )
+        self.swmrinput.toggled.connect(
+            lambda x: self.signalOption('swmr')
+        )
         self.reload.pressed.connect(self.node.update)
 
 
@@ -462,6 +818,9 @@ class DDH5Loader(Node):
     def __init__(self, name: str):
         self._filepath: Optional[str] = None
         self._groupname: str = 'data'
+        self._incremental: bool = False
+        self._swmr: bool = False
+        self._lazy: bool = False
 
         super().__init__(name)
 
@@ -493,12 +852,45 @@ class DDH5Loader(Node):
     def groupname(self, val: str) -> None:
         self._groupname = val
 
+    @property
+    def incremental(self) -> bool:
+        """If ``True``, only rows that were added to the file since the last
+        load are read, and appended to the previously loaded data."""
+        return self._incremental
+
+    @incremental.setter
+    @updateOption('incremental')
+    def incremental(self, val: bool) -> None:
+        self._incremental = val
+
+    @property
+    def swmr(self) -> bool:
+        """If ``True``, read the file in SWMR mode, without using lock files. Use this for
+        files written by a :class:`DDH5Writer` in SWMR mode. Files that such a writer has
+        open are read in SWMR mode anyway, but only after trying to open them normally."""
+        return self._swmr
+
+    @swmr.setter
+    @updateOption('swmr')
+    def swmr(self, val: bool) -> None:
+        self._swmr = val
+
+    @property
+    def lazy(self) -> bool:
+        """If ``True``, data values are only read from the file when they are
+        needed (see :func:`datadict_from_hdf5`). Use this for files that are
+        too large to load completely."""
+        return self._lazy
+
+    @lazy.setter
+    @updateOption('lazy')
+    def lazy(self, val: bool) -> None:
+        self._lazy = val
+
     # Data processing #
 
     def process(self, dataIn: Optional[DataDictBase] = None) -> Optional[Dict[str, Any]]:
 
-        # TODO: maybe needs an optional way to read only new data from file? -- can make that an option
-
         # this is the flow when process is called due to some trigger
         if self._filepath is None or self._groupname is None:
             return None
@@ -507,6 +899,9 @@ class DDH5Loader(Node):
 
         if not self.loadingThread.isRunning():
             self.loadingWorker.setPathAndGroup(self.filepath, self.groupname)
+            self.loadingWorker.incremental = self.incremental
+            self.loadingWorker.swmr = self.swmr
+            self.loadingWorker.lazy = self.lazy
             self.loadingThread.start()
         return None
 
@@ -525,6 +920,12 @@ class DDH5Loader(Node):
         # this makes sure that we analyze the data and emit signals for changes
         super().process(dataIn=data)
 
+    def close(self) -> None:
+        self.loadingWorker.dataLoaded.disconnect(self.onThreadComplete)
+        self.loadingThread.quit()
+        self.loadingThread.wait()
+        super().close()
+
 
 class _Loader(QtCore.QObject):
 
@@ -538,7 +939,17 @@ class _Loader(QtCore.QObject):
         self.filepath = filepath
         self.groupname = groupname
 
+        #: if ``True``, only read rows that have not been loaded yet.
+        self.incremental = False
+        #: if ``True``, open files in SWMR mode.
+        self.swmr = False
+        #: if ``True``, only read data values when they are needed.
+        self.lazy = False
+        self.data: Optional[DataDict] = None
+
     def setPathAndGroup(self, filepath: Optional[str], groupname: Optional[str]) -> None:
+        if filepath != self.filepath or groupname != self.groupname:
+            self.data = None
         self.filepath = filepath
         self.groupname = groupname
 
@@ -547,10 +958,57 @@ class _Loader(QtCore.QObject):
             self.dataLoaded.emit(None)
             return True
 
-        data = datadict_from_hdf5(self.filepath, groupname=self.groupname)
+        # loading lazily is cheap, and appending would read all data.
+        if self.incremental and not self.lazy and self.data is not None:
+            data = self.loadNewData()
+        else:
+            data = self._load()
+        self.data = data
         self.dataLoaded.emit(data)
         return True
 
+    def _load(self, startidx: Optional[int] = None) -> DataDict:
+        assert self.filepath is not None and self.groupname is not None
+        return datadict_from_hdf5(self.filepath, groupname=self.groupname,
+                                  startidx=startidx, swmr=self.swmr, lazy=self.lazy)
+
+    def loadNewData(self) -> DataDict:
+        """Read only the rows that were added since the last load, and append
+        them to the previously loaded data.
+
+        Falls back to loading the complete file if the file does not seem to
+        be the same one anymore (different creation time or structure, or
+        fewer rows than already loaded).
+        """
+        assert self.data is not None
+
+        nloaded = self.data.nrecords()
+        assert nloaded is not None
+        newdata = self._load(startidx=nloaded)
+
+        same_file = (
+            newdata.get('__creation_time_sec__') == self.data.get('__creation_time_sec__')
+            and DataDictBase.same_structure(newdata, self.data)
+            and all(v['__shape__'][0] >= nloaded for _, v in newdata.data_items())
+        )
+        if not same_file:
+            return self._load()
+
+        # we don't modify the previously loaded data in place, since it might
+        # still be in use by downstream nodes.
+        nnew = newdata.nrecords()
+        if nnew is not None and nnew > 0:
+            data = self.data.appended(newdata)
+        else:
+            data = self.data.shallow_copy()
+
+        for k, v in newdata.meta_items():
+            data.add_meta(k, v)
+        for d, _ in newdata.data_items():
+            for k, v in newdata.meta_items(d):
+                data.add_meta(k, v, d)
+        return data
+
 
 class DDH5Writer(object):
     """Context manager for writing data to DDH5.
@@ -573,11 +1031,33 @@ class DDH5Writer(object):
     :param filename: Filename to use. Defaults to 'data.ddh5'.
     :param file_timeout: How long the function will wait for the ddh5 file to unlock. If none uses the default
         value from the :class:`FileOpener`.
+    :param keep_data_in_memory: If ``True`` (default), all data written is also kept in :attr:`datadict`.
+        If ``False``, :attr:`datadict` only holds the structure of the data, and new data is appended
+        directly to the file. Memory use then does not grow with the size of the dataset.
+    :param growth_factor: If not ``None``, datasets in the file are over-allocated by this factor
+        when they need to grow, instead of being resized for every write.
+        See :func:`datadict_to_hdf5`.
+    :param chunk_rows: Number of rows per HDF5 chunk. If ``None``, h5py chooses the chunk shape.
+    :param compression: Compression filter used for the datasets (e.g., 'gzip' or 'lzf').
+    :param compression_opts: Options for the compression filter.
+    :param buffer_rows: If not ``None``, data added with :meth:`add_data` is buffered, and only
+        written to the file once at least this many rows are waiting.
+    :param buffer_interval: If not ``None``, data added with :meth:`add_data` is buffered, and
+        written to the file once this many seconds have passed since the last write.
+        The check happens when data is added; there is no background timer.
+        If both `buffer_rows` and `buffer_interval` are given, data is written when either
+        condition is met. Buffered data is always written when the writer is closed, or when
+        :meth:`flush` is called.
+    :param swmr: If ``True``, use HDF5's single-writer/multiple-reader (SWMR) mode.
+        The writer then keeps the file open during the whole measurement and does not
+        use a lock file while writing data; readers can open the file at any time using
+        ``swmr=True`` (see :func:`datadict_from_hdf5` and :class:`DDH5Loader`). Readers that
+        don't use SWMR mode fall back to it while the file is open (see :class:`FileOpener`).
+        The structure of the data is fixed once the first data has been written, and
+        the 'last_change' time is only recorded for that first write. Not compatible with
+        `growth_factor`. SWMR does not work reliably on network drives.
     """
 
-    # TODO: need an operation mode for not keeping data in memory.
-    # TODO: a mode for working with pre-allocated data
-
     def __init__(self,
                  datadict: DataDict,
                  basedir: Union[str, Path] = '.',
@@ -585,7 +1065,15 @@ class DDH5Writer(object):
                  name: Optional[str] = None,
                  filename: str = 'data',
                  filepath: Optional[Union[str, Path]] = None,
-                 file_timeout: Optional[float] = None):
+                 file_timeout: Optional[float] = None,
+                 keep_data_in_memory: bool = True,
+                 growth_factor: Optional[float] = None,
+                 chunk_rows: Optional[int] = None,
+                 compression: Optional[str] = None,
+                 compression_opts: Any = None,
+                 buffer_rows: Optional[int] = None,
+                 buffer_interval: Optional[float] = None,
+                 swmr: bool = False):
         """Constructor for :class:`.DDH5Writer`"""
 
         self.basedir = Path(basedir)
@@ -604,20 +1092,56 @@ class DDH5Writer(object):
 
         self.datadict.add_meta('dataset.name', name)
         self.file_timeout = file_timeout
+        self.keep_data_in_memory = keep_data_in_memory
+        if growth_factor is not None and growth_factor <= 1:
+            raise ValueError('growth_factor must be larger than 1.')
+        if swmr and growth_factor is not None:
+            raise ValueError('growth_factor cannot be used in SWMR mode.')
+        self.growth_factor = growth_factor
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.buffer_rows = buffer_rows
+        self.buffer_interval = buffer_interval
+        self.swmr = swmr
         self.uuid = uuid.uuid1()
 
+        # in SWMR mode, the file stays open while the writer is active.
+        self._file: Optional[h5py.File] = None
+
+        # rows that have been added, but not written yet.
+        # if we keep data in memory, the pending rows are the last rows of
+        # ``self.datadict``; otherwise, they are kept in a separate buffer.
+        self._buffer: Optional[DataDict] = None
+        self._nwritten = 0
+        self._last_write = time.time()
+
     def __enter__(self) -> "DDH5Writer":
         if self.filepath is None:
             self.filepath = _data_file_path(self.data_file_path(), True)
+        else:
+            self.filepath = _data_file_path(self.filepath, True)
         logger.info(f'Data location: {self.filepath}')
 
+        if self.swmr:
+            self._file = h5py.File(str(self.filepath), 'a', libver='latest')
+
         nrecords: Optional[int] = self.datadict.nrecords()
         if nrecords is not None and nrecords > 0:
-            datadict_to_hdf5(self.datadict,
-                             str(self.filepath),
-                             groupname=self.groupname,
-                             append_mode=AppendMode.none,
-                             file_timeout=self.file_timeout)
+            if self._file is not None:
+                _write_datadict(self._file, self.datadict, self.groupname,
+                                AppendMode.none, **self._dataset_options())
+                self._start_swmr()
+            else:
+                datadict_to_hdf5(self.datadict, str(self.filepath),
+                                 groupname=self.groupname,
+                                 append_mode=AppendMode.none,
+                                 file_timeout=self.file_timeout,
+                                 **self._dataset_options())
+            self._nwritten = nrecords
+            if not self.keep_data_in_memory:
+                self.datadict = misc.unwrap_optional(self.datadict.structure(same_type=True))
+        self._last_write = time.time()
         return self
 
     def __exit__(self,
@@ -625,6 +1149,12 @@ class DDH5Writer(object):
                  exc_value: Optional[BaseException],
                  exc_traceback: Optional[TracebackType]) -> None:
         assert self.filepath is not None
+        try:
+            self.flush()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
         with FileOpener(self.filepath, 'a', timeout=self.file_timeout) as f:
             add_cur_time_attr(f.require_group(self.groupname), name='close')
         if exc_type is None:
@@ -677,19 +1207,96 @@ class DDH5Writer(object):
         If some data is scalar and others are not, then the data should be reshaped
         to (1, ) for the scalar data, and (1, ...) for the others; in other words,
         an outer dimension with length 1 is added for all.
+
+        If :attr:`keep_data_in_memory` is ``False``, only the new data is
+        written to the file, and not retained.
+        If buffering is enabled (see `buffer_rows` and `buffer_interval`),
+        the data might only be written on a later call.
         """
-        self.datadict.add_data(**kwargs)
-        nrecords = self.datadict.nrecords()
-        if nrecords is not None and nrecords > 0:
-            datadict_to_hdf5(self.datadict, str(self.filepath),
-                             groupname=self.groupname,
-                             file_timeout=self.file_timeout)
+        if self.keep_data_in_memory:
+            self.datadict.add_data(**kwargs)
+        else:
+            if self._buffer is None:
+                self._buffer = misc.unwrap_optional(self.datadict.structure(same_type=True))
+            self._buffer.add_data(**kwargs)
+
+        if self._write_due():
+            self.flush()
+
+    def _pending_rows(self) -> int:
+        if self.keep_data_in_memory:
+            nrecords = self.datadict.nrecords()
+            return 0 if nrecords is None else nrecords - self._nwritten
+        if self._buffer is None:
+            return 0
+        nrecords = self._buffer.nrecords()
+        return 0 if nrecords is None else nrecords
+
+    def _write_due(self) -> bool:
+        if self.buffer_rows is None and self.buffer_interval is None:
+            return True
+        if self.buffer_rows is not None and self._pending_rows() >= self.buffer_rows:
+            return True
+        if self.buffer_interval is not None and time.time() - self._last_write >= self.buffer_interval:
+            return True
+        return False
+
+    def flush(self) -> None:
+        """Write all data that has been added but not written yet to the file.
+
+        Data is written and the file's change time is updated while opening
+        the file only once.
+        """
+        npending = self._pending_rows()
+        if npending == 0:
+            return
+
+        assert self.filepath is not None
+        if self.keep_data_in_memory:
+            data = self.datadict
+            append_mode = AppendMode.new
+        else:
+            assert self._buffer is not None
+            data = self._buffer
+            append_mode = AppendMode.all
+
+        if self._file is not None:
+            if self._file.swmr_mode:
+                _write_datadict(self._file, data, self.groupname, append_mode,
+                                swmr=True)
+            else:
+                _write_datadict(self._file, data, self.groupname, AppendMode.none,
+                                **self._dataset_options())
+                self._start_swmr()
+            self._file.flush()
+
+        else:
+            if not self.filepath.exists():
+                append_mode = AppendMode.none
 
-            assert self.filepath is not None
             with FileOpener(self.filepath, 'a', timeout=self.file_timeout) as f:
+                _write_datadict(f, data, self.groupname, append_mode,
+                                **self._dataset_options())
                 add_cur_time_attr(f, name='last_change')
                 add_cur_time_attr(f[self.groupname], name='last_change')
 
+        self._nwritten += npending
+        self._buffer = None
+        self._last_write = time.time()
+
+    def _start_swmr(self) -> None:
+        # all datasets exist now; after switching to SWMR mode
+        # we cannot create new objects or attributes anymore.
+        assert self._file is not None
+        add_cur_time_attr(self._file, name='last_change')
+        add_cur_time_attr(self._file[self.groupname], name='last_change')
+        self._file.swmr_mode = True
+
+    def _dataset_options(self) -> Dict[str, Any]:
+        return dict(growth_factor=self.growth_factor,
+                    chunk_rows=self.chunk_rows,
+                    compression=self.compression,
+                    compression_opts=self.compression_opts)
 
     # convenience methods for saving things in the same directory as the ddh5 file
 
@@ -13,7 +13,7 @@ widget will capture the log and display it.
 
 import sys
 from typing import Optional, Union
-from plottr import QtWidgets, QtGui
+from plottr import QtWidgets, QtGui, QtCore, Signal, Slot
 import logging
 
 __author__ = 'Wolfgang Pfaff'
@@ -27,21 +27,38 @@ COLORS = {
     }
 
 
+class _LogAppender(QtCore.QObject):
+    """Appends messages to the log widget. Messages may be sent from any
+    thread; the widget is only accessed in the thread it lives in."""
+
+    newMessage = Signal(str, int)
+
+    def __init__(self, widget: QtWidgets.QTextEdit):
+        super().__init__(widget)
+        self.widget = widget
+        self.newMessage.connect(self.append)
+
+    @Slot(str, int)
+    def append(self, msg: str, levelno: int) -> None:
+        clr = COLORS.get(levelno, QtGui.QColor('black'))
+        self.widget.setTextColor(clr)
+        self.widget.append(msg)
+        self.widget.verticalScrollBar().setValue(
+            self.widget.verticalScrollBar().maximum()
+        )
+
+
 class QLogHandler(logging.Handler):
 
     def __init__(self, parent: QtWidgets.QWidget):
         super().__init__()
         self.widget = QtWidgets.QTextEdit(parent)
         self.widget.setReadOnly(True)
+        self.appender = _LogAppender(self.widget)
 
     def emit(self, record: logging.LogRecord) -> None:
         msg = self.format(record)
-        clr = COLORS.get(record.levelno, QtGui.QColor('black'))
-        self.widget.setTextColor(clr)
-        self.widget.append(msg)
-        self.widget.verticalScrollBar().setValue(
-            self.widget.verticalScrollBar().maximum()
-        )
+        self.appender.newMessage.emit(msg, record.levelno)
 
 
 class LogWidget(QtWidgets.QWidget):
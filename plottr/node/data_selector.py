@@ -144,14 +144,15 @@ class DataSelector(Node):
         if len(self.selectedData) == 0:
             return None
 
-        ret = data.extract(dnames)
+        ret = data.shallow_copy().extract(dnames, copy=False)
         if self.force_numerical_data:
             for d, _ in ret.data_items():
                 d_data_vals = ret.data_vals(d)
                 dt = num.largest_numtype(d_data_vals,
                                          include_integers=False)
                 if dt is not None:
-                    ret[d]['values'] = ret[d]['values'].astype(dt)
+                    if np.dtype(dt) != d_data_vals.dtype:
+                        ret[d]['values'] = ret[d]['values'].astype(dt)
                 else:
                     return None
 
@@ -9,7 +9,7 @@ from typing_extensions import TypedDict
 import numpy as np
 
 from .node import Node, updateOption, NodeWidget
-from ..data.datadict import MeshgridDataDict, DataDict, DataDictBase
+from ..data.datadict import MeshgridDataDict, DataDict, DataDictBase, LazyValues
 from .. import QtCore, QtWidgets, Signal, Slot
 from plottr.icons import get_xySelectIcon
 
@@ -572,6 +572,11 @@ class DimensionReducer(Node):
 
                     if funCall is None:
                         raise RuntimeError("Reduction function is None")
+                    if funCall is not selectAxisElement \
+                            and isinstance(data[n]['values'], LazyValues):
+                        # element selection stays lazy, other reductions
+                        # need all data (masked, like the other values).
+                        data = data.load_values()
                     newvals = funCall(data[n]['values'], *arg, **kw)
                     if newvals.shape != targetShape:
                         self.node_logger.error(
@@ -590,7 +595,7 @@ class DimensionReducer(Node):
                             newaxvals = funCall(data[ax]['values'], *arg, **kw)
                             data[ax]['values'] = newaxvals
                             if ax in self._reductions:
-                                reductionValues[ax] = newaxvals.flat[0]
+                                reductionValues[ax] = newaxvals[(0,) * newaxvals.ndim]
 
                 del data[n]['axes'][idx]
 
@@ -679,7 +684,7 @@ class DimensionReducer(Node):
 
         dataout = data['dataOut']
         assert dataout is not None
-        data = dataout.copy()
+        data = dataout.shallow_copy()
         data = data.mask_invalid()
         data = self._applyDimReductions(data)
 
@@ -898,7 +903,7 @@ class XYSelector(DimensionReducer):
             return None
         dataout = data['dataOut']
         assert dataout is not None
-        data = dataout.copy()
+        data = dataout.shallow_copy()
 
         if self._xyAxes[0] is not None and self._xyAxes[1] is not None:
             _kw = {self._xyAxes[0]: 0, self._xyAxes[1]: 1}
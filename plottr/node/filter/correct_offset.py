@@ -41,6 +41,7 @@ class SubtractAverage(Node):
 
     useUi = True
     uiClass = SubtractAverageWidget
+    cacheOutput = True
 
     def __init__(self, name: str):
         super().__init__(name)
@@ -59,15 +60,14 @@ class SubtractAverage(Node):
         if super().process(dataIn=dataIn) is None:
             return None
         assert dataIn is not None
-        assert self.dataAxes is not None
-        data = dataIn.copy()
-        if self._averagingAxis in self.dataAxes and \
-                self.dataType == MeshgridDataDict:
-            axidx = self.dataAxes.index(self._averagingAxis)
+        data = dataIn.shallow_copy()
+        axes = data.axes()
+        if self._averagingAxis in axes and type(data) == MeshgridDataDict:
+            axidx = axes.index(self._averagingAxis)
             for dep in dataIn.dependents():
-                data_vals = np.asanyarray(data.data_vals(dep))
+                data_vals = data.writable_vals(dep)
                 avg = data_vals.mean(axis=axidx, keepdims=True)
-                data[dep]['values'] -= avg
+                data_vals -= avg
 
         return dict(dataOut=data)
 
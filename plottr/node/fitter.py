@@ -603,7 +603,7 @@ class FittingNode(Node):
             return dict(dataOut=dataIn)
 
         dataIn_opt = dataIn.get('__fitting_options__')
-        dataOut = dataIn.copy()
+        dataOut = dataIn.shallow_copy()
 
         # no fitting option selected in gui
         if self.fitting_options is None:
@@ -7,12 +7,14 @@ from enum import Enum, unique
 
 from typing import Tuple, Dict, Any, List, Optional, Sequence, cast
 
+import numpy as np
 from typing_extensions import TypedDict
 
 from plottr import QtGui, Signal, Slot, QtWidgets
 from .node import Node, NodeWidget, updateOption, updateGuiFromNode
 from ..data import datadict as dd
 from ..data.datadict import DataDict, MeshgridDataDict, DataDictBase, GriddingError
+from ..utils import num, misc
 from plottr.icons import get_gridIcon
 
 __author__ = 'Wolfgang Pfaff'
@@ -343,6 +345,178 @@ class DataGridderNodeWidget(NodeWidget):
         self.widget.setShape(shape)
 
 
+class _IncrementalGrid:
+    """Grid a growing dataset without guessing the shape from scratch each time.
+
+    The axis order and shape are guessed once (see
+    :func:`.guess_shape_from_datadict`). From the first complete sweep of the
+    inner axes we record the coordinates of each inner axis; the outermost
+    axis is the one that grows. Rows that are added later are only checked
+    against this pattern and written into NaN-padded grid buffers.
+    Use :meth:`create` to make an instance, and :meth:`update` for new data.
+
+    The values of the outputs are views of the buffers, and are never changed
+    afterwards: new rows are written behind the part of the buffers that has
+    been handed out. If they belong into the NaN-padded last block of an
+    earlier output, the buffers are copied first.
+    """
+
+    #: relative tolerance when comparing axis values with the pattern.
+    rtol = 1e-8
+
+    def __init__(self, data: DataDict, order: List[str], shape: Tuple[int, ...]):
+        self.fingerprint = data.structure_fingerprint()
+        self.structure = misc.unwrap_optional(data.structure(add_shape=False))
+        self.order = order
+        self.innerShape = shape[1:]
+        self.innerSize = int(np.prod(self.innerShape))
+        self.transpose = misc.reorder_indices(order, data.axes(data.dependents()[0]))
+
+        # coordinates of the inner axes, and values of the outer axis per block.
+        block = {ax: data.data_vals(ax)[:self.innerSize].reshape(self.innerShape)
+                 for ax in order}
+        self.coordinates: Dict[str, np.ndarray] = {}
+        for i, ax in enumerate(order[1:]):
+            vals = np.moveaxis(block[ax], i, 0).reshape(self.innerShape[i], -1)
+            self.coordinates[ax] = vals[:, 0].copy()
+        self.outerValues: List[Any] = [block[order[0]].flat[0]]
+
+        self.nrecords = 0
+        self.nblocks = 0
+        # size of the part of the buffers that outputs have views of.
+        self.nemitted = 0
+        self.lastRecord: Dict[str, np.ndarray] = {}
+        self.buffers: Dict[str, np.ndarray] = {}
+        for k, _ in data.data_items():
+            vals = data.data_vals(k)
+            self.buffers[k] = np.full((self.innerSize,), np.nan, dtype=vals.dtype)
+
+    @classmethod
+    def create(cls, data: DataDict) -> Optional["_IncrementalGrid"]:
+        """Guess the grid of ``data`` and set up incremental gridding.
+
+        :return: ``None`` if the data is not suitable for incremental
+            gridding; then, the data needs to be gridded normally.
+        """
+        if not cls._isSuitable(data) or not data.axes_are_compatible():
+            return None
+        nrecords = misc.unwrap_optional(data.nrecords())
+        if nrecords == 0:
+            return None
+
+        specs = list(dd.guess_shape_from_datadict(data).values())
+        spec = specs[0]
+        if spec is None or any(s is None or s[1] != spec[1] for s in specs):
+            return None
+        order, shape = spec
+
+        # we need a complete sweep of the inner axes to know their coordinates.
+        innerSize = int(np.prod(shape[1:]))
+        if nrecords < innerSize or shape[0] != -(-nrecords // innerSize):
+            return None
+
+        grid = cls(data, order, shape)
+        if not grid._checkCoordinates(data):
+            return None
+        if grid.update(data) is None:
+            return None
+        return grid
+
+    @staticmethod
+    def _isSuitable(data: DataDictBase) -> bool:
+        if not isinstance(data, DataDict) or len(data.dependents()) == 0:
+            return False
+        for k, _ in data.data_items():
+            vals = data.data_vals(k)
+            if not isinstance(vals, np.ndarray) or vals.ndim != 1 \
+                    or vals.dtype not in num.FLOATTYPES:
+                return False
+        return True
+
+    def _checkCoordinates(self, data: DataDict) -> bool:
+        # in the first block, each inner axis may only depend on its own index,
+        # and the outer axis must be constant.
+        for i, ax in enumerate(self.order[1:]):
+            idxs = np.indices(self.innerShape)[i].reshape(-1)
+            expected = self.coordinates[ax][idxs]
+            if not self._matches(data.data_vals(ax)[:self.innerSize], expected):
+                return False
+        outer = data.data_vals(self.order[0])[:self.innerSize]
+        return self._matches(outer, np.full(outer.shape, self.outerValues[0]))
+
+    def _matches(self, vals: np.ndarray, expected: np.ndarray) -> bool:
+        return bool(np.all(np.isclose(vals, expected, rtol=self.rtol, atol=0)))
+
+    def update(self, data: DataDictBase) -> Optional[MeshgridDataDict]:
+        """Grid ``data``, which should be the data gridded before, with rows appended.
+
+        :return: The gridded data, or ``None`` if the new data does not
+            continue the recorded pattern.
+        """
+        if not self._isSuitable(data) or data.structure_fingerprint() != self.fingerprint:
+            return None
+        assert isinstance(data, DataDict)
+        n0, n1 = self.nrecords, misc.unwrap_optional(data.nrecords())
+        if n1 < n0:
+            return None
+        # a cheap check that the data we have seen before has not changed.
+        for k, last in self.lastRecord.items():
+            if not num.arrays_equal(data.data_vals(k)[n0 - 1:n0], last):
+                return None
+
+        idxs = np.arange(n0, n1)
+        blockIdxs = idxs // self.innerSize
+        for i, ax in enumerate(self.order[1:]):
+            innerIdxs = np.unravel_index(idxs % self.innerSize, self.innerShape)
+            if not self._matches(data.data_vals(ax)[n0:n1],
+                                 self.coordinates[ax][innerIdxs[i]]):
+                return None
+
+        # new values of the outer axis have to continue the sweep.
+        outer = data.data_vals(self.order[0])[n0:n1]
+        outerValues = list(self.outerValues)
+        for b in range(len(outerValues), int(blockIdxs[-1]) + 1 if n1 > n0 else 0):
+            val = outer[b * self.innerSize - n0]
+            direction = np.sign(val - outerValues[-1])
+            if direction == 0 or (len(outerValues) > 1 and
+                                  direction != np.sign(outerValues[1] - outerValues[0])):
+                return None
+            outerValues.append(val)
+        if not self._matches(outer, np.array(outerValues)[blockIdxs]):
+            return None
+
+        # all good: write the new data into the buffers.
+        nblocks = max(-(-n1 // self.innerSize), 1)
+        for k, buf in self.buffers.items():
+            vals = data.data_vals(k)
+            if not np.can_cast(vals.dtype, buf.dtype):
+                return None
+            if buf.size < nblocks * self.innerSize or n0 < self.nemitted:
+                size = buf.size if buf.size >= nblocks * self.innerSize else 2 * nblocks * self.innerSize
+                newbuf = np.full((size,), np.nan, dtype=buf.dtype)
+                newbuf[:n0] = buf[:n0]
+                self.buffers[k] = buf = newbuf
+            buf[n0:n1] = vals[n0:n1]
+            self.lastRecord[k] = vals[n1 - 1:n1].copy()
+
+        self.outerValues = outerValues
+        self.nrecords = n1
+        self.nblocks = nblocks
+        return self.output()
+
+    def output(self) -> MeshgridDataDict:
+        """The gridded data (values are read-only views of the buffers)."""
+        ret = MeshgridDataDict(**misc.unwrap_optional(self.structure.structure(add_shape=False)))
+        shape = (self.nblocks,) + self.innerShape
+        self.nemitted = self.nblocks * self.innerSize
+        for k, buf in self.buffers.items():
+            vals = buf[:self.nblocks * self.innerSize].reshape(shape)
+            ret[k]['values'] = dd.readonly_view(vals.transpose(self.transpose))
+        ret = ret.sanitize()
+        ret.validate()
+        return ret
+
+
 class DataGridder(Node[DataGridderNodeWidget]):
     """
     A node that can put data onto or off a grid.
@@ -352,6 +526,7 @@ class DataGridder(Node[DataGridderNodeWidget]):
 
     nodeName = "Gridder"
     uiClass = DataGridderNodeWidget
+    cacheOutput = True
 
     #: signal emitted when we have programatically determined a shape for the data.
     shapeDetermined = Signal(dict)
@@ -363,6 +538,8 @@ class DataGridder(Node[DataGridderNodeWidget]):
         self._grid: Tuple[GridOption, Dict[str, Any]] = (GridOption.noGrid, {})
         self._shape = None
         self._invalid = False
+        self._incremental = False
+        self._incrementalGrid: Optional[_IncrementalGrid] = None
 
         super().__init__(name)
 
@@ -440,6 +617,24 @@ class DataGridder(Node[DataGridderNodeWidget]):
             raise ValueError(f"Invalid grid options specification {opts}.")
 
         self._grid = method, opts
+        self._incrementalGrid = None
+
+    @property
+    def incremental(self) -> bool:
+        """If ``True``, data that grows between updates is gridded incrementally
+        when using :attr:`GridOption.guessShape`: the shape is not guessed from
+        scratch each time, but new rows are only checked against the grid found
+        before, and filled into the existing grid. If new rows do not fit the
+        grid, the shape is guessed again. Lazily loaded data is always gridded
+        normally, so that values are still only read when needed.
+        """
+        return self._incremental
+
+    @incremental.setter
+    @updateOption('incremental')
+    def incremental(self, val: bool) -> None:
+        self._incremental = val
+        self._incrementalGrid = None
 
     # Processing
 
@@ -470,7 +665,9 @@ class DataGridder(Node[DataGridderNodeWidget]):
             return None
         dataout = data['dataOut']
         assert dataout is not None
-        data = dataout.copy()
+        # the values are read-only views of the input values, so gridding
+        # does not need to copy them (copy=False below).
+        data = dataout.shallow_copy()
         self.axesList.emit(data.axes())
 
         dout: Optional[DataDictBase] = None
@@ -482,16 +679,21 @@ class DataGridder(Node[DataGridderNodeWidget]):
                 if method is GridOption.noGrid:
                     dout = data.expand()
                 elif method is GridOption.guessShape:
-                    dout = dd.datadict_to_meshgrid(data)
+                    # incremental gridding copies all values into its own
+                    # buffers, which would read lazy data completely.
+                    if self.incremental and not data.is_lazy():
+                        dout = self._gridIncrementally(data)
+                    else:
+                        dout = dd.datadict_to_meshgrid(data, copy=False)
                 elif method is GridOption.specifyShape:
                     dout = dd.datadict_to_meshgrid(
                         data, target_shape=opts['shape'],
-                        inner_axis_order=order,
+                        inner_axis_order=order, copy=False,
                     )
                 elif method is GridOption.metadataShape:
                     try:
                         dout = dd.datadict_to_meshgrid(
-                            data, use_existing_shape=True
+                            data, use_existing_shape=True, copy=False
                         )
                     except ValueError as err:
                         if "Malformed data" in str(err):
@@ -499,18 +701,18 @@ class DataGridder(Node[DataGridderNodeWidget]):
                                 "Shape/Setpoint order does"
                                 " not match data. Falling back to guessing shape"
                                 )
-                            dout = dd.datadict_to_meshgrid(data)
+                            dout = dd.datadict_to_meshgrid(data, copy=False)
                         else:
                             raise err
             except GriddingError:
                 dout = data.expand()
                 self.node_logger.info("data could not be gridded. Falling back "
                                    "to no grid")
-                if self.ui is not None:
-                    self.ui.setGrid((GridOption.noGrid, {}))
+                self.optionChangeNotification.emit(
+                    {'grid': (GridOption.noGrid, {})})
         elif isinstance(data, MeshgridDataDict):
             if method is GridOption.noGrid:
-                dout = dd.meshgrid_to_datadict(data)
+                dout = dd.meshgrid_to_datadict(data, copy=False)
             elif method is GridOption.guessShape:
                 dout = data
             elif method is GridOption.specifyShape:
@@ -537,6 +739,19 @@ class DataGridder(Node[DataGridderNodeWidget]):
 
         return dict(dataOut=dout)
 
+    def _gridIncrementally(self, data: DataDict) -> MeshgridDataDict:
+        if self._incrementalGrid is not None:
+            dout = self._incrementalGrid.update(data)
+            if dout is not None:
+                return dout
+            self.node_logger.debug("New data does not fit the grid, guessing the shape again")
+
+        grid = _IncrementalGrid.create(data)
+        self.callInNodeThread(setattr, self, '_incrementalGrid', grid)
+        if grid is not None:
+            return grid.output()
+        return dd.datadict_to_meshgrid(data, copy=False)
+
     # Setup UI
 
     def setupUi(self) -> None:
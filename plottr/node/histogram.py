@@ -94,6 +94,7 @@ class Histogrammer(Node):
 
     useUi = True
     uiClass: Type["NodeWidget"] = HistogrammerWidget
+    cacheOutput = True
 
     def __init__(self, name: str) -> None:
         self._nbins: int = 51
@@ -134,9 +135,9 @@ class Histogrammer(Node):
         data = super().process(dataIn=dataIn)
         if data is None:
             return None
-        data = data['dataOut']
-        assert data is not None
-        data = data.mask_invalid()
+        dataout = data['dataOut']
+        assert dataout is not None
+        data = dataout.shallow_copy().mask_invalid()
 
         if self.histogramAxis is None:
             return dict(dataOut=data)
@@ -208,8 +209,7 @@ class Histogrammer(Node):
                 axData = np.outer(
                     oldAxData, np.ones(hist.size//oldAxData.size)
                 ).reshape(*hist.shape)
-                newData[ax] = data[ax]
-                newData[ax]['values'] = axData
+                newData[ax] = dict(data[ax], values=axData)
 
         if newData.validate():
             return dict(dataOut=newData)
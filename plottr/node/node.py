@@ -3,6 +3,8 @@ node.py
 
 Contains the base class for Nodes.
 """
+import sys
+import threading
 import traceback
 from logging import Logger
 import warnings
@@ -23,11 +25,15 @@ R = TypeVar('R', bound="Node")
 S = TypeVar('S')
 T = TypeVar('T')
 
+#: holds the calls that ``process`` defers while it runs in a worker thread.
+_deferredCalls = threading.local()
+
 
 def updateOption(optName: Optional[str] = None) -> Callable[[Callable[[R, S], T]], Callable[[R, S], T]]:
     """Decorator for property setters that are handy for user options.
 
-    Property setters in nodes that are decorated with this will do two things:
+    Property setters in nodes that are decorated with this will do three things:
+    * record the new value, for detecting option changes when caching output.
     * call ``Node.update``, in order to update the flowchart.
     * if there is a UI, we call the matching ``optSetter`` function.
 
@@ -38,6 +44,7 @@ def updateOption(optName: Optional[str] = None) -> Callable[[Callable[[R, S], T]
         @wraps(func)
         def wrap(self: R, val: S) -> T:
             ret = func(self, val)
+            self._optionValues[optName or func.__name__] = val
             if optName is not None and self.ui is not None and \
                     optName in self.ui.optSetters:
                 self.ui.optSetters[optName](val)
@@ -163,6 +170,30 @@ class Node(NodeBase, Generic[NodeWidgetType]):
     #: system
     _raiseExceptions = False
 
+    #: Whether to reuse the previous output when neither the input data
+    #: (structure, meta data, and the memory of the values, see
+    #: ``DataDictBase.content_fingerprint``; so also for new shallow copies of
+    #: the same data) nor the options (as set through setters decorated with
+    #: ``updateOption``) have changed.
+    #: Only enable for nodes whose output depends on nothing else; nodes
+    #: can call ``invalidateCache`` when other state changes.
+    cacheOutput = False
+
+    #: Whether to run ``process`` in a worker thread, such that the GUI
+    #: stays responsive during heavy processing (can also be set per
+    #: instance). ``update`` then returns immediately, and the output is
+    #: set (and propagated downstream) in the GUI thread once processing is
+    #: done. If the node is updated while processing, only the latest
+    #: update is processed afterwards, and outdated results are discarded.
+    #: ``process`` must then not access the UI directly, but only through
+    #: signals, and must change the state of the node only through
+    #: ``callInNodeThread``.
+    processInThread = False
+
+    #: signal emitted to request processing in the worker thread.
+    #: arguments are the id of the run and the input values.
+    _processRequested = Signal(int, object)
+
     def __init__(self, name: str):
         """Create a new instance of the Node.
 
@@ -170,6 +201,18 @@ class Node(NodeBase, Generic[NodeWidgetType]):
         """
         super().__init__(name, terminals=self.__class__.terminals)
 
+        self._optionValues: Dict[str, Any] = {}
+        self._outputCache: Optional[Tuple[Dict[str, Any], Dict[str, Any], Any]] = None
+        if self.cacheOutput:
+            # pyqtgraph calls `process` when updating the node.
+            setattr(self, 'process', self._processCached)
+
+        self._processThread: Optional[QtCore.QThread] = None
+        self._processWorker: Optional[_ProcessWorker] = None
+        self._runId = 0
+        self._pendingRun: Optional[Tuple[int, Dict[str, Any], bool]] = None
+        self._runSignals = True
+
         self.signalUpdate = True
         self.dataAxes: Optional[List[str]] = None
         self.dataDependents: Optional[List[str]] = None
@@ -225,15 +268,172 @@ class Node(NodeBase, Generic[NodeWidgetType]):
             setattr(self, opt, val)
 
     def update(self, signal: bool = True) -> None:
+        if self.processInThread and not self.isBypassed():
+            self._updateInThread(signal)
+            return
+
         super().update(signal=signal)
         if Node._raiseExceptions and self.exception is not None:
             raise self.exception[1]
         elif self.exception is not None:
-            e = self.exception
-            err = f'EXCEPTION RAISED: {e[0]}: {e[1]}\n'
-            for t in traceback.format_tb(e[2]):
-                err += f' -> {t}\n'
-            self.node_logger.error(err)
+            self._logException()
+
+    def _logException(self) -> None:
+        e = self.exception
+        err = f'EXCEPTION RAISED: {e[0]}: {e[1]}\n'
+        for t in traceback.format_tb(e[2]):
+            err += f' -> {t}\n'
+        self.node_logger.error(err)
+
+    # processing in a worker thread
+
+    @property
+    def isProcessing(self) -> bool:
+        """Whether processing in the worker thread is ongoing."""
+        return self._processThread is not None and \
+            (self._processThread.isRunning() or self._pendingRun is not None)
+
+    def _updateInThread(self, signal: bool) -> None:
+        if self._processThread is None:
+            self._processThread = QtCore.QThread()
+            self._processWorker = _ProcessWorker(self)
+            self._processWorker.moveToThread(self._processThread)
+            self._processRequested.connect(self._processWorker.run)
+            self._processWorker.processed.connect(self._onProcessed)
+            self._processWorker.processed.connect(self._processThread.quit)
+            self._processThread.finished.connect(self._startPendingRun)
+
+        # a run that is still waiting is superseded by this one.
+        self._runId += 1
+        self._pendingRun = (self._runId, self.inputValues(), signal)
+        if not self._processThread.isRunning():
+            self._startPendingRun()
+
+    @Slot()
+    def _startPendingRun(self) -> None:
+        if self._pendingRun is None or self._processThread is None:
+            return
+        runId, inputs, signal = self._pendingRun
+        self._pendingRun = None
+        self._runSignals = signal
+        self._processThread.start()
+        self._processRequested.emit(runId, inputs)
+
+    @Slot(int, object, object, object)
+    def _onProcessed(self, runId: int, out: Optional[Dict[str, Any]], exc: Any,
+                     calls: List[Tuple[Callable[..., Any], Tuple[Any, ...]]]) -> None:
+        if runId != self._runId:
+            self.node_logger.debug(f"Discarding result of outdated run {runId}")
+            return
+
+        for func, args in calls:
+            func(*args)
+
+        if exc is not None:
+            for n, t in self.outputs().items():
+                t.setValue(None)
+            self.setException(exc)
+            if self._runSignals:
+                self.sigOutputChanged.emit(self)
+            self._logException()
+            return
+
+        if out is not None:
+            if self._runSignals:
+                self.setOutput(**out)
+            else:
+                self.setOutputNoSignal(**out)
+        for n, t in self.inputs().items():
+            t.setValueAcceptable(True)
+        self.clearException()
+
+    def _stopProcessThread(self) -> None:
+        if self._processThread is None:
+            return
+        # results that arrive after stopping are discarded.
+        self._runId += 1
+        self._pendingRun = None
+        self._processThread.quit()
+        self._processThread.wait()
+
+    def close(self) -> None:
+        """Clean up the node, and stop processing in the worker thread."""
+        # disconnecting the terminals updates the node, so we stop afterwards.
+        super().close()
+        self._stopProcessThread()
+
+    def callInNodeThread(self, func: Callable[..., Any], *args: Any) -> None:
+        """Call ``func`` with ``args``.
+
+        If called from ``process`` running in the worker thread, the call is
+        made in the thread of the node once processing is done (and not at all if
+        the result of processing is discarded).
+        """
+        calls = getattr(_deferredCalls, 'calls', None)
+        if calls is None:
+            func(*args)
+        else:
+            calls.append((func, args))
+
+    def invalidateCache(self) -> None:
+        """Discard the cached output, such that the next update runs ``process``."""
+        self._outputCache = None
+
+    def _processCached(self, **inputs: Any) -> Any:
+        options = dict(self._optionValues)
+        if self._outputCache is not None:
+            cachedInputs, cachedOptions, output = self._outputCache
+            if self._sameInputs(cachedInputs, inputs) and \
+                    self._sameOptions(cachedOptions, options):
+                self.node_logger.debug("Inputs and options unchanged, using cached output")
+                return output
+
+        self.callInNodeThread(setattr, self, '_outputCache', None)
+        # the key describes the inputs as received; invalid data is not cached.
+        try:
+            inputKeys: Optional[Dict[str, Any]] = \
+                {k: self._inputKey(v) for k, v in inputs.items()}
+        except ValueError:
+            inputKeys = None
+        output = type(self).process(self, **inputs)
+        if output is not None and inputKeys is not None:
+            self.callInNodeThread(setattr, self, '_outputCache', (inputKeys, options, output))
+        return output
+
+    @staticmethod
+    def _inputKey(value: Any) -> Tuple[Any, ...]:
+        # data is identified by its content fingerprint. we keep the values, such
+        # that their memory can't be reused for other values while cached.
+        if isinstance(value, DataDictBase):
+            return 'data', value.content_fingerprint(), [v.get('values') for _, v in value.data_items()]
+        return 'object', value
+
+    @staticmethod
+    def _sameInputs(cached: Dict[str, Any], inputs: Dict[str, Any]) -> bool:
+        if cached.keys() != inputs.keys():
+            return False
+        for k, v in inputs.items():
+            cachedKey = cached[k]
+            if isinstance(v, DataDictBase):
+                if cachedKey[0] != 'data':
+                    return False
+                try:
+                    if cachedKey[1] != v.content_fingerprint():
+                        return False
+                except ValueError:
+                    # invalid data has no fingerprint.
+                    return False
+            elif cachedKey[0] != 'object' or cachedKey[1] is not v:
+                return False
+        return True
+
+    @staticmethod
+    def _sameOptions(cached: Dict[str, Any], options: Dict[str, Any]) -> bool:
+        try:
+            return bool(cached == options)
+        except ValueError:
+            # comparison of arrays is ambiguous.
+            return False
 
     def _logger(self) -> Logger:
         """Get a logger for this node
@@ -268,6 +468,18 @@ class Node(NodeBase, Generic[NodeWidgetType]):
         if not isinstance(dataIn, DataDictBase):
             raise ValueError('Unsupported data format provided.')
 
+        self.callInNodeThread(
+            self._setDataInfo, type(dataIn), dataIn.axes(), dataIn.dependents(),
+            dataIn.shapes(), dataIn.structure(add_shape=False))
+
+        if not self.validateOptions(dataIn):
+            self.node_logger.debug("Option validation not passed")
+            return None
+
+        return dict(dataOut=dataIn)
+
+    def _setDataInfo(self, dtype: Type[DataDictBase], daxes: List[str], ddeps: List[str],
+                     dshapes: Dict[str, Tuple[int, ...]], dstruct: Optional[DataDictBase]) -> None:
         _axesChanged = False
         _fieldsChanged = False
         _typeChanged = False
@@ -275,12 +487,6 @@ class Node(NodeBase, Generic[NodeWidgetType]):
         _shapesChanged = False
         _depsChanged = False
 
-        dtype = type(dataIn)
-        daxes = dataIn.axes()
-        ddeps = dataIn.dependents()
-        dshapes = dataIn.shapes()
-        dstruct = dataIn.structure(add_shape=False)
-
         if None in [self.dataAxes, self.dataDependents, self.dataType, self.dataShapes]:
             _axesChanged = True
             _fieldsChanged = True
@@ -333,11 +539,31 @@ class Node(NodeBase, Generic[NodeWidgetType]):
         if _shapesChanged and not _structChanged:
             self.dataShapesChanged.emit(dshapes)
 
-        if not self.validateOptions(dataIn):
-            self.node_logger.debug("Option validation not passed")
-            return None
+class _ProcessWorker(QtCore.QObject):
+    """Runs ``process`` of a node in a worker thread."""
+
+    #: signal emitted when processing is done, with the run id, the output,
+    #: the exception info (``None`` if processing was successful), and the
+    #: calls deferred by ``Node.callInNodeThread``.
+    processed = Signal(int, object, object, object)
+
+    def __init__(self, node: Node):
+        super().__init__()
+        self.node = node
+
+    @Slot(int, object)
+    def run(self, runId: int, inputs: Dict[str, Any]) -> None:
+        calls: List[Tuple[Callable[..., Any], Tuple[Any, ...]]] = []
+        _deferredCalls.calls = calls
+        try:
+            out = self.node.process(**{str(k): v for k, v in inputs.items()})
+        except Exception:
+            self.processed.emit(runId, None, sys.exc_info(), calls)
+            return
+        finally:
+            _deferredCalls.calls = None
+        self.processed.emit(runId, out, None, calls)
 
-        return dict(dataOut=dataIn)
 
 EmbedWidgetType = TypeVar("EmbedWidgetType", bound=QtWidgets.QWidget)
 
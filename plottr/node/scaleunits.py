@@ -105,6 +105,7 @@ class ScaleUnits(Node):
     useUi = True
     nodeName = "ScaleUnits"
     uiClass = ScaleUnitsWidget
+    cacheOutput = True
 
     def __init__(self, name: str):
         super().__init__(name)
@@ -123,7 +124,7 @@ class ScaleUnits(Node):
         if super().process(dataIn=dataIn) is None:
             return None
         assert dataIn is not None
-        data = dataIn.copy()
+        data = dataIn.shallow_copy()
 
         if self.scale_unit_option != ScaleUnitsOption.never:
             for name, data_item in data.data_items():        
@@ -9,14 +9,14 @@ from dataclasses import dataclass
 from enum import Enum, unique, auto
 from types import TracebackType
 from typing import Dict, List, Type, Tuple, Optional, Any, \
-    OrderedDict as OrderedDictType, Union
+    OrderedDict as OrderedDictType, Union, Sequence
 
 import numpy as np
 
 from .. import Signal, Flowchart, QtWidgets
 from ..data.datadict import DataDictBase, DataDict, MeshgridDataDict
 from ..node import Node, linearFlowchart
-from ..utils import LabeledOptions
+from ..utils import LabeledOptions, num
 
 __author__ = 'Wolfgang Pfaff'
 __license__ = 'MIT'
@@ -55,9 +55,13 @@ class PlotNode(Node):
         """Emits the :attr:`newPlotData` signal when called.
         Note: does not call the parent method :meth:`plottr.node.node.Node.process`.
 
+        Values that are loaded lazily are read here, since plotting needs the data.
+
         :param dataIn: input data
         :returns: input data as is: ``{dataOut: dataIn}``
         """
+        if dataIn is not None and dataIn.is_lazy():
+            dataIn = dataIn.shallow_copy().load_values()
         self.newPlotData.emit(dataIn)
         return dict(dataOut=dataIn)
 
@@ -349,6 +353,63 @@ class SubPlot:
     axes: Optional[List[Any]] = None
 
 
+class ImagePyramid:
+    """Multi-resolution representation of 2D image data.
+
+    Used to draw large images with only as much data as there are pixels on
+    screen: level 0 is the original data, and every further level is pooled
+    by a factor of 2 along both axes (see :func:`plottr.utils.num.pool2d`),
+    until the image is not larger than ``minSize``.
+    The levels are computed once, when the pyramid is created.
+    """
+
+    def __init__(self, data: np.ndarray, method: str = 'mean',
+                 minSize: int = 256) -> None:
+        """Constructor for :class:`.ImagePyramid`.
+
+        :param data: 2D image data.
+        :param method: how to pool data for lower resolutions, ``'mean'`` or ``'max'``.
+        :param minSize: size (along the longer axis) below which no further
+            levels are computed.
+        """
+        self.levels: List[np.ndarray] = [data]
+        while max(self.levels[-1].shape) > minSize:
+            self.levels.append(num.pool2d(self.levels[-1], 2, method))
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Shape of the full-resolution data."""
+        return self.levels[0].shape
+
+    def tile(self, ranges: Sequence[Tuple[float, float]],
+             pixels: Sequence[float]) -> Tuple[np.ndarray, Tuple[Tuple[int, int], ...]]:
+        """Get the visible part of the image, at the lowest resolution that has
+        at least one data point per screen pixel.
+
+        :param ranges: visible (start, stop) range along each axis, in units of
+            indices of the full-resolution data.
+        :param pixels: number of screen pixels spanned by the visible ranges.
+        :return: the visible data, and the (start, stop) range of
+            full-resolution indices it covers along each axis.
+        """
+        level = 0
+        # without a known screen size (e.g., not laid out yet) we show the full data.
+        while level + 1 < len(self.levels) and all(p > 0 for p in pixels) and all(
+                (r[1] - r[0]) / 2 ** (level + 1) >= p for r, p in zip(ranges, pixels)):
+            level += 1
+
+        factor = 2 ** level
+        data = self.levels[level]
+        slices = []
+        bounds = []
+        for (start, stop), n, nFull in zip(ranges, data.shape, self.shape):
+            i0 = min(max(int(np.floor(start / factor)), 0), n - 1)
+            i1 = max(min(int(np.ceil(stop / factor)), n), i0 + 1)
+            slices.append(slice(i0, i1))
+            bounds.append((i0 * factor, min(i1 * factor, nFull)))
+        return data[tuple(slices)], tuple(bounds)
+
+
 class AutoFigureMaker:
     """A class for semi-automatic creation of plot figures.
     It must be inherited to tie it to a specific plotting backend.
@@ -7,6 +7,7 @@ from typing import Dict, List, Tuple, Union, Optional, Any, Type, cast
 from types import TracebackType
 
 import numpy as np
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.gridspec import GridSpec
@@ -17,7 +18,7 @@ from plottr.data.datadict import DataDictBase
 from plottr.icons import (get_singleTracePlotIcon, get_multiTracePlotIcon, get_imagePlotIcon,
                           get_colormeshPlotIcon, get_scatterPlot2dIcon)
 from plottr.gui.tools import dpiScalingFactor
-from .plotting import PlotType, colorplot2d
+from .plotting import PlotType, colorplot2d, updateColorplot2d
 from .widgets import MPLPlotWidget
 from ..base import AutoFigureMaker as BaseFM, PlotDataType, \
     PlotItem, ComplexRepresentation, determinePlotDataType, PlotWidgetContainer
@@ -32,16 +33,38 @@ class FigureMaker(BaseFM):
     The class tries to lay out the subplots to be generated on a grid that's as close as possible to square.
     The allocation of plot to subplots depends on the type of plot we're making, and the type of data.
     Subplots may contain either one 2d plot (image, 2d scatter, etc) or multiple 1d plots.
+
+    For live plotting, the FigureMaker that made the current figure may be passed
+    on: if nothing but the data has changed, the existing artists are then updated
+    instead of clearing the figure and plotting everything again.
     """
 
-    def __init__(self, fig: Figure) -> None:
+    def __init__(self, fig: Figure, previous: Optional["FigureMaker"] = None) -> None:
+        """Constructor for :class:`.FigureMaker`.
+
+        :param fig: the figure to plot into.
+        :param previous: the FigureMaker that has made the current plots in
+            ``fig``. If the new plots have the same layout (plot type, subplots,
+            and plot items), the existing axes and artists are updated with the
+            new data.
+        """
         super().__init__()
         self.fig = fig
+        self.previous = previous
 
         #: what kind of plot we're making. needs to be set before adding data.
         #: Incompatibility with the data provided will result in failure.
         self.plotType = PlotType.empty
 
+        #: whether the existing artists have been updated with the new data,
+        #: instead of re-creating the figure.
+        self.updatedInPlace = False
+
+        #: whether the update has only changed the data artists, and nothing
+        #: else in the figure (like axes limits or color scales). Then it is
+        #: sufficient to re-draw only those (see :meth:`dataArtists`).
+        self.onlyDataChanged = False
+
     # re-implementing to get correct type annotation.
     def __enter__(self) -> "FigureMaker":
         return self
@@ -49,9 +72,62 @@ class FigureMaker(BaseFM):
     def __exit__(self, exc_type: Optional[Type[BaseException]],
                  exc_value: Optional[BaseException],
                  traceback: Optional[TracebackType]) -> None:
+        previous, self.previous = self.previous, None
+        if previous is not None and self._updateFrom(previous):
+            self.updatedInPlace = True
+            return None
+
         self.fig.clear()
         return super().__exit__(exc_type, exc_value, traceback)
 
+    def _layout(self) -> List[Any]:
+        """Everything about the plot items that determines the figure layout."""
+        return [self.plotType, self.complexRepresentation] + [
+            (item.subPlot, item.plotDataType, len(item.data), item.labels, item.plotOptions)
+            for item in self.plotItems.values()
+        ]
+
+    def _limits(self) -> List[Any]:
+        """Axes limits and color scales in the figure."""
+        return [ax.viewLim.bounds for ax in self.fig.axes] + [
+            (artist.norm.vmin, artist.norm.vmax) for artist in self.dataArtists()
+            if isinstance(artist, ScalarMappable)
+        ]
+
+    def _updateFrom(self, previous: "FigureMaker") -> bool:
+        """Update the artists made by ``previous`` with our data.
+
+        :return: ``False`` if that's not possible, and the figure has to be
+            made from scratch.
+        """
+        if previous.fig is not self.fig or previous._layout() != self._layout():
+            return False
+        if any(item.plotReturn is None for item in previous.plotItems.values()):
+            return False
+        if any(artist.axes not in self.fig.axes for artist in previous.dataArtists()):
+            return False
+
+        self.subPlots = previous.subPlots
+        for item, previousItem in zip(self.plotItems.values(), previous.plotItems.values()):
+            item.plotReturn = previousItem.plotReturn
+
+        limits = self._limits()
+        for item in self.plotItems.values():
+            if not self.updatePlot(item):
+                return False
+        self.onlyDataChanged = self._limits() == limits
+        return True
+
+    def dataArtists(self) -> List[Artist]:
+        """All artists that show data."""
+        artists: List[Artist] = []
+        for item in self.plotItems.values():
+            if isinstance(item.plotReturn, list):
+                artists += item.plotReturn
+            elif item.plotReturn is not None:
+                artists.append(item.plotReturn)
+        return artists
+
     # inherited methods
     def addData(self, *data: Union[np.ndarray, np.ma.MaskedArray],
                 join: Optional[int] = None,
@@ -115,6 +191,29 @@ class FigureMaker(BaseFM):
         else:
             return None
 
+    def updatePlot(self, plotItem: PlotItem) -> bool:
+        """Update the artists of a PlotItem in place with the item's data.
+
+        :param plotItem: the item to update. ``plotReturn`` must contain the
+            artists made by :meth:`plot` for data of the same kind.
+        :return: ``True`` if the artists could be updated.
+        """
+        if self.plotType in [PlotType.singletraces, PlotType.multitraces]:
+            lines = plotItem.plotReturn
+            if not isinstance(lines, list) or len(lines) != 1:
+                return False
+            x, y = plotItem.data
+            lines[0].set_data(x, y)
+            lines[0].axes.relim()
+            lines[0].axes.autoscale_view()
+            return True
+        elif self.plotType in [PlotType.image, PlotType.scatter2d, PlotType.colormesh]:
+            assert isinstance(plotItem.plotReturn, ScalarMappable)
+            x, y, z = plotItem.data
+            return updateColorplot2d(plotItem.plotReturn, x, y, z, plotType=self.plotType)
+        else:
+            return False
+
     # methods specific to this class
     def plotLine(self, plotItem: PlotItem) -> Optional[List[ScalarMappable]]:
         axes = self.subPlots[plotItem.subPlot].axes
@@ -353,6 +452,9 @@ class AutoPlot(MPLPlotWidget):
         self.plotDataType = PlotDataType.unknown
         self.plotType = PlotType.empty
 
+        # The FigureMaker that made the current plot; used to update it in place.
+        self.figureMaker: Optional[FigureMaker] = None
+
         # The default complex behavior is set here.
         self.complexRepresentation = ComplexRepresentation.realAndImag
 
@@ -449,7 +551,7 @@ class AutoPlot(MPLPlotWidget):
         assert self.data is not None
 
         kw: Dict[str, Any] = {}
-        with FigureMaker(self.plot.fig) as fm:
+        with FigureMaker(self.plot.fig, previous=self.figureMaker) as fm:
             fm.plotType = self.plotType
             if not self.dataIsComplex():
                 fm.complexRepresentation = ComplexRepresentation.real
@@ -464,6 +566,11 @@ class AutoPlot(MPLPlotWidget):
                     labels=[str(self.data.label(n)) for n in indeps] + [str(self.data.label(dn))],
                     plotDataType=self.plotDataType,
                     **kw)
+        self.figureMaker = fm
 
         self.setMeta(self.data)
-        self.updatePlot()
+        if fm.onlyDataChanged:
+            self.plot.drawArtists(fm.dataArtists())
+            QtCore.QCoreApplication.processEvents()
+        else:
+            self.updatePlot()
@@ -3,20 +3,35 @@
 """
 
 from enum import Enum, auto, unique
-from typing import Any, Optional, Tuple, Union, cast
+from typing import Any, List, Optional, Tuple, Union, cast
 
 import numpy as np
 from matplotlib import colors, rcParams
 from matplotlib.axes import Axes
 from matplotlib.image import AxesImage
+from matplotlib.collections import PathCollection, QuadMesh
 from matplotlib.cm import ScalarMappable
 
+from plottr import config_entry
 from plottr.utils import num
 from plottr.utils.num import centers2edges_2d, interp_meshgrid_2d
+from ..base import ImagePyramid
 
 __author__ = 'Wolfgang Pfaff'
 __license__ = 'MIT'
 
+#: 2D data with more points than this is not drawn at full resolution, but
+#: at the resolution of the axes (see :func:`plotImage` and
+#: :func:`ppcolormesh_from_meshgrid`). Default of the ``image_lod_threshold``
+#: config option.
+IMAGE_LOD_THRESHOLD = 2**22
+
+
+def _imageLod() -> Tuple[int, str]:
+    """The ``image_lod_threshold`` and ``image_lod_pooling`` config options."""
+    return (config_entry('main', 'image_lod_threshold', default=IMAGE_LOD_THRESHOLD),
+            config_entry('main', 'image_lod_pooling', default='mean'))
+
 
 @unique
 class PlotType(Enum):
@@ -89,6 +104,100 @@ def colorplot2d(ax: Axes,
     """
     cmap = kw.pop('cmap', rcParams['image.cmap'])
 
+    prepared = _prepareGrid(x, y, z, plotType)
+    if prepared is None:
+        return None
+    x, y, z, plotType = prepared
+
+    im: Optional[ScalarMappable]
+    if plotType is PlotType.image:
+        im = plotImage(ax, x, y, z, cmap=cmap, **kw)
+    elif plotType is PlotType.colormesh:
+        im = ppcolormesh_from_meshgrid(ax, x, y, z, cmap=cmap, **kw)
+    elif plotType is PlotType.scatter2d:
+        im = ax.scatter(x.ravel(), y.ravel(), c=z.ravel(), cmap=cmap, **kw)
+    else:
+        im = None
+
+    if im is None:
+        return None
+
+    if axLabels[0]:
+        ax.set_xlabel(axLabels[0])
+    if axLabels[1]:
+        ax.set_ylabel(axLabels[1])
+    return im
+
+
+def updateColorplot2d(im: ScalarMappable,
+                      x: Union[np.ndarray, np.ma.MaskedArray],
+                      y: Union[np.ndarray, np.ma.MaskedArray],
+                      z: Union[np.ndarray, np.ma.MaskedArray],
+                      plotType: PlotType = PlotType.image) -> bool:
+    """Update a plot made with :func:`colorplot2d` with new data, in place.
+    The color scale is adjusted to the range of the new data.
+
+    :param im: the plot returned by :func:`colorplot2d`.
+    :param x: x coordinates (meshgrid)
+    :param y: y coordinates (meshgrid)
+    :param z: z data
+    :param plotType: the plot type that has been used to make the plot.
+    :returns: ``True`` if the plot has been updated. ``False`` if that was not
+        possible (for instance, because the new data needs a different kind
+        of plot); the plot then needs to be made again.
+    """
+    ax = getattr(im, 'axes', None)
+    prepared = _prepareGrid(x, y, z, plotType)
+    if not isinstance(ax, Axes) or prepared is None:
+        return False
+    x, y, z, plotType = prepared
+
+    if plotType is PlotType.image and isinstance(im, AxesImage):
+        z, extent = _imageData(x, y, z)
+        pyramidImage = _PyramidImage.fromImage(im)
+        lodThreshold, lodPooling = _imageLod()
+        if pyramidImage is not None and z.size > lodThreshold:
+            pyramidImage.setPyramid(ImagePyramid(z, method=lodPooling), extent)
+            return True
+        if pyramidImage is None and z.size <= lodThreshold:
+            im.set_data(z.T)
+            im.set_extent(extent)
+            im.autoscale()
+            return True
+
+    elif plotType is PlotType.colormesh and isinstance(im, QuadMesh):
+        # the mesh geometry can't be changed, only the values.
+        mesh = _meshData(ax, x, y, z)
+        if mesh is not None and hasattr(im, 'get_coordinates'):
+            xEdges, yEdges, z = mesh
+            if np.array_equal(im.get_coordinates(), np.stack([xEdges, yEdges], axis=-1)):
+                im.set_array(np.ma.masked_invalid(z))
+                im.autoscale()
+                return True
+
+    elif plotType is PlotType.scatter2d and isinstance(im, PathCollection):
+        offsets = np.ma.column_stack([x.ravel(), y.ravel()])
+        im.set_offsets(offsets)
+        im.set_array(z.ravel())
+        im.autoscale()
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim(offsets)
+        ax.autoscale_view()
+        return True
+
+    return False
+
+
+def _prepareGrid(x: Union[np.ndarray, np.ma.MaskedArray],
+                 y: Union[np.ndarray, np.ma.MaskedArray],
+                 z: Union[np.ndarray, np.ma.MaskedArray],
+                 plotType: PlotType) \
+        -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, PlotType]]:
+    """Make meshgrid data plottable with the given plot type, if possible.
+
+    :returns: the data and the plot type to use, or ``None`` if the data
+        can't be plotted.
+    """
     # first we need to check if our grid can be plotted nicely.
     if plotType in [PlotType.image, PlotType.colormesh]:
         x = x.astype(float)
@@ -121,24 +230,7 @@ def colorplot2d(ax: Axes,
             # special case: if we have a single line, a pcolor-type plot won't work.
             elif min(g.shape) < 2:
                 plotType = PlotType.scatter2d
-    im: Optional[ScalarMappable]
-    if plotType is PlotType.image:
-        im = plotImage(ax, x, y, z, cmap=cmap, **kw)
-    elif plotType is PlotType.colormesh:
-        im = ppcolormesh_from_meshgrid(ax, x, y, z, cmap=cmap, **kw)
-    elif plotType is PlotType.scatter2d:
-        im = ax.scatter(x.ravel(), y.ravel(), c=z.ravel(), cmap=cmap, **kw)
-    else:
-        im = None
-
-    if im is None:
-        return None
-
-    if axLabels[0]:
-        ax.set_xlabel(axLabels[0])
-    if axLabels[1]:
-        ax.set_ylabel(axLabels[1])
-    return im
+    return x, y, z, plotType
 
 
 def ppcolormesh_from_meshgrid(ax: Axes, x: np.ndarray, y: np.ndarray,
@@ -155,7 +247,32 @@ def ppcolormesh_from_meshgrid(ax: Axes, x: np.ndarray, y: np.ndarray,
     :returns: the image returned by `pcolormesh`.
 
     Keywords are passed on to `pcolormesh`.
+
+    Meshes with more points than the ``image_lod_threshold`` config option
+    are pooled down to the resolution of the axes before plotting.
     """
+    mesh = _meshData(ax, x, y, z)
+    if mesh is None:
+        return None
+    x, y, z = mesh
+
+    im = ax.pcolormesh(x, y, z, **kw)
+    ax.set_xlim(x.min(), x.max())
+    ax.set_ylim(y.min(), y.max())
+    return im
+
+
+def _meshData(ax: Axes, x: np.ndarray, y: np.ndarray, z: np.ndarray) \
+        -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Vertices and values for plotting meshgrid data with pcolormesh, at
+    no more than the resolution of the axes if the data is large."""
+    lodThreshold, lodPooling = _imageLod()
+    if z.size > lodThreshold:
+        factor = _lodFactor(ax, z.shape)
+        if factor > 1:
+            x, y = num.pool2d(x, factor), num.pool2d(y, factor)
+            z = num.pool2d(z, factor, lodPooling)
+
     # the meshgrid we have describes coordinates, but for plotting
     # with pcolormesh we need vertices.
     try:
@@ -163,11 +280,7 @@ def ppcolormesh_from_meshgrid(ax: Axes, x: np.ndarray, y: np.ndarray,
         y = centers2edges_2d(y)
     except:
         return None
-
-    im = ax.pcolormesh(x, y, z, **kw)
-    ax.set_xlim(x.min(), x.max())
-    ax.set_ylim(y.min(), y.max())
-    return im
+    return x, y, z
 
 
 def plotImage(ax: Axes, x: np.ndarray, y: np.ndarray,
@@ -181,8 +294,26 @@ def plotImage(ax: Axes, x: np.ndarray, y: np.ndarray,
     :returns: the image object returned by `imshow`
 
     All keywords are passed to `imshow`.
+
+    Images with more pixels than the ``image_lod_threshold`` config option
+    are drawn from an :class:`.ImagePyramid`: only the part in view is shown,
+    at the resolution of the axes, and updated when the axes limits change.
     """
     ax.grid(False)
+    z, extent = _imageData(x, y, z)
+    lodThreshold, lodPooling = _imageLod()
+    if z.size > lodThreshold:
+        return _PyramidImage(ax, ImagePyramid(z, method=lodPooling), extent, **kw).image
+
+    im = ax.imshow(z.T, aspect='auto', origin='lower',
+                   extent=extent, **kw)
+    return im
+
+
+def _imageData(x: np.ndarray, y: np.ndarray, z: np.ndarray) \
+        -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+    """Image data (oriented such that axes are increasing) and extent for
+    2d meshgrid data."""
     x0, x1 = x.min(), x.max()
     y0, y1 = y.min(), y.max()
 
@@ -208,6 +339,93 @@ def plotImage(ax: Axes, x: np.ndarray, y: np.ndarray,
     if y.shape[1] > 1:
         z = z if y[0, 0] < y[0, 1] else z[:, ::-1]
 
-    im = ax.imshow(z.T, aspect='auto', origin='lower',
-                   extent=extent, **kw)
-    return im
+    return z, extent
+
+
+def _lodFactor(ax: Axes, shape: Tuple[int, ...]) -> int:
+    """Largest power of 2 by which 2D data of the given shape can be reduced,
+    while still having at least one point per pixel of the axes.
+    Axes without a size (e.g., not laid out yet) get the full data."""
+    pixels = (ax.bbox.width, ax.bbox.height)
+    if not all(px > 0 for px in pixels):
+        return 1
+    factor = 1
+    while factor < max(shape) and all(n / (2 * factor) >= px for n, px in zip(shape, pixels)):
+        factor *= 2
+    return factor
+
+
+class _PyramidImage:
+    """An image that shows the visible part of an :class:`.ImagePyramid`, at the
+    resolution of the axes. The image is updated when the axes limits change.
+    """
+
+    def __init__(self, ax: Axes, pyramid: ImagePyramid,
+                 extent: Tuple[float, float, float, float], **kw: Any) -> None:
+        self.ax = ax
+        self.pyramid = pyramid
+        self.extent = extent
+        self._updating = False
+        # the color scale follows the full data, unless specified.
+        self._autoscale = not any(k in kw for k in ['norm', 'vmin', 'vmax'])
+
+        tile, tileExtent = self._tile()
+        self.image = ax.imshow(tile.T, aspect='auto', origin='lower',
+                               extent=tileExtent, **kw)
+        setattr(self.image, '_plottrPyramidImage', self)
+        self._autoscaleImage()
+        # bound methods are only weakly referenced by the callback registry;
+        # the lambdas keep this object alive as long as the axes exist.
+        ax.callbacks.connect('xlim_changed', lambda _ax: self.update())
+        ax.callbacks.connect('ylim_changed', lambda _ax: self.update())
+
+    @staticmethod
+    def fromImage(image: AxesImage) -> Optional["_PyramidImage"]:
+        """The :class:`._PyramidImage` that shows its data in ``image``, if any."""
+        return getattr(image, '_plottrPyramidImage', None)
+
+    def setPyramid(self, pyramid: ImagePyramid,
+                   extent: Tuple[float, float, float, float]) -> None:
+        """Show new data."""
+        self.pyramid = pyramid
+        self.extent = extent
+        self._autoscaleImage()
+        self.update()
+
+    def _autoscaleImage(self) -> None:
+        if self._autoscale:
+            # fmin/fmax ignore nan, and give nan only if there's no valid value.
+            zVals = self.pyramid.levels[-1]
+            self.image.set_clim(np.fmin.reduce(zVals, axis=None),
+                                np.fmax.reduce(zVals, axis=None))
+
+    def _tile(self) -> Tuple[np.ndarray, Tuple[float, float, float, float]]:
+        x0, x1, y0, y1 = self.extent
+        nx, ny = self.pyramid.shape
+        dx, dy = (x1 - x0) / nx, (y1 - y0) / ny
+
+        # while autoscaling, the limits follow the image, so we need all of it.
+        ranges: List[Tuple[float, float]] = [(0., nx), (0., ny)]
+        if not self.ax.get_autoscalex_on():
+            xlim = sorted(self.ax.get_xlim())
+            ranges[0] = ((xlim[0] - x0) / dx, (xlim[1] - x0) / dx)
+        if not self.ax.get_autoscaley_on():
+            ylim = sorted(self.ax.get_ylim())
+            ranges[1] = ((ylim[0] - y0) / dy, (ylim[1] - y0) / dy)
+
+        tile, ((i0, i1), (j0, j1)) = self.pyramid.tile(
+            ranges, (self.ax.bbox.width, self.ax.bbox.height))
+        return tile, (x0 + i0 * dx, x0 + i1 * dx, y0 + j0 * dy, y0 + j1 * dy)
+
+    def update(self) -> None:
+        """Show the part of the image that is currently in view."""
+        # setting the extent may change the limits again.
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            tile, tileExtent = self._tile()
+            self.image.set_data(tile.T)
+            self.image.set_extent(tileExtent)
+        finally:
+            self._updating = False
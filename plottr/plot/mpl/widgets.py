@@ -3,10 +3,11 @@
 """
 
 import io
-from typing import Tuple, Optional, List, Dict
+from typing import Tuple, Optional, List, Dict, Any, Sequence
 
 from numpy import rint
 from matplotlib import rcParams
+from matplotlib.artist import Artist
 from matplotlib.axes import Axes
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import (
@@ -52,9 +53,14 @@ class MPLPlot(FCanvas):
         self._showInfo = False
         self._infoArtist: Optional[Text] = None
         self._info = ''
+        self._titleArtist: Optional[Text] = None
         self._meta_info: Dict[str, str] = {}
         self._constrainedLayout = constrainedLayout
 
+        #: the figure without the artists drawn by :meth:`drawArtists`
+        self._background: Optional[Any] = None
+        self.mpl_connect('draw_event', self._invalidateBackground)
+
         self.clearFig()
         self.setParent(parent)
         self.setRcParams()
@@ -72,6 +78,32 @@ class MPLPlot(FCanvas):
         self.fig.clear()
         self.autosize()
 
+    def _invalidateBackground(self, event: Any = None) -> None:
+        self._background = None
+
+    def drawArtists(self, artists: Sequence[Artist]) -> None:
+        """Re-draw only the given artists, and leave the rest of the figure as is.
+
+        The figure without the artists is captured once after each full draw
+        and then re-used (blitting). This is only correct if nothing but the
+        artists has changed since the last full draw.
+
+        :param artists: the artists to re-draw.
+        """
+        if self._background is None:
+            visible = [a.get_visible() for a in artists]
+            for a in artists:
+                a.set_visible(False)
+            self.draw()
+            for a, v in zip(artists, visible):
+                a.set_visible(v)
+            self._background = self.copy_from_bbox(self.fig.bbox)
+
+        self.restore_region(self._background)
+        for a in artists:
+            self.fig.draw_artist(a)
+        self.blit(self.fig.bbox)
+
     def setRcParams(self) -> None:
         """apply matplotlibrc config from plottr configuration files."""
         cfg = plottrconfig().get('main', {}).get('matplotlibrc', {})
@@ -126,14 +158,19 @@ class MPLPlot(FCanvas):
 
     def setFigureTitle(self, title: str) -> None:
         """Add a title to the figure."""
-        self.fig.suptitle(title,
-                          horizontalalignment='center',
-                          verticalalignment='top',
-                          fontsize='small')
+        if (self._titleArtist in self.fig.texts
+                and self._titleArtist is not None and self._titleArtist.get_text() == title):
+            return
+        self._titleArtist = self.fig.suptitle(title,
+                                              horizontalalignment='center',
+                                              verticalalignment='top',
+                                              fontsize='small')
         self.draw()
 
     def setFigureInfo(self, info: str) -> None:
         """Display an info string in the figure"""
+        if info == self._info and (not self._showInfo or self._infoArtist in self.fig.texts):
+            return
         self._info = info
         self.updateInfo()
 
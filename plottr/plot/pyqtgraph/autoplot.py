@@ -12,7 +12,7 @@ import logging
 from pathlib import Path
 import time
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Type
 
 import numpy as np
 from pyqtgraph import mkPen
@@ -108,7 +108,9 @@ class FigureMaker(BaseFM):
             changes to the plots is required (important case is live-plotting of
             data that keeps updating).
         :param clearWidget:
-            if ``True`` force re-creation of all plot elements.
+            if ``True`` force re-creation of all plot elements. Otherwise,
+            existing subplots and their graphics items are updated in place
+            with the new data, as long as the layout of the figure is unchanged.
         :param parentWidget:
             parent of the main widget of FigureMaker.
         """
@@ -136,22 +138,25 @@ class FigureMaker(BaseFM):
     def makeSubPlots(self, nSubPlots: int) -> List[PlotBase]:
         """Create empty subplots in the widgets.
 
-        If ``clearWidget`` was not set to ``True`` in the constructor,
-        existing sub plot widgets are cleared, but not deleted and re-created.
+        If ``clearWidget`` was not set to ``True`` in the constructor, and the
+        existing sub plot widgets match the required ones, they are kept
+        (with their contents) to be updated by the plot methods.
         """
-        plot: PlotBase
-        if self.clearWidget:
-            self.widget.deleteAllPlots()
-            for i in range(nSubPlots):
-                if max(self.dataDimensionsInSubPlot(i).values()) == 1:
-                    plot = Plot(self.widget)
-                    self.widget.addPlot(plot)
-                elif max(self.dataDimensionsInSubPlot(i).values()) == 2:
-                    plot = PlotWithColorbar(self.widget)
-                    self.widget.addPlot(plot)
-        else:
-            self.widget.clearAllPlots()
-
+        plotTypes: List[Type[PlotBase]] = []
+        for i in range(nSubPlots):
+            if max(self.dataDimensionsInSubPlot(i).values()) == 1:
+                plotTypes.append(Plot)
+            elif max(self.dataDimensionsInSubPlot(i).values()) == 2:
+                plotTypes.append(PlotWithColorbar)
+
+        if not self.clearWidget and \
+                [type(p) for p in self.widget.subPlots] == plotTypes:
+            return self.widget.subPlots
+
+        self.clearWidget = True
+        self.widget.deleteAllPlots()
+        for plotType in plotTypes:
+            self.widget.addPlot(plotType(self.widget))
         return self.widget.subPlots
 
     def formatSubPlot(self, subPlotId: int) -> None:
@@ -164,6 +169,9 @@ class FigureMaker(BaseFM):
 
         # label the x axis if there's only one x label
         if isinstance(subPlot, Plot):
+            # remove left-over traces from an earlier plot we have updated
+            for item in subPlot.plot.listDataItems()[len(self.plotIdsInSubPlot(subPlotId)):]:
+                subPlot.plot.removeItem(item)
             if len(set(labels[0])) == 1:
                 subPlot.plot.setLabel("bottom", labels[0][0])
 
@@ -206,6 +214,7 @@ class FigureMaker(BaseFM):
         colors = getcfg('main', 'pyqtgraph', 'line_colors', default=['r', 'b', 'g'])
         symbols = getcfg('main', 'pyqtgraph', 'line_symbols', default=['o'])
         symbolSize = getcfg('main', 'pyqtgraph', 'line_symbol_size', default=5)
+        lodThreshold = getcfg('main', 'pyqtgraph', 'line_lod_threshold', default=10000)
 
         subPlot = self.subPlotFromId(plotItem.subPlot)
 
@@ -227,15 +236,57 @@ class FigureMaker(BaseFM):
         else:
             y = y.flatten()
 
+        # for traces with many points, only the visible part is drawn, reduced
+        # to the pixel width of the view (keeping minima and maxima). pyqtgraph
+        # updates this when the view changes. lines are then drawn without
+        # symbols, scatter data stays as points.
+        lod = x.size > lodThreshold and self._isMonotonic(x)
+        if lod and x[0] > x[-1]:
+            x, y = x[::-1], y[::-1]
         #plot either line or scatter depending on what graph is being requested
         if plotItem.plotDataType in [PlotDataType.line1d, PlotDataType.log10_line1d]:
-            return subPlot.plot.plot(x, y, name=name,
-                                     pen=mkPen(color, width=1), symbol=symbol, symbolBrush=color,
-                                     symbolPen=None, symbolSize=symbolSize)
+            if lod:
+                opts = dict(pen=mkPen(color, width=1), symbol=None)
+            else:
+                opts = dict(pen=mkPen(color, width=1), symbol=symbol, symbolBrush=color,
+                            symbolPen=None, symbolSize=symbolSize)
         else: #plotItem.plotDataType is either PlotDataType.scatter1d or PlotDataType.log10_scatter1d
-            return subPlot.plot.plot(x, y, name=name,
-                                     pen=None, symbol=symbol, symbolBrush=color,
-                                     symbolPen=None, symbolSize=symbolSize)
+            opts = dict(pen=None, symbol=symbol, symbolBrush=color,
+                        symbolPen=None, symbolSize=symbolSize)
+
+        # if we're updating an existing plot, re-use the item at this position
+        items = subPlot.plot.listDataItems()
+        idx = self.findPlotIndexInSubPlot(plotItem.id)
+        if not self.clearWidget and idx < len(items):
+            item = items[idx]
+            item.setData(x, y, name=name, **opts)
+        else:
+            item = subPlot.plot.plot(x, y, name=name, **opts)
+
+        # adding the item applies the plot's own settings, so set these after.
+        if lod:
+            item.setClipToView(True)
+            item.setDownsampling(auto=True, method='peak')
+        else:
+            item.setClipToView(subPlot.plot.clipToViewMode())
+            item.setDownsampling(*subPlot.plot.downsampleMode())
+        return item
+
+    @staticmethod
+    def _isMonotonic(x: np.ndarray) -> bool:
+        """Check whether x values are all finite and sorted (increasing or decreasing).
+
+        Only then can pyqtgraph find the visible part of a trace.
+        """
+        if not np.issubdtype(x.dtype, np.number) or np.iscomplexobj(x):
+            return False
+        if isinstance(x, np.ma.MaskedArray) and x.mask is not np.ma.nomask and x.mask.any():
+            return False
+        x = np.ma.getdata(x)
+        if not np.all(np.isfinite(x)):
+            return False
+        steps = np.diff(x)
+        return bool(np.all(steps >= 0) or np.all(steps <= 0))
 
     def _colorPlot(self, plotItem: PlotItem) -> None:
         subPlot = self.subPlotFromId(plotItem.subPlot)
@@ -336,15 +387,8 @@ class AutoPlot(PlotWidget):
         self.figOptions.numAxes = len(inds)
 
         #define imagData for single and multiple value data
-        for val in dvals:
-            try:
-                if not all(val.imag == 0):
-                    self.figOptions.imagData = True
-                    break
-            except:
-                 if not val.imag == 0:
-                    self.figOptions.imagData = True
-                    break
+        if np.iscomplexobj(dvals) and np.any(np.imag(dvals) != 0):
+            self.figOptions.imagData = True
 
         #Assertions to make mypy happy
         assert self.figConfig is not None
@@ -6,7 +6,8 @@ from typing import Optional, Tuple, NoReturn
 import numpy as np
 import pyqtgraph as pg
 
-from plottr import QtCore, QtWidgets, config_entry
+from plottr import QtCore, QtWidgets, Slot, config_entry
+from ..base import ImagePyramid
 
 __all__ = ['PlotBase', 'Plot']
 
@@ -70,6 +71,9 @@ class PlotWithColorbar(PlotBase):
     #: colorbar
     colorbar: pg.ColorBarItem
 
+    #: number of colors used for coloring scatter points
+    scatterLutSize: int = 256
+
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
         super().__init__(parent)
 
@@ -87,11 +91,31 @@ class PlotWithColorbar(PlotBase):
         self.scatter: Optional[pg.ScatterPlotItem] = None
         self.scatterZVals: Optional[np.ndarray] = None
 
+        #: color levels last set automatically from the data range. if the
+        #: colorbar still shows these, updates will follow the data range.
+        self.autoLevels: Optional[Tuple[float, float]] = None
+
+        # one brush per color of the lookup table (and one for invalid values),
+        # and the colormap they have been made for.
+        self._scatterBrushes: Optional[np.ndarray] = None
+        self._scatterBrushesCmap: Optional[pg.ColorMap] = None
+
+        #: multi-resolution version of large images (see :meth:`.setImage`)
+        self.imgPyramid: Optional[ImagePyramid] = None
+        # x, y, width, height of the full image
+        self._imgRect: Tuple[float, float, float, float] = (0., 0., 1., 1.)
+
+        viewBox = self.plot.getViewBox()
+        viewBox.sigRangeChanged.connect(self._updateImageTile)
+        viewBox.sigResized.connect(self._updateImageTile)
+
     def clearPlot(self) -> None:
         """Clear the content of the plot."""
         self.img = None
+        self.imgPyramid = None
         self.scatter = None
         self.scatterZVals = None
+        self.autoLevels = None
         self.plot.clear()
         try:
             self.colorbar.sigLevelsChanged.disconnect(self._colorScatterPoints)
@@ -101,55 +125,139 @@ class PlotWithColorbar(PlotBase):
     def setImage(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
         """Set data to be plotted as image.
 
-        Clears the plot before creating a new image item that gets places in the
-        plot and linked to the colorscale.
+        If the plot already shows an image, the new data is pushed into the
+        existing image item; zoom and manually adjusted color levels are kept.
+        Otherwise, the plot is cleared before creating a new image item that
+        gets placed in the plot and linked to the colorscale.
+
+        Images with more pixels than the ``image_lod_threshold`` config
+        option are not drawn at full resolution; an :class:`.ImagePyramid`
+        is used to draw only the part in view, at screen resolution.
 
         :param x: x coordinates (as 2D meshgrid)
         :param y: y coordinates (as 2D meshgrid)
         :param z: data values (as 2D meshgrid)
         :return: None
         """
-        self.clearPlot()
-
-        self.img = pg.ImageItem()
-        self.plot.addItem(self.img)
-        self.img.setImage(z)
-        self.img.setRect(QtCore.QRectF(x.min(), y.min(), x.max() - x.min(), y.max() - y.min()))
+        lodThreshold = config_entry('main', 'image_lod_threshold', default=2**22)
+        lodPooling = config_entry('main', 'image_lod_pooling', default='mean')
+
+        if self.img is None:
+            self.clearPlot()
+            self.img = pg.ImageItem()
+            self.plot.addItem(self.img)
+            self.colorbar.setImageItem(self.img)
+        self._setAutoLevels(z)
+
+        self._imgRect = (x.min(), y.min(), x.max() - x.min(), y.max() - y.min())
+        if z.size > lodThreshold:
+            self.imgPyramid = ImagePyramid(z, method=lodPooling)
+            self._updateImageTile()
+        else:
+            self.imgPyramid = None
+            self.img.setImage(z, autoLevels=False)
+            self.img.setRect(QtCore.QRectF(*self._imgRect))
+
+    @Slot()
+    def _updateImageTile(self) -> None:
+        """Show the part of a large image that is in view, at screen resolution."""
+        if self.img is None or self.imgPyramid is None:
+            return
+
+        x0, y0, width, height = self._imgRect
+        nx, ny = self.imgPyramid.shape
+        viewBox = self.plot.getViewBox()
+        # while auto-ranging, the view follows the image bounds, so we need
+        # to show all of it.
+        if any(viewBox.autoRangeEnabled()) or width == 0 or height == 0:
+            ranges = [(0., nx), (0., ny)]
+        else:
+            (vx0, vx1), (vy0, vy1) = viewBox.viewRange()
+            ranges = [((vx0 - x0) / width * nx, (vx1 - x0) / width * nx),
+                      ((vy0 - y0) / height * ny, (vy1 - y0) / height * ny)]
 
-        self.colorbar.setImageItem(self.img)
-        self.colorbar.rounding = (z.max() - z.min()) * 1e-2
-        self.colorbar.setLevels((z.min(), z.max()))
+        tile, ((i0, i1), (j0, j1)) = self.imgPyramid.tile(
+            ranges, (viewBox.width(), viewBox.height()))
+        self.img.setImage(tile, autoLevels=False)
+        self.img.setRect(QtCore.QRectF(x0 + i0 * width / nx, y0 + j0 * height / ny,
+                                       (i1 - i0) * width / nx, (j1 - j0) * height / ny))
 
     def setScatter2d(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
         """Set data to be plotted as image.
 
-        Clears the plot before creating a new scatter item (based on flattened
-        input data) that gets placed in the plot and linked to the colorscale.
+        If the plot already shows a scatter plot, the new data is pushed into
+        the existing scatter item; zoom and manually adjusted color levels are
+        kept. Otherwise, the plot is cleared before creating a new scatter item
+        (based on flattened input data) that gets placed in the plot and linked
+        to the colorscale.
 
         :param x: x coordinates
         :param y: y coordinates
         :param z: data values
         :return: None
         """
-        self.clearPlot()
-
-        self.scatter = pg.ScatterPlotItem()
+        if self.scatter is None:
+            self.clearPlot()
+            self.scatter = pg.ScatterPlotItem()
+            self.plot.addItem(self.scatter)
+            self.colorbar.sigLevelsChanged.connect(self._colorScatterPoints)
         self.scatter.setData(x=x.flatten(), y=y.flatten(), symbol='o', size=8)
-        self.plot.addItem(self.scatter)
         self.scatterZVals = z.flatten()
 
-        self.colorbar.setLevels((z.min(), z.max()))
-        self.colorbar.rounding = (z.max() - z.min()) * 1e-2
+        self._setAutoLevels(z)
         self._colorScatterPoints(self.colorbar)
 
-        self.colorbar.sigLevelsChanged.connect(self._colorScatterPoints)
+    def _setAutoLevels(self, z: np.ndarray) -> None:
+        """Set the color levels to the range of ``z``, unless the levels have
+        been changed since they were last set automatically."""
+        if self.autoLevels is not None and \
+                tuple(self.colorbar.levels()) != self.autoLevels:
+            return
+        # fmin/fmax ignore nan, and give nan only if there's no valid value.
+        zVals: np.ndarray = np.ma.filled(np.ma.asarray(z, dtype=float), np.nan)
+        zMin, zMax = np.fmin.reduce(zVals, axis=None), np.fmax.reduce(zVals, axis=None)
+        if np.isnan(zMin):
+            return
+        self.colorbar.rounding = (zMax - zMin) * 1e-2
+        self.colorbar.setLevels((zMin, zMax))
+        self.autoLevels = tuple(self.colorbar.levels())
 
-    # TODO: this seems crazy slow.
     def _colorScatterPoints(self, cbar: pg.ColorBarItem) -> None:
         if self.scatter is not None and self.scatterZVals is not None:
+            brushes = self._scatterLutBrushes()
             z_norm = self._normalizeColors(self.scatterZVals, cbar.levels())
-            colors = self.colorbar.cmap.mapToQColor(z_norm)
-            self.scatter.setBrush(colors)
+            self.scatter.setBrush(brushes[self._lutIndices(z_norm)])
+
+    def _scatterLutBrushes(self) -> np.ndarray:
+        """Brushes for each color in the lookup table of the current colormap,
+        followed by a transparent brush for invalid values.
+
+        The scatter item caches rendered symbols by brush, so using the same
+        few brush objects for all points keeps re-coloring fast.
+        """
+        # older pyqtgraph versions only have the attribute
+        if hasattr(self.colorbar, 'colorMap'):
+            cmap = self.colorbar.colorMap()
+        else:
+            cmap = self.colorbar.cmap
+        if self._scatterBrushes is None or self._scatterBrushesCmap is not cmap:
+            lut = cmap.getLookupTable(nPts=self.scatterLutSize, alpha=True)
+            brushes = [pg.mkBrush(*rgba) for rgba in lut.tolist()]
+            brushes.append(pg.mkBrush(0, 0, 0, 0))
+            self._scatterBrushes = np.empty(len(brushes), dtype=object)
+            self._scatterBrushes[:] = brushes
+            self._scatterBrushesCmap = cmap
+        return self._scatterBrushes
+
+    def _lutIndices(self, z_norm: np.ndarray) -> np.ndarray:
+        """Indices into the lookup table for normalized values. Invalid values
+        get the index of the last (transparent) brush."""
+        z_norm = np.ma.filled(np.ma.asarray(z_norm, dtype=float), np.nan)
+        valid = np.isfinite(z_norm)
+        idxs = np.full(z_norm.shape, self.scatterLutSize, dtype=int)
+        idxs[valid] = np.clip(z_norm[valid] * self.scatterLutSize,
+                              0, self.scatterLutSize - 1).astype(int)
+        return idxs
 
     def _normalizeColors(self, z: np.ndarray, levels: Tuple[float, float]) -> np.ndarray:
         scale = levels[1] - levels[0]
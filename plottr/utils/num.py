@@ -25,7 +25,12 @@ def largest_numtype(arr: np.ndarray, include_integers: bool = True) \
                              only integers in the the data.
     :return: type if possible. None if no numeric data in array.
     """
-    types = {type(a) for a in np.array(arr).flatten()}
+    dtype = getattr(arr, 'dtype', None)
+    if dtype is not None and dtype != object:
+        # all elements have the type of the array.
+        types = {dtype.type} if np.size(arr) > 0 else set()
+    else:
+        types = {type(a) for a in np.array(arr).flatten()}
     curidx = -1
     if include_integers:
         ok_types = NUMTYPES
@@ -55,14 +60,36 @@ def _are_equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
 
 
 def is_invalid(a: np.ndarray) -> np.ndarray:
-    # really use == None to do an element wise
-    # check for None
-    isnone = a == None
-    if a.dtype in FLOATTYPES:
-        isnan = np.isnan(a)
-    else:
-        isnan = np.zeros(a.shape, dtype=bool)
-    return isnone | isnan
+    """Element-wise check for invalid entries (``None`` or ``nan``).
+
+    :param a: input array.
+    :return: boolean array of the same shape.
+    """
+    if a.dtype.kind in 'fc':
+        # float and complex arrays cannot contain None.
+        return np.isnan(a)
+    elif a.dtype.kind == 'O':
+        return np.asarray(pd.isna(a), dtype=bool)
+    # other dtypes (integers, strings, ...) cannot be invalid.
+    return np.zeros(a.shape, dtype=bool)
+
+
+def invalid_rows(a: np.ndarray) -> np.ndarray:
+    """Find the rows (entries along the first axis) of an array that are
+    completely invalid (see :func:`is_invalid`).
+
+    :param a: input array.
+    :return: 1d boolean array, ``True`` for rows in which all entries are invalid.
+    """
+    a = np.asanyarray(a)
+    if a.ndim == 0:
+        raise ValueError('Cannot determine rows of a 0-d array.')
+    if a.dtype.kind not in 'fcO':
+        return np.zeros(a.shape[0], dtype=bool)
+    invalid = is_invalid(np.ma.getdata(a))
+    if a.ndim > 1:
+        return np.asarray(invalid.reshape(a.shape[0], -1).all(axis=1))
+    return invalid
 
 
 def _are_invalid(a: np.ndarray, b: np.ndarray) -> np.ndarray:
@@ -106,34 +133,45 @@ def array1d_to_meshgrid(arr: Union[List, np.ndarray],
     reshape an array to a target shape.
 
     If target shape is larger than the array, fill with invalids
-    (``nan`` for float and complex dtypes, ``None`` otherwise).
+    (``nan`` for numerical dtypes, ``None`` otherwise). Integer arrays
+    are converted to float for that.
     If target shape is smaller than the array, cut off the end.
 
     :param arr: input array
     :param target_shape: desired output shape
-    :param copy: whether to make a copy before the operation.
+    :param copy: whether to make a copy before the operation. If ``False``,
+        and the array does not need padding, the result is a view of the
+        input whenever numpy can reshape without copying.
     :return: re-shaped array.
     """
-    if not isinstance(arr, np.ndarray):
-        localarr = np.array(arr)
-    else:
-        localarr = arr
-
-    if copy:
-        localarr = localarr.copy()
-    localarr = localarr.reshape(-1)
+    inarr = np.asanyarray(arr)
+    localarr = inarr.reshape(-1)
 
     newsize = int(np.prod(target_shape))
-    if newsize < localarr.size:
+    if newsize <= localarr.size:
         localarr = localarr[:newsize]
-    elif newsize > localarr.size:
-        if localarr.dtype in FLOATTYPES:
-            fill = np.zeros(newsize - localarr.size) * np.nan
-        else:
-            fill = np.array((newsize - localarr.size) * [None])
-        localarr = np.append(localarr, fill)
+        # reshaping has already made a copy if the input was not contiguous.
+        if copy and np.may_share_memory(localarr, inarr):
+            localarr = localarr.copy()
+        return localarr.reshape(target_shape)
+
+    # padding: allocate the result once, and fill in the data.
+    fill: Optional[float] = np.nan
+    if np.issubdtype(localarr.dtype, np.inexact):
+        dtype = localarr.dtype
+    elif np.issubdtype(localarr.dtype, np.integer) or \
+            np.issubdtype(localarr.dtype, np.bool_):
+        dtype = np.dtype(np.float64)
+    else:
+        dtype, fill = np.dtype(object), None
 
-    return localarr.reshape(target_shape)
+    ret = np.full(newsize, fill, dtype=dtype)
+    ret[:localarr.size] = localarr
+    if isinstance(localarr, np.ma.MaskedArray):
+        mask = np.zeros(newsize, dtype=bool)
+        mask[:localarr.size] = np.ma.getmaskarray(localarr)
+        ret = np.ma.MaskedArray(ret, mask=mask)
+    return ret.reshape(target_shape)
 
 
 def _find_switches(arr: np.ndarray,
@@ -481,3 +519,56 @@ def centers2edges_2d(centers: np.ndarray) -> np.ndarray:
     edges[-1, -1] = 2 * centers[-1, -1] - edges[-2, -2]
 
     return edges
+
+
+def pool2d(arr: np.ndarray, factor: int, method: str = 'mean') -> np.ndarray:
+    """
+    Reduce the resolution of a 2d array by pooling blocks of
+    ``factor x factor`` elements. Invalid (nan or masked) elements are ignored;
+    blocks without any valid element are nan. If the shape is not a multiple
+    of ``factor``, the blocks at the end are smaller.
+
+    :param arr: 2d array.
+    :param factor: size of the blocks along each axis.
+    :param method: ``'mean'`` or ``'max'``.
+    :return: float array with shape ``ceil(arr.shape / factor)``.
+    """
+    if method not in ['mean', 'max']:
+        raise ValueError(f"Unknown pooling method '{method}'.")
+
+    a: np.ndarray = np.ma.filled(np.ma.asarray(arr, dtype=float), np.nan)
+
+    # invalid elements are replaced by a value that doesn't affect the result.
+    # checking the sum first is cheaper than checking every element.
+    valid: Optional[np.ndarray] = None
+    if not np.isfinite(a.sum()):
+        isValid = np.isfinite(a)
+        a = np.where(isValid, a, 0. if method == 'mean' else -np.inf)
+        valid = isValid
+
+    # combining strided slices is much faster than reducing 2d blocks.
+    # if the shape is not a multiple of factor, the last slices are shorter.
+    def pool(x: np.ndarray, ufunc: np.ufunc) -> np.ndarray:
+        rows = x[::factor].copy()
+        for i in range(1, factor):
+            part = x[i::factor]
+            ufunc(rows[:part.shape[0]], part, out=rows[:part.shape[0]])
+        pooled = rows[:, ::factor].copy()
+        for i in range(1, factor):
+            part = rows[:, i::factor]
+            ufunc(pooled[:, :part.shape[1]], part, out=pooled[:, :part.shape[1]])
+        return pooled
+
+    if method == 'max':
+        pooled = pool(a, np.maximum)
+        pooled[np.isneginf(pooled)] = np.nan
+        return pooled
+
+    if valid is None:
+        n0, n1 = a.shape
+        count = np.outer(np.minimum(n0 - np.arange(0, n0, factor), factor),
+                         np.minimum(n1 - np.arange(0, n1, factor), factor))
+    else:
+        count = pool(valid.astype(np.min_scalar_type(factor ** 2)), np.add)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pool(a, np.add) / count
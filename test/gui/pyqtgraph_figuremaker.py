@@ -80,6 +80,18 @@ def test_complex_images(mag_and_phase_format: bool = False):
     return fm.widget
 
 
+def test_large_line_plot():
+    x = np.linspace(0, 100, 1000001)
+    y = np.cos(x) + 0.1 * np.random.normal(size=x.size)
+    with FigureMaker() as fm:
+        line_1 = fm.addData(x, y, labels=['x', 'noisy cos(x)'],
+                            plotDataType=PlotDataType.scatter1d)
+        _ = fm.addData(x[::-1], np.sin(x), labels=['x', 'sin(x)'],
+                       join=line_1,
+                       plotDataType=PlotDataType.line1d)
+    return fm.widget
+
+
 def main():
     app = QtWidgets.QApplication([])
     widgets = []
@@ -102,6 +114,8 @@ def main():
     #     test_complex_images())
     # widgets.append(
     #     test_complex_images(mag_and_phase_format=True))
+    # widgets.append(
+    #     test_large_line_plot())
 
     dgs = []
     for w in widgets:
@@ -79,6 +79,128 @@ def test_add_data():
     )
 
 
+
+def test_add_data_growing_storage():
+    """Test that adding data point by point does not copy all data every time."""
+    dd = DataDict(
+        x=dict(values=[]),
+        y=dict(values=[], axes=['x']),
+        z=dict(values=[], axes=['x']),
+    )
+    dd.validate()
+
+    npts = 100
+    for i in range(npts):
+        dd.add_data(x=[i], y=[i**2], z=[np.arange(3) * i])
+        if i == 70:
+            vals_70 = dd.data_vals('x')
+
+    assert num.arrays_equal(dd.data_vals('x'), np.arange(npts))
+    assert num.arrays_equal(dd.data_vals('y'), np.arange(npts)**2)
+    assert num.arrays_equal(dd.data_vals('z'), np.outer(np.arange(npts), np.arange(3)))
+    assert dd.shapes() == {'x': (npts,), 'y': (npts,), 'z': (npts, 3)}
+
+    # values are views of a common backing array, that has grown by doubling.
+    assert dd.data_vals('x').base is not None
+    assert dd.data_vals('x').base is vals_70.base
+    assert dd.data_vals('x').base.shape[0] == 128
+    assert num.arrays_equal(vals_70, np.arange(71))
+
+    # values set from outside are respected when appending.
+    dd['x']['values'] = dd.data_vals('x').copy() * 2
+    dd.add_data(x=[0], y=[0], z=[np.zeros(3)])
+    assert num.arrays_equal(dd.data_vals('x'), np.append(np.arange(npts) * 2, 0))
+
+    # type changes are taken into account.
+    dd.add_data(x=[0.5], y=[0], z=[np.zeros(3)])
+    assert dd.data_vals('x')[-1] == 0.5
+
+
+def test_appended():
+    """Test that appending into a new dataset does not copy or change the old one."""
+    dd = DataDict(
+        x=dict(values=np.arange(3)),
+        y=dict(values=np.arange(3)**2, axes=['x']),
+    )
+    dd.validate()
+    new = DataDict(
+        x=dict(values=np.array([3])),
+        y=dict(values=np.array([9]), axes=['x']),
+    )
+
+    dd2 = dd.appended(new)
+    dd3 = dd2.appended(new)
+    version = dd2.version
+    dd4 = dd3.appended(new)
+    assert num.arrays_equal(dd.data_vals('x'), np.arange(3))
+    assert num.arrays_equal(dd2.data_vals('x'), np.arange(4))
+    assert num.arrays_equal(dd3.data_vals('x'), np.array([0, 1, 2, 3, 3]))
+    assert num.arrays_equal(dd4.data_vals('y'), np.array([0, 1, 4, 9, 9, 9]))
+    assert dd2.version == version
+
+    # the new datasets share one backing array.
+    assert dd4.data_vals('x').base is dd2.data_vals('x').base
+
+    # the old datasets can still be appended to, without affecting the others.
+    dd2.add_data(x=[-1], y=[-1])
+    assert num.arrays_equal(dd2.data_vals('x'), np.array([0, 1, 2, 3, -1]))
+    assert num.arrays_equal(dd4.data_vals('x'), np.array([0, 1, 2, 3, 3, 3]))
+
+
+def test_record_storage():
+    """Test storing all fields in one structured array."""
+    records = np.zeros(5, dtype=[('x', float), ('y', int), ('z', float, (3,))])
+    records['x'] = np.arange(5)
+    records['y'] = np.arange(5) ** 2
+    records['z'] = np.outer(np.arange(5), np.arange(3))
+
+    dd = DataDict.from_structured_array(records, axes=dict(y=['x'], z=['x']),
+                                        units=dict(x='V'))
+    assert dd.validate()
+    assert dd.uses_record_storage()
+    assert dd.dependents() == ['y', 'z']
+    assert dd['x']['unit'] == 'V'
+    assert dd.shapes() == {'x': (5,), 'y': (5,), 'z': (5, 3)}
+    assert np.shares_memory(dd.data_vals('z'), records)
+
+    # appending writes into a new record array, not into the original one.
+    dd.add_records(records)
+    dd.add_data(x=[5], y=[25], z=[np.arange(3) * 5])
+    assert dd.uses_record_storage()
+    assert not np.shares_memory(dd.data_vals('z'), records)
+    assert dd.data_vals('x').base is dd.data_vals('z').base
+    assert num.arrays_equal(dd.data_vals('y'), np.append(np.tile(np.arange(5) ** 2, 2), 25))
+
+    # type changes are taken into account.
+    dd.add_data(x=[0], y=[0.5], z=[np.zeros(3)])
+    assert dd.data_vals('y')[-1] == 0.5
+    assert dd.uses_record_storage()
+
+    recs = dd.to_structured_array()
+    assert recs.shape == (12,)
+    assert not recs.flags.writeable
+    assert np.shares_memory(recs, dd.data_vals('x'))
+    assert num.arrays_equal(recs['z'], dd.data_vals('z'))
+
+    # setting values from outside ends the record storage.
+    dd['x']['values'] = dd.data_vals('x') * 2
+    assert not dd.uses_record_storage()
+    assert not np.shares_memory(dd.to_structured_array(), dd.data_vals('x'))
+    assert dd.use_record_storage()
+    assert dd.uses_record_storage()
+
+    # empty datasets start storing records when records are added.
+    dd2 = DataDict(
+        x=dict(values=[]),
+        y=dict(values=[], axes=['x']),
+    )
+    dd2.add_records(np.zeros(3, dtype=[('y', int), ('x', float)]))
+    assert dd2.uses_record_storage()
+    assert dd2.nrecords() == 3
+    with pytest.raises(ValueError):
+        dd2.add_records(np.zeros(3, dtype=[('x', float)]))
+
+
 def test_expansion_simple():
     """Test whether simple expansion of nested parameters works."""
 
@@ -224,6 +346,51 @@ def test_sanitizing_2d():
     assert num.arrays_equal(dd2.data_vals('b'), b_clean)
 
 
+def test_sanitizing_growing_data(monkeypatch):
+    """Test that repeated cleanup of growing data only checks new records."""
+    checked_rows = []
+    invalid_rows = num.invalid_rows
+
+    def counting_invalid_rows(a):
+        checked_rows.append(len(a))
+        return invalid_rows(a)
+
+    monkeypatch.setattr(num, 'invalid_rows', counting_invalid_rows)
+
+    dd = DataDict(
+        x=dict(values=np.array([])),
+        y=dict(values=np.array([], dtype=object), axes=['x']),
+    )
+    dd.add_data(x=np.arange(4), y=np.array([0, None, 2, 3], dtype=object))
+    dd.add_data(x=np.arange(4, 8), y=np.arange(4, 8))
+    assert dd.validate()
+
+    # removing the invalid record does not affect the original data
+    clean = dd.shallow_copy().extract(['y'], copy=False)
+    assert checked_rows == [8]
+    assert num.arrays_equal(clean.data_vals('x'), np.array([0, 2, 3, 4, 5, 6, 7]))
+    assert dd.nrecords() == 8
+
+    dd.add_data(x=np.array([8, 9]), y=np.array([None, 9], dtype=object))
+    clean = dd.shallow_copy().extract(['y'], copy=False)
+    assert checked_rows[1:] == [2]
+    assert num.arrays_equal(clean.data_vals('x'), np.array([0, 2, 3, 4, 5, 6, 7, 9]))
+
+    # adding datasets keeps the results of the checks, too.
+    dd2 = dd + dd.structure().__class__(
+        x=dict(values=np.array([10])),
+        y=dict(values=np.array([np.nan], dtype=object), axes=['x']),
+    )
+    dd2.remove_invalid_entries()
+    assert checked_rows[2:] == [1]
+    assert dd2.nrecords() == 8
+
+    # nothing to remove: values stay the same.
+    x = dd2.data_vals('x')
+    assert dd2.remove_invalid_entries().data_vals('x') is x
+    assert checked_rows[3:] == []
+
+
 def test_shape_guessing_simple():
     """test whether we can infer shapes correctly"""
 
@@ -122,6 +122,8 @@ def test_structure():
            dd2.structure(include_meta=True)
 
     assert DataDictBase.same_structure(dd, dd2)
+    assert not DataDictBase.same_structure(dd, dd2, check_shape=True)
+    assert DataDictBase.same_structure(dd2, dd2.copy(), check_shape=True)
 
 
 def test_validation():
@@ -140,6 +142,84 @@ def test_validation():
     assert dd.validate()
 
 
+def test_cached_queries():
+    """Test that cached structure information follows changes of the data."""
+    dd = DataDict(
+        x=dict(values=np.arange(3)),
+        y=dict(values=np.arange(3), axes=['x']),
+    )
+    assert dd.validate()
+    assert dd.dependents() == ['y']
+    fingerprint = dd.structure_fingerprint()
+
+    # replacing values does not change the structure, but the version.
+    version = dd.version
+    dd['y']['values'] = np.arange(3) ** 2
+    assert dd.version > version
+    assert dd.structure_fingerprint() == fingerprint
+
+    # changes of units, meta data, and fields are all tracked.
+    version = dd.version
+    dd['x']['unit'] = 'V'
+    assert dd.version > version
+    assert dd.structure_fingerprint() != fingerprint
+
+    version = dd.version
+    dd.add_meta('info', 'some info')
+    assert dd.version > version
+
+    dd['t'] = dict(values=np.arange(3))
+    dd['z'] = dict(values=np.arange(3), axes=['x', 't'])
+    assert dd.dependents() == ['y', 'z']
+    assert dd.axes() == ['x', 't']
+
+    # results of queries are copies, and do not modify the cache when changed.
+    dd.dependents().append('a')
+    assert dd.dependents() == ['y', 'z']
+
+    # invalid changes are still detected after a successful validation.
+    assert dd.validate()
+    dd['z']['values'] = np.arange(4)
+    with pytest.raises(ValueError):
+        dd.validate()
+
+
+def test_shallow_copy():
+    """Test that shallow copies share values, but cannot change the original."""
+    dd = DataDict(
+        x=dict(values=np.arange(3.), unit='V'),
+        y=dict(values=np.ma.masked_invalid([1., np.nan, 2.]), axes=['x']),
+    )
+    dd.add_meta('info', 'some info')
+    dd.validate()
+
+    cp = dd.shallow_copy()
+    assert isinstance(cp, DataDict)
+    assert cp == dd
+    assert np.shares_memory(cp.data_vals('x'), dd.data_vals('x'))
+
+    # values can not be changed in place without making a private copy.
+    with pytest.raises(ValueError):
+        cp['x']['values'][0] = 10
+    with pytest.raises(ValueError):
+        cp['y']['values'].mask[0] = True
+
+    yvals = cp.writable_vals('y')
+    yvals -= 1
+    yvals.mask[0] = True
+    assert not np.shares_memory(cp.data_vals('y'), dd.data_vals('y'))
+    assert np.ma.allequal(dd.data_vals('y'), np.ma.masked_invalid([1., np.nan, 2.]))
+    assert cp.writable_vals('y') is yvals
+
+    # changes of the fields do not affect the original.
+    cp['x']['unit'] = 'mV'
+    cp['x']['values'] = cp['x']['values'] * 1e3
+    cp['y']['axes'].append('z')
+    assert dd['x']['unit'] == 'V'
+    assert np.array_equal(dd.data_vals('x'), np.arange(3.))
+    assert dd.axes('y') == ['x']
+
+
 def test_sanitizing():
     """Test cleaning up of datasets."""
     dd = DataDictBase(
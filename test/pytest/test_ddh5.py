@@ -1,15 +1,20 @@
 """Test for datadict hdf5 serialization"""
 
+import os
+import socket
+import threading
 from pathlib import Path
 from multiprocessing import Process
 import time
 from shutil import rmtree
 
 import numpy as np
+import pytest
 
 from plottr.data import datadict as dd
 from plottr.data import datadict_storage as dds
 from plottr.node.tools import linearFlowchart
+from plottr.node import dim_reducer
 
 
 FILEPATH = Path('./test_ddh5_data.ddh5')
@@ -61,6 +66,171 @@ def test_file_lock_creation_and_deletion():
     FILEPATH.unlink()
 
 
+def test_file_lock_waiting_and_stale_locks():
+    lock_path = FILEPATH.parent.joinpath("~" + str(FILEPATH.stem) + '.lock')
+    with dds.FileOpener(FILEPATH, 'a') as f:
+        assert lock_path.read_text().split()[:2] == [socket.gethostname(), str(os.getpid())]
+
+    # a lock held by a running process is respected.
+    lock_path.write_text(f"{socket.gethostname()}\n{os.getpid()}\n")
+    opener = dds.FileOpener(FILEPATH, 'r', timeout=0.2)
+    assert not opener.lock_is_stale()
+    with pytest.raises(RuntimeError):
+        with opener:
+            pass
+    assert lock_path.is_file()
+
+    # a lock left behind by a process that does not exist anymore is removed.
+    proc = Process(target=time.sleep, args=(0,))
+    proc.start()
+    proc.join()
+    lock_path.write_text(f"{socket.gethostname()}\n{proc.pid}\n")
+    opener = dds.FileOpener(FILEPATH, 'r', timeout=1)
+    assert opener.lock_is_stale()
+    with opener:
+        pass
+    assert not lock_path.is_file()
+
+    # locks without owner information can expire.
+    lock_path.touch()
+    assert not dds.FileOpener(FILEPATH, 'r').lock_is_stale()
+    time.sleep(0.1)
+    with dds.FileOpener(FILEPATH, 'r', stale_lock_age=0.05) as f:
+        pass
+    assert not lock_path.is_file()
+
+    # waiting for another process is recorded.
+    lock_path.write_text(f"{socket.gethostname()}\n{os.getpid()}\n")
+    timer = threading.Timer(0.2, lock_path.unlink)
+    timer.start()
+    opener = dds.FileOpener(FILEPATH, 'r')
+    with opener:
+        pass
+    assert opener.wait_time >= 0.2
+
+    FILEPATH.unlink()
+
+
+def test_competing_openers_with_stale_lock():
+    """Only one of several openers that find the same stale lock may get the file."""
+    lock_path = FILEPATH.parent.joinpath("~" + str(FILEPATH.stem) + '.lock')
+    with dds.FileOpener(FILEPATH, 'a'):
+        pass
+
+    proc = Process(target=time.sleep, args=(0,))
+    proc.start()
+    proc.join()
+    stale = f"{socket.gethostname()}\n{proc.pid}\n"
+
+    # the second opener has seen the stale lock, but the first one removes it
+    # and locks the file before the second one gets to remove it.
+    lock_path.write_text(stale)
+    first, second = dds.FileOpener(FILEPATH, 'r'), dds.FileOpener(FILEPATH, 'r')
+    seen = second._read_lock()
+    assert seen is not None and second._is_stale(*seen)
+    with first:
+        lock = lock_path.read_text()
+        assert lock != stale
+        assert not second._remove_stale_lock(seen)
+        assert lock_path.read_text() == lock
+    assert not lock_path.exists()
+    assert list(FILEPATH.parent.glob(lock_path.name + '*')) == []
+
+    # openers in parallel threads never hold the file at the same time.
+    holders = []
+    maxHolders = []
+
+    def open_file():
+        with dds.FileOpener(FILEPATH, 'r', timeout=5):
+            holders.append(1)
+            maxHolders.append(len(holders))
+            time.sleep(0.02)
+            holders.pop()
+
+    for _ in range(5):
+        lock_path.write_text(stale)
+        threads = [threading.Thread(target=open_file) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(maxHolders) == 4 * (_ + 1)
+    assert max(maxHolders) == 1
+    assert not lock_path.exists()
+
+    FILEPATH.unlink()
+
+
+def test_three_waiters_with_stale_lock():
+    """Openers that wait for a stale lock never remove a lock that is not stale."""
+    lock_path = FILEPATH.parent.joinpath("~" + str(FILEPATH.stem) + '.lock')
+    reclaim_path = lock_path.with_name(lock_path.name + '.reclaim')
+    with dds.FileOpener(FILEPATH, 'a'):
+        pass
+
+    proc = Process(target=time.sleep, args=(0,))
+    proc.start()
+    proc.join()
+    stale = f"{socket.gethostname()}\n{proc.pid}\n"
+
+    # all three waiters have seen the stale lock.
+    lock_path.write_text(stale)
+    first, second, third = [dds.FileOpener(FILEPATH, 'r', timeout=0.2) for _ in range(3)]
+    seen = [w._read_lock() for w in (first, second, third)]
+    assert all(s is not None and first._is_stale(*s) for s in seen)
+
+    # the first one removes it and gets the file. the others leave its lock alone.
+    assert first._remove_stale_lock(seen[0])
+    with first:
+        lock = lock_path.read_text()
+        assert not second._remove_stale_lock(seen[1])
+        assert not third._remove_stale_lock(seen[2])
+        assert lock_path.read_text() == lock
+        with pytest.raises(RuntimeError):
+            with third:
+                pass
+        assert lock_path.read_text() == lock
+    assert not lock_path.exists()
+
+    # while somebody removes a stale lock, nobody else does.
+    lock_path.write_text(stale)
+    seen = second._read_lock()
+    reclaim_path.write_text(f"{socket.gethostname()}\n{os.getpid()}\n")
+    assert not second._remove_stale_lock(seen)
+    assert lock_path.exists() and reclaim_path.exists()
+
+    # unless that somebody crashed.
+    reclaim_path.write_text(stale)
+    assert not second._remove_stale_lock(seen)
+    assert not reclaim_path.exists()
+    assert second._remove_stale_lock(seen)
+    assert not lock_path.exists()
+
+    # three openers in parallel threads never hold the file at the same time.
+    holders = []
+    maxHolders = []
+
+    def open_file():
+        with dds.FileOpener(FILEPATH, 'r', timeout=5):
+            holders.append(1)
+            maxHolders.append(len(holders))
+            time.sleep(0.02)
+            holders.pop()
+
+    for i in range(10):
+        lock_path.write_text(stale)
+        threads = [threading.Thread(target=open_file) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(maxHolders) == 3 * (i + 1)
+    assert max(maxHolders) == 1
+    assert list(FILEPATH.parent.glob(lock_path.name + '*')) == []
+
+    FILEPATH.unlink()
+
+
 def test_basic_storage_and_retrieval():
     x = np.arange(3)
     y = np.repeat(np.linspace(0, 1, 5).reshape(1, -1), 3, 0)
@@ -122,6 +292,104 @@ def test_appending():
     FILEPATH.unlink()
 
 
+def test_structure_only_loading():
+    x = np.arange(3)
+    y = np.repeat(np.linspace(0, 1, 5).reshape(1, -1), 3, 0)
+    z = np.arange(y.size).reshape(y.shape)
+
+    data = dd.DataDict(
+        x=dict(values=x, unit='A'),
+        y=dict(values=y, unit='B'),
+        z=dict(values=z, axes=['x', 'y'], unit='C'),
+    )
+    assert data.validate()
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none)
+
+    struct = dds.datadict_from_hdf5(str(FILEPATH), structure_only=True)
+    assert struct.nrecords() == 0
+    assert struct.meta_val('shape', 'x') == (3,)
+    assert struct.meta_val('shape', 'z') == (3, 5)
+    assert dd.DataDictBase.same_structure(struct, data)
+
+    FILEPATH.unlink()
+
+
+def test_appending_with_overallocation():
+    data = dd.DataDict(
+        x=dict(values=np.arange(3), unit='A'),
+        y=dict(values=np.arange(6).reshape(3, 2), axes=['x'], unit='B'),
+    )
+    assert data.validate()
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none,
+                         growth_factor=2, chunk_rows=4, compression='gzip')
+
+    for i in range(3, 8):
+        data.add_data(x=[i], y=np.arange(2).reshape(1, 2))
+        dds.datadict_to_hdf5(data, str(FILEPATH), growth_factor=2)
+        assert _clean_from_file(dds.datadict_from_hdf5(str(FILEPATH))) == data
+
+    with dds.FileOpener(FILEPATH, 'r') as f:
+        ds = f['data']['y']
+        assert ds.shape == (12, 2)
+        assert ds.chunks == (4, 2)
+        assert ds.compression == 'gzip'
+        assert dds.dataset_length(ds) == 8
+
+    struct = dds.datadict_from_hdf5(str(FILEPATH), structure_only=True)
+    assert struct.meta_val('shape', 'y') == (8, 2)
+
+    # over-allocated datasets stay valid when appending without growth.
+    data.add_data(x=[8], y=np.arange(2).reshape(1, 2))
+    dds.datadict_to_hdf5(data, str(FILEPATH))
+    assert _clean_from_file(dds.datadict_from_hdf5(str(FILEPATH))) == data
+
+    FILEPATH.unlink()
+
+
+def test_lazy_loading():
+    x, y = np.meshgrid(np.arange(4), np.linspace(0, 1, 5), indexing='ij')
+    z = x * y
+    z[-1, -1] = np.nan
+    data = dd.DataDict(
+        x=dict(values=x.reshape(-1), unit='A'),
+        y=dict(values=y.reshape(-1), unit='B'),
+        z=dict(values=z.reshape(-1), axes=['x', 'y'], unit='C'),
+        trace=dict(values=np.arange(60).reshape(20, 3), axes=['x', 'y']),
+    )
+    assert data.validate()
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none)
+
+    lazy = dds.datadict_from_hdf5(str(FILEPATH), startidx=5, lazy=True)
+    assert isinstance(lazy.data_vals('trace'), dds.HDF5Values)
+    assert lazy.is_lazy()
+    assert lazy.shapes()['trace'] == (15, 3)
+    assert np.array_equal(lazy.data_vals('trace')[2::4], data.data_vals('trace')[7::4])
+    assert np.array_equal(lazy.data_vals('z') * 2, data.data_vals('z')[5:] * 2,
+                          equal_nan=True)
+
+    # selecting and gridding the data does not read it.
+    lazy = dds.datadict_from_hdf5(str(FILEPATH), lazy=True)
+    selected = lazy.shallow_copy().extract(['z'], copy=False)
+    gridded = dd.datadict_to_meshgrid(selected, copy=False)
+    assert isinstance(gridded.data_vals('z'), dd.LazyValues)
+    assert gridded.shape() == (4, 5)
+    sliced = gridded.slice(y=np.s_[1:3])
+    assert isinstance(sliced.data_vals('z'), dd.LazyValues)
+    assert np.array_equal(sliced.data_vals('z'), z[:, 1:3])
+
+    element = dim_reducer.selectAxisElement(gridded.data_vals('z'), 2, 0)
+    assert isinstance(element, dd.LazyValues)
+    assert np.array_equal(element, z[2])
+
+    loaded = gridded.shallow_copy().load_values()
+    assert not loaded.is_lazy()
+    assert isinstance(loaded.data_vals('z'), np.ma.MaskedArray)
+    assert loaded.data_vals('z').mask[-1, -1]
+    assert np.array_equal(loaded.data_vals('x'), x)
+
+    FILEPATH.unlink()
+
+
 def test_loader_node(qtbot):
     dds.DDH5Loader.useUi = False
 
@@ -170,6 +438,98 @@ def test_loader_node(qtbot):
     FILEPATH.unlink()
 
 
+def test_incremental_loader_node(qtbot):
+    dds.DDH5Loader.useUi = False
+
+    data = dd.DataDict(
+        x=dict(values=np.arange(3), unit='A'),
+        y=dict(values=np.arange(3)**2, axes=['x'], unit='B'),
+    )
+    assert data.validate()
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none)
+
+    fc = linearFlowchart(('loader', dds.DDH5Loader))
+    node = fc.nodes()['loader']
+    node.incremental = True
+
+    with qtbot.waitSignal(node.loadingWorker.dataLoaded, timeout=2000):
+        node.filepath = str(FILEPATH)
+    first = fc.outputValues()['dataOut']
+    out = first.copy()
+    out.pop('__title__')
+    assert _clean_from_file(out) == data
+
+    # only the new rows are read, and appended to what we have already.
+    data.add_data(x=[3, 4], y=[9, 16])
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.new)
+    # loading is only started again once the loading thread has finished.
+    qtbot.waitUntil(lambda: not node.loadingThread.isRunning())
+    with qtbot.waitSignal(node.loadingWorker.dataLoaded, timeout=2000):
+        node.update()
+    out = fc.outputValues()['dataOut'].copy()
+    out.pop('__title__')
+    assert out.meta_val('shape', 'x') == (5,)
+    assert _clean_from_file(out) == data
+    assert first.nrecords() == 3
+
+    # a re-created file with less data triggers a full reload.
+    data = dd.DataDict(
+        x=dict(values=np.arange(2), unit='A'),
+        y=dict(values=np.arange(2)**2, axes=['x'], unit='B'),
+    )
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none)
+    qtbot.waitUntil(lambda: not node.loadingThread.isRunning())
+    with qtbot.waitSignal(node.loadingWorker.dataLoaded, timeout=2000):
+        node.update()
+    out = fc.outputValues()['dataOut'].copy()
+    out.pop('__title__')
+    assert _clean_from_file(out) == data
+
+    FILEPATH.unlink()
+
+
+def test_incremental_loading_keeps_previous_data():
+    """Loading new rows must not change (or copy) data that has been emitted already."""
+    data = dd.DataDict(
+        x=dict(values=np.arange(3), unit='A'),
+        y=dict(values=np.arange(3)**2, axes=['x'], unit='B'),
+    )
+    dds.datadict_to_hdf5(data, str(FILEPATH), append_mode=dds.AppendMode.none)
+
+    loader = dds._Loader(str(FILEPATH), 'data')
+    loader.incremental = True
+    loader.loadData()
+    first = loader.data
+
+    def add_and_load(*x):
+        new = dd.DataDict(
+            x=dict(values=np.array(x), unit='A'),
+            y=dict(values=np.array(x)**2, axes=['x'], unit='B'),
+        )
+        dds.datadict_to_hdf5(new, str(FILEPATH), append_mode=dds.AppendMode.all)
+        loader.loadData()
+        return loader.data
+
+    second = add_and_load(3, 4)
+    version = second.version
+    third = add_and_load(5)
+    assert np.array_equal(first.data_vals('x'), np.arange(3))
+    assert np.array_equal(second.data_vals('x'), np.arange(5))
+    assert np.array_equal(third.data_vals('y'), np.arange(6)**2)
+    assert second.version == version
+    # the earlier rows are not copied again.
+    assert np.shares_memory(second.data_vals('x'), third.data_vals('x'))
+
+    # nothing new: a new dataset that shares the values.
+    version = third.version
+    fourth = add_and_load()
+    assert fourth is not third and third.version == version
+    assert np.shares_memory(fourth.data_vals('x'), third.data_vals('x'))
+    assert np.array_equal(fourth.data_vals('x'), np.arange(6))
+
+    FILEPATH.unlink()
+
+
 # tests for the writer class and concurrent w/r access
 
 def _mkdatachunk(start, nrows, npts=1):
@@ -195,6 +555,67 @@ def test_writer():
     rmtree('./TESTDATA')
 
 
+def test_writer_without_keeping_data_in_memory():
+    dataset = dd.str2dd("x[a.u.]; y[a.u.](x)")
+    with dds.DDH5Writer(dataset.copy(), basedir='./TESTDATA',
+                        keep_data_in_memory=False) as writer:
+        for i in range(10):
+            x = _mkdatachunk(i, 1, 1)
+            y = x**2
+            writer.add_data(x=x, y=y)
+            dataset.add_data(x=x, y=y)
+            assert writer.datadict.nrecords() == 0
+
+    dataset_from_file = dds.datadict_from_hdf5(writer.filepath)
+    dataset.add_meta('dataset.name', '')
+    assert _clean_from_file(dataset_from_file) == dataset
+
+    rmtree('./TESTDATA')
+
+
+def test_writer_with_overallocation():
+    dataset = dd.str2dd("x[a.u.]; y[a.u.](x)")
+    with dds.DDH5Writer(dataset, basedir='./TESTDATA', growth_factor=1.5,
+                        chunk_rows=16, compression='lzf') as writer:
+        for i in range(20):
+            x = _mkdatachunk(i, 1, 1)
+            y = x**2
+            writer.add_data(x=x, y=y)
+
+    dataset_from_file = dds.datadict_from_hdf5(writer.filepath)
+    assert _clean_from_file(dataset_from_file) == dataset
+
+    rmtree('./TESTDATA')
+
+
+def test_writer_with_buffering():
+    dataset = dd.str2dd("x[a.u.]; y[a.u.](x)")
+    for keep in [True, False]:
+        with dds.DDH5Writer(dataset.copy(), basedir='./TESTDATA',
+                            keep_data_in_memory=keep, buffer_rows=4) as writer:
+            for i in range(10):
+                x = _mkdatachunk(i, 1, 1)
+                writer.add_data(x=x, y=x**2)
+                nrows = dds.datadict_from_hdf5(writer.filepath).nrecords() \
+                    if writer.filepath.exists() else 0
+                assert nrows == 4 * ((i + 1) // 4)
+
+        # remaining data is written on exit
+        dataset_from_file = dds.datadict_from_hdf5(writer.filepath)
+        assert dataset_from_file.nrecords() == 10
+        assert '__last_change_time_sec__' in dataset_from_file
+        rmtree('./TESTDATA')
+
+    with dds.DDH5Writer(dataset.copy(), basedir='./TESTDATA',
+                        buffer_interval=3600) as writer:
+        writer.add_data(x=[0], y=[0])
+        assert not writer.filepath.exists()
+        writer.flush()
+        assert dds.datadict_from_hdf5(writer.filepath).nrecords() == 1
+
+    rmtree('./TESTDATA')
+
+
 class _Writer(Process):
 
     ncols = 100
@@ -202,13 +623,15 @@ class _Writer(Process):
     nreps = 100
     delay = 0.01
     filepath = './TESTDATA/data.ddh5'
+    swmr = False
 
     def mkdata(self):
         return _mkdatachunk(0, self.nrows_per_rep * self.nreps, self.ncols)
 
     def run(self):
         data = self.mkdata()
-        with dds.DDH5Writer(dd.str2dd("x[W]; y[T](x)"), filepath=self.filepath) as writer:
+        with dds.DDH5Writer(dd.str2dd("x[W]; y[T](x)"), filepath=self.filepath,
+                            swmr=self.swmr) as writer:
             self.filepath = writer.filepath
             for i in range(self.nreps):
                 chunk = data[i*self.nrows_per_rep:(i+1)*self.nrows_per_rep, ...]
@@ -258,3 +681,43 @@ def test_concurrent_write_and_read():
     assert(_clean_from_file(dataset_from_file) == ref_dataset)
 
     rmtree(str(Path(writer.filepath).parent))
+
+
+def test_concurrent_write_and_read_swmr():
+    writer = _Writer()
+    writer.swmr = True
+    writer.nreps = 20
+    writer.delay = 0.1
+
+    ref_data = writer.mkdata()
+    ref_dataset = dd.DataDict(
+        x=dict(values=ref_data, unit='W'),
+        y=dict(values=ref_data**2, unit='T', axes=['x']),
+    )
+    ref_dataset['__dataset.name__'] = ''
+
+    writer.start()
+    nreads = 0
+    while writer.is_alive():
+        time.sleep(0.1)
+        if not Path(writer.filepath).exists():
+            continue
+        try:
+            # readers that don't ask for SWMR mode can read the file as well.
+            data_from_file = dds.datadict_from_hdf5(writer.filepath, swmr=nreads % 2 == 0,
+                                                    file_timeout=0.5)
+            nreads += 1
+        except ValueError:
+            # the data group might not exist yet.
+            continue
+        nrecords = data_from_file.nrecords()
+        assert nrecords % writer.nrows_per_rep == 0
+        assert np.array_equal(data_from_file.data_vals('y'),
+                              data_from_file.data_vals('x')**2)
+    writer.join()
+    assert nreads >= 2
+
+    dataset_from_file = dds.datadict_from_hdf5(writer.filepath)
+    assert(_clean_from_file(dataset_from_file) == ref_dataset)
+
+    rmtree(str(Path(writer.filepath).parent))
@@ -1,6 +1,6 @@
 import numpy as np
 
-from plottr.data.datadict import MeshgridDataDict, DataDict
+from plottr.data.datadict import MeshgridDataDict, DataDict, datadict_to_meshgrid
 from plottr.node.tools import linearFlowchart
 from plottr.node.grid import DataGridder, GridOption
 from plottr.utils import testdata
@@ -107,3 +107,118 @@ def test_set_grid_with_order(qtbot):
     )
 
 
+
+
+def test_incremental_gridding(qtbot):
+    """Test gridding of growing data without re-guessing the shape."""
+
+    DataGridder.useUi = False
+    DataGridder.uiClass = None
+
+    fc = linearFlowchart(('grid', DataGridder))
+    node = fc.nodes()['grid']
+    node.grid = GridOption.guessShape, dict()
+    node.incremental = True
+
+    x = np.linspace(-1, 1, 21)
+    y = np.arange(5.0)
+    z = np.linspace(0, 1, 3)
+    xx, yy, zz = np.meshgrid(x, y, z, indexing='ij')
+    vv = xx * yy + zz
+    # axes are not given in the order of the sweep.
+    fields = dict(y=yy.ravel(), z=zz.ravel(), x=xx.ravel(), vals=vv.ravel())
+
+    def data_until(n, **replace):
+        vals = {k: v[:n].copy() for k, v in fields.items()}
+        vals.update(replace)
+        data = DataDict(
+            **{k: dict(values=v) for k, v in vals.items() if k != 'vals'},
+            vals=dict(values=vals['vals'], axes=['x', 'y', 'z']),
+        )
+        assert data.validate()
+        return data
+
+    for n in [7, 15, 16, 40, 100, 101, 315]:
+        data = data_until(n)
+        fc.setInput(dataIn=data)
+        out = fc.outputValues()['dataOut']
+        expected = datadict_to_meshgrid(data)
+        assert out.shape() == expected.shape()
+        for k in fields.keys():
+            assert num.arrays_equal(out.data_vals(k), expected.data_vals(k))
+    assert node._incrementalGrid.nrecords == 315
+
+    # data that does not fit the grid anymore is gridded from scratch.
+    x = fields['x'].copy()
+    x[301:] = 10.
+    data = data_until(315, x=x)
+    fc.setInput(dataIn=data)
+    out = fc.outputValues()['dataOut']
+    expected = datadict_to_meshgrid(data)
+    assert node._incrementalGrid is None
+    for k in fields.keys():
+        assert num.arrays_equal(out.data_vals(k), expected.data_vals(k))
+
+
+def test_incremental_gridding_of_lazy_data(qtbot, tmp_path):
+    """Lazily loaded data stays lazy when gridding incrementally."""
+    from plottr.data import datadict_storage as dds
+    from plottr.node.data_selector import DataSelector
+    from plottr.node.dim_reducer import XYSelector
+
+    x, y, w = np.meshgrid(np.arange(5.), np.arange(4.), np.arange(3.), indexing='ij')
+    data = DataDict(
+        x=dict(values=x.ravel()), y=dict(values=y.ravel()), w=dict(values=w.ravel()),
+        z=dict(values=(x * y + w).ravel(), axes=['x', 'y', 'w']),
+    )
+    path = str(tmp_path / 'data.ddh5')
+    dds.datadict_to_hdf5(data, path)
+    lazy = dds.datadict_from_hdf5(path, lazy=True)
+    assert lazy.is_lazy()
+
+    DataGridder.useUi = False
+    DataGridder.uiClass = None
+    fc = linearFlowchart(('sel', DataSelector), ('grid', DataGridder), ('xy', XYSelector))
+    fc.nodes()['sel'].selectedData = ['z']
+    fc.nodes()['grid'].grid = GridOption.guessShape, dict()
+    fc.nodes()['grid'].incremental = True
+    fc.nodes()['xy'].xyAxes = ('x', 'y')
+    fc.setInput(dataIn=lazy)
+
+    gridded = fc.nodes()['grid'].outputValues()['dataOut']
+    assert fc.nodes()['grid']._incrementalGrid is None
+    assert gridded.is_lazy() and gridded.shape() == (5, 4, 3)
+    out = fc.outputValues()['dataOut']
+    assert num.arrays_equal(out.data_vals('z'), x[..., 0] * y[..., 0])
+
+
+def test_incremental_gridding_keeps_outputs(qtbot):
+    """Earlier outputs of incremental gridding don't change when new data arrives."""
+    DataGridder.useUi = False
+    DataGridder.uiClass = None
+
+    fc = linearFlowchart(('grid', DataGridder))
+    node = fc.nodes()['grid']
+    node.grid = GridOption.guessShape, dict()
+    node.incremental = True
+
+    xx, yy = np.meshgrid(np.arange(10.), np.arange(4.), indexing='ij')
+    zz = xx * yy
+
+    def output(n):
+        data = DataDict(
+            x=dict(values=xx.ravel()[:n]), y=dict(values=yy.ravel()[:n]),
+            z=dict(values=zz.ravel()[:n], axes=['x', 'y']),
+        )
+        fc.setInput(dataIn=data)
+        return fc.outputValues()['dataOut']
+
+    outputs = [output(n) for n in [8, 10, 11, 12, 20, 23]]
+    assert node._incrementalGrid is not None
+    for n, out in zip([8, 10, 11, 12, 20, 23], outputs):
+        expected = np.full(out.data_vals('z').size, np.nan)
+        expected[:n] = zz.ravel()[:n]
+        assert num.arrays_equal(out.data_vals('z').ravel(), expected)
+
+    # complete blocks are still shared, not copied.
+    assert np.shares_memory(outputs[-1].data_vals('z'), outputs[-2].data_vals('z'))
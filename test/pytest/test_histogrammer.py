@@ -99,3 +99,20 @@ def test_histogram_with_ui(qtbot):
         fc.outputValues()['dataOut']['noise_count']['values'],
         hist
     )
+
+
+def test_histogram_leaves_input_unchanged(qtbot):
+    dataset = _make_testdata()
+    dataset['noise']['values'][0, 0, 0] = np.nan
+    values = {n: v['values'] for n, v in dataset.data_items()}
+
+    Histogrammer.useUi = False
+    fc = linearFlowchart(('h', Histogrammer))
+    fc.setInput(dataIn=dataset)
+    assert fc.outputValues()['dataOut'] is not dataset
+    fc.nodes()['h'].nbins = 10
+    fc.nodes()['h'].histogramAxis = 'x'
+
+    for n, v in dataset.data_items():
+        assert v['values'] is values[n]
+        assert not np.ma.isMaskedArray(v['values'])
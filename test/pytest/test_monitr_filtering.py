@@ -21,7 +21,7 @@ from pprint import pprint
 from typing import Tuple, List
 
 from plottr.data.datadict import DataDict
-from plottr.apps.monitr import FilterWorker, FileModel
+from plottr.apps.monitr import FilterWorker, FileModel, ContentType
 from plottr.data.datadict_storage import datadict_to_hdf5
 
 
@@ -985,3 +985,101 @@ def test_item_query_check(qtbot, tmp_path):
 
 
 
+
+
+def test_lazy_model(qtbot, tmp_path):
+    folder_path, days_paths, folder_paths = generate_file_structure(tmp_path)
+
+    model = FileModel(str(folder_path), 0, 2, watcher_on=False, lazy=True)
+    assert sorted(model.main_dictionary.keys()) == sorted(days_paths)
+    day_index = model.indexFromItem(model.main_dictionary[days_paths[0]])
+    assert model.hasChildren(day_index)
+    assert model.canFetchMore(day_index)
+
+    model.fetchMore(day_index)
+    assert not model.canFetchMore(day_index)
+    assert model.main_dictionary[days_paths[0]].rowCount() == 3
+    for folder in folder_paths[:3]:
+        assert folder in model.main_dictionary
+    for folder in folder_paths[3:]:
+        assert folder not in model.main_dictionary
+
+    # filtering sees all the items once they are created.
+    model.fetch_all()
+    filter_worker = FilterWorker()
+    allowed_list, queries_dict = filter_worker.filter_items(model, False, False, '', [])
+    assert sorted(folder_paths + days_paths) == sorted(allowed_list)
+
+
+def test_filter_index(qtbot, tmp_path):
+    folder_path, days_paths, folder_paths = generate_file_structure(tmp_path)
+
+    pretty_path = days_paths[1].joinpath('pretty_folder')
+    pretty_path.mkdir()
+    generate_data(0.001, pretty_path)
+    with open(pretty_path.joinpath('markdown_file.md'), 'w') as f:
+        f.write('this is a markdown file')
+
+    model = FileModel(str(folder_path), 0, 2, watcher_on=False)
+    index = model.filter_index
+    assert index.name_candidates('pretty') == {pretty_path}
+    assert index.name_candidates('pre.*') is None
+    # the name of the monitored folder matches everything, the index can't help there.
+    assert index.name_candidates('data/day') is None
+    assert index.file_candidates(ContentType.md, 'markdown') == {pretty_path}
+
+    filter_worker = FilterWorker()
+    for query in ['pretty', 'pret+y', 'm:markdown', 'm:mark, pretty']:
+        allowed_list, queries_dict = filter_worker.filter_items(model, False, False, query, [])
+        assert sorted(allowed_list) == sorted([days_paths[1], pretty_path])
+
+    # the index follows changes of the files.
+    with open(folder_paths[0].joinpath('notes.md'), 'w') as f:
+        f.write('this is another markdown file')
+    model.main_dictionary[folder_paths[0]].add_file(folder_paths[0].joinpath('notes.md'))
+    allowed_list, queries_dict = filter_worker.filter_items(model, False, False, 'm:notes', [])
+    assert sorted(allowed_list) == sorted([days_paths[0], folder_paths[0]])
+
+    model.delete_root_item(model.main_dictionary[days_paths[1]].row(), days_paths[1])
+    assert days_paths[1] not in index.entries
+
+
+def test_filter_index_concurrent_access(qtbot, tmp_path):
+    """The FilterWorker queries the index while the GUI thread changes it."""
+    import threading
+
+    folder_path, days_paths, folder_paths = generate_file_structure(tmp_path)
+    model = FileModel(str(folder_path), 0, 2, watcher_on=False)
+    model.fetch_all()
+    index = model.filter_index
+    items = [model.main_dictionary[path] for path in folder_paths]
+
+    # re-indexing an item must not hide it from queries made meanwhile.
+    errors = []
+    stop = threading.Event()
+
+    def query():
+        try:
+            while not stop.is_set():
+                assert index.name_candidates('data_folder') == set(folder_paths)
+                assert index.file_candidates(ContentType.data, 'data') == set(folder_paths)
+        except Exception as e:
+            errors.append(e)
+
+    # switch threads often, such that unsynchronized access would fail.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    query_thread = threading.Thread(target=query)
+    query_thread.start()
+    try:
+        for _ in range(500):
+            for item in items:
+                index.update_item(item)
+    finally:
+        stop.set()
+        query_thread.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert errors == []
+    assert index.name_candidates('data_folder') == set(folder_paths)
+    assert index.file_candidates(ContentType.data, 'data') == set(folder_paths)
@@ -0,0 +1,80 @@
+import os
+import shutil
+
+from plottr.apps.monitr import FileModel
+from plottr.apps.monitr_index import FolderIndex
+
+from .test_monitr_filtering import generate_file_structure, generate_data
+
+
+def _bump_mtime(path):
+    # make sure a change is detected also on file systems with coarse time stamps.
+    st = os.stat(path)
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+
+
+def test_folder_index_updates(tmp_path):
+    folder_path, days_paths, folder_paths = generate_file_structure(tmp_path)
+    index_path = tmp_path.joinpath('index.sqlite')
+
+    index = FolderIndex(folder_path, index_path)
+    assert index.is_empty()
+    index.rebuild()
+    contents = index.folder_files()
+    assert sorted(contents.keys()) == sorted([folder_path] + days_paths + folder_paths)
+    for folder in folder_paths:
+        assert contents[folder] == [folder.joinpath('data.ddh5')]
+    index.close()
+
+    # re-opening the index does not require a new scan.
+    index = FolderIndex(folder_path, index_path)
+    assert not index.is_empty()
+    assert index.validate_parents() == []
+
+    # a new dataset in an existing day folder is found by validating the parents.
+    new_folder = days_paths[0].joinpath('data_folder_new')
+    new_folder.mkdir()
+    generate_data(0.001, new_folder)
+    _bump_mtime(days_paths[0])
+    assert index.validate_parents() == [days_paths[0]]
+    assert index.files(new_folder) == [new_folder.joinpath('data.ddh5')]
+
+    # removed folders disappear from the index, including their children.
+    shutil.rmtree(days_paths[1])
+    index.update_folder(days_paths[1])
+    contents = index.folder_files()
+    assert days_paths[1] not in contents
+    assert not any(days_paths[1] in f.parents for f in contents)
+
+    # hidden folders are not indexed.
+    folder_path.joinpath('.hidden').mkdir()
+    index.update_folder(folder_path)
+    assert folder_path.joinpath('.hidden') not in index.folder_files()
+    index.close()
+
+
+def test_file_model_with_index(tmp_path, qtbot):
+    folder_path, days_paths, folder_paths = generate_file_structure(tmp_path)
+    index_path = tmp_path.joinpath('index.sqlite')
+
+    model = FileModel(str(folder_path), 0, 2, watcher_on=False, index_path=index_path)
+    assert sorted(model.main_dictionary.keys()) == sorted(days_paths + folder_paths)
+    model.folder_index.close()
+
+    # a dataset that appeared while the model was not running shows up in the next model.
+    new_folder = days_paths[0].joinpath('data_folder_new')
+    new_folder.mkdir()
+    generate_data(0.001, new_folder)
+    _bump_mtime(days_paths[0])
+
+    model = FileModel(str(folder_path), 0, 2, watcher_on=False, index_path=index_path)
+    assert new_folder in model.main_dictionary
+
+    # files added to an existing dataset are picked up once the dataset is selected.
+    new_file = folder_paths[0].joinpath('notes.md')
+    new_file.write_text('some notes')
+    _bump_mtime(folder_paths[0])
+    assert new_file not in model.main_dictionary[folder_paths[0]].files
+    model.update_currently_selected_folder(folder_paths[0])
+    assert new_file in model.main_dictionary[folder_paths[0]].files
+    model.folder_index.close()
@@ -1,6 +1,8 @@
+import time
+
 from plottr.data.datadict import DataDict
 from plottr.node.tools import flowchart, linearFlowchart
-from plottr.node.node import Node
+from plottr.node.node import Node, updateOption
 
 
 def test_basic_flowchart_and_nodes(qtbot):
@@ -25,3 +27,207 @@ def test_basic_flowchart_and_nodes(qtbot):
         fc = linearFlowchart(*lst)
         fc.setInput(dataIn=data)
         assert fc.outputValues() == dict(dataOut=data)
+
+
+class CountingNode(Node):
+
+    cacheOutput = True
+    useUi = False
+
+    def __init__(self, name):
+        self._factor = 1
+        self.nprocessed = 0
+        super().__init__(name)
+
+    @property
+    def factor(self):
+        return self._factor
+
+    @factor.setter
+    @updateOption('factor')
+    def factor(self, value):
+        self._factor = value
+
+    def process(self, dataIn=None):
+        data = super().process(dataIn=dataIn)
+        if data is None:
+            return None
+        self.nprocessed += 1
+        data = data['dataOut'].shallow_copy()
+        data['data']['values'] = data['data']['values'] * self._factor
+        return dict(dataOut=data)
+
+
+def test_cached_node_output(qtbot):
+    fc = linearFlowchart(('node', CountingNode))
+    node = fc.nodes()['node']
+
+    data = DataDict(
+        x=dict(values=[1, 2, 3]),
+        data=dict(values=[1, 2, 3], axes=['x']),
+    )
+    assert data.validate()
+
+    fc.setInput(dataIn=data)
+    out = fc.outputValues()['dataOut']
+    assert node.nprocessed == 1
+
+    # nothing changed: the previous output is returned.
+    node.update()
+    assert node.nprocessed == 1
+    assert fc.outputValues()['dataOut'] is out
+
+    # a changed option, changed data, or explicit invalidation re-process.
+    node.factor = 2
+    assert node.nprocessed == 2
+    assert fc.outputValues()['dataOut'].data_vals('data').tolist() == [2, 4, 6]
+
+    node.factor = 2
+    assert node.nprocessed == 2
+
+    data.add_data(x=[4], data=[4])
+    node.update()
+    assert node.nprocessed == 3
+    assert fc.outputValues()['dataOut'].data_vals('data').tolist() == [2, 4, 6, 8]
+
+    node.invalidateCache()
+    node.update()
+    assert node.nprocessed == 4
+
+
+class SlowNode(CountingNode):
+
+    cacheOutput = False
+    processInThread = True
+
+    def process(self, dataIn=None):
+        time.sleep(0.05)
+        if self._factor < 0:
+            raise ValueError('negative factor')
+        return super().process(dataIn=dataIn)
+
+
+def test_processing_in_thread(qtbot):
+    fc = linearFlowchart(('node', SlowNode))
+    node = fc.nodes()['node']
+
+    data = DataDict(
+        x=dict(values=[1, 2, 3]),
+        data=dict(values=[1, 2, 3], axes=['x']),
+    )
+    assert data.validate()
+
+    # updating returns right away, the output is set once processing is done.
+    fc.setInput(dataIn=data)
+    assert node.isProcessing
+    qtbot.waitUntil(lambda: not node.isProcessing)
+    assert fc.outputValues()['dataOut'].data_vals('data').tolist() == [1, 2, 3]
+
+    # updates during processing supersede each other, only the latest counts.
+    for factor in range(2, 6):
+        node.factor = factor
+    qtbot.waitUntil(lambda: not node.isProcessing)
+    assert node.nprocessed < 5
+    assert fc.outputValues()['dataOut'].data_vals('data').tolist() == [5, 10, 15]
+
+    # exceptions are caught, and the output is reset.
+    node.factor = -1
+    qtbot.waitUntil(lambda: not node.isProcessing)
+    assert node.exception is not None
+    assert fc.outputValues()['dataOut'] is None
+
+    node.factor = 1
+    qtbot.waitUntil(lambda: not node.isProcessing)
+    assert node.exception is None
+    assert fc.outputValues()['dataOut'].data_vals('data').tolist() == [1, 2, 3]
+
+
+def test_node_state_and_closing_with_thread(qtbot):
+    fc = linearFlowchart(('node', SlowNode))
+    node = fc.nodes()['node']
+    data = DataDict(
+        x=dict(values=[1, 2, 3]),
+        data=dict(values=[1, 2, 3], axes=['x']),
+    )
+    assert data.validate()
+
+    # the node state is only changed in the thread of the node.
+    fc.setInput(dataIn=data)
+    assert node.isProcessing
+    time.sleep(0.1)
+    assert node.dataAxes is None
+    qtbot.waitUntil(lambda: not node.isProcessing)
+    assert node.dataAxes == ['x']
+
+    # closing the node while processing stops the thread, the result is discarded.
+    node.factor = 2
+    assert node.isProcessing
+    thread = node._processThread
+    fc.removeNode(node)
+    assert not thread.isRunning()
+    assert not node.isProcessing
+    qtbot.wait(100)
+    assert node.dataAxes == ['x']
+
+
+def test_cached_output_in_flowchart(qtbot, monkeypatch):
+    """Nodes further down a flowchart re-use their output when upstream nodes
+    pass on new (shallow) copies of unchanged data."""
+    import numpy as np
+    from plottr.node.data_selector import DataSelector
+    from plottr.node.grid import DataGridder, GridOption
+    from plottr.node.dim_reducer import XYSelector, ReductionMethod
+
+    nprocessed = []
+    process = DataGridder.process
+
+    def counting_process(self, dataIn=None):
+        if dataIn is not None:
+            nprocessed.append(1)
+        return process(self, dataIn=dataIn)
+
+    monkeypatch.setattr(DataGridder, 'process', counting_process)
+
+    fc = linearFlowchart(('sel', DataSelector), ('grid', DataGridder), ('xy', XYSelector))
+    fc.nodes()['sel'].selectedData = ['z', 'nz']
+    fc.nodes()['grid'].grid = GridOption.guessShape, {}
+    fc.nodes()['xy'].xyAxes = ('x', 'y')
+
+    x, y, w = np.meshgrid(np.arange(5.), np.arange(4.), np.arange(3.), indexing='ij')
+    # missing values never compare equal, so the flowchart passes on every copy.
+    nz = np.ones(x.size)
+    nz[3] = np.nan
+    loaded = DataDict(
+        x=dict(values=x.ravel()), y=dict(values=y.ravel()), w=dict(values=w.ravel()),
+        z=dict(values=(x * y + w).ravel(), axes=['x', 'y', 'w']),
+        nz=dict(values=nz, axes=['x', 'y', 'w']),
+    )
+    assert loaded.validate()
+
+    # like the ddh5 loader when refreshing without new data.
+    def refresh():
+        data = loaded.shallow_copy()
+        data.add_meta('title', 'data.ddh5')
+        fc.setInput(dataIn=data)
+        return fc.outputValues()['dataOut']
+
+    out = refresh()
+    assert len(nprocessed) == 1
+    for _ in range(3):
+        assert np.array_equal(refresh().data_vals('z'), out.data_vals('z'))
+    assert len(nprocessed) == 1
+
+    # changing an option downstream doesn't process upstream nodes.
+    fc.nodes()['xy'].dimensionRoles = {
+        'x': 'x-axis', 'y': 'y-axis',
+        'w': (ReductionMethod.elementSelection, [], {'index': 2, 'axis': 2}),
+    }
+    assert np.array_equal(fc.outputValues()['dataOut'].data_vals('z'), x[..., 2] * y[..., 2] + 2)
+    assert len(nprocessed) == 1
+
+    # new data is processed.
+    loaded.add_data(x=[5.], y=[0.], w=[0.], z=[0.], nz=[1.])
+    refresh()
+    assert len(nprocessed) == 2
+    refresh()
+    assert len(nprocessed) == 2
@@ -55,6 +55,21 @@ def test_array_reshape():
     assert out.shape == (3, 3)
     assert num.arrays_equal(out, a[:9].reshape(3, 3))
 
+    # integers are padded with nan, not with None.
+    out = num.array1d_to_meshgrid(np.arange(10), (4, 4))
+    assert out.dtype == np.float64
+
+    # without copying, complete data is only reshaped.
+    out = num.array1d_to_meshgrid(a, (2, 5), copy=False)
+    assert np.shares_memory(out, a)
+    out = num.array1d_to_meshgrid(a, (2, 5))
+    assert not np.shares_memory(out, a)
+
+    # masks are kept when padding.
+    a = np.ma.masked_invalid([1., np.nan, 3.])
+    out = num.array1d_to_meshgrid(a, (2, 2))
+    assert np.ma.getmaskarray(out).tolist() == [[False, True], [False, False]]
+
 
 def test_find_direction_period():
     """Test period finding in the direction"""
@@ -224,3 +239,22 @@ def test_crop_less_than_one_row():
 
     assert zzz.shape == (1, 5)
     assert_array_equal(zzz, zz[0:1, 0:5])
+
+
+def test_pool2d():
+    """Test reducing the resolution of 2d data by pooling blocks"""
+    a = np.arange(5 * 7, dtype=float).reshape(5, 7)
+    pooled = num.pool2d(a, 2)
+    assert pooled.shape == (3, 4)
+    assert pooled[0, 0] == a[:2, :2].mean()
+    assert pooled[-1, -1] == a[-1, -1]
+    assert_array_equal(num.pool2d(a, 3, 'max'), [[16, 19, 20], [30, 33, 34]])
+
+    # invalid values are ignored, and blocks without valid data are invalid
+    a[0, 0] = np.nan
+    b = np.ma.masked_array(a, mask=np.zeros(a.shape, dtype=bool))
+    b.mask[:2, 2:4] = True
+    pooled = num.pool2d(b, 2)
+    assert pooled[0, 0] == np.mean([1, 7, 8])
+    assert np.isnan(pooled[0, 1])
+    assert num.pool2d(a, 2, 'max')[0, 0] == 8
@@ -28,3 +28,232 @@ def test_colorplot2d_scatter_rgba_error():
     y = np.array([[0.0, 0.0, 0.0]])
     z = np.array([[5.08907021, 4.93923391, 5.11400073]])
     colorplot2d(ax, x, y, z, PlotType.scatter2d)
+
+
+def test_pyqtgraph_figure_update_in_place(qtbot):
+    """Check that re-plotting with an unchanged layout updates the existing
+    pyqtgraph items instead of re-creating them."""
+    from plottr.plot.base import PlotDataType
+    from plottr.plot.pyqtgraph.autoplot import FigureMaker
+
+    def plot(n, widget=None, clearWidget=True):
+        x = np.linspace(0, 1, n)
+        xx, yy = np.meshgrid(x, x, indexing='ij')
+        with FigureMaker(widget=widget, clearWidget=clearWidget) as fm:
+            fm.addData(x, x**2, labels=['x', 'y'],
+                       plotDataType=PlotDataType.line1d)
+            fm.addData(xx, yy, xx * yy, labels=['x', 'y', 'z'],
+                       plotDataType=PlotDataType.grid2d)
+        return fm.widget
+
+    widget = plot(11)
+    qtbot.addWidget(widget)
+    line_plot, image_plot = widget.subPlots
+    line = line_plot.plot.listDataItems()[0]
+    img = image_plot.img
+    image_plot.colorbar.setLevels((0.1, 0.5))
+
+    assert plot(21, widget, clearWidget=False) is widget
+    assert widget.subPlots == [line_plot, image_plot]
+    assert line_plot.plot.listDataItems() == [line]
+    assert line.xData.size == 21
+    assert image_plot.img is img and img.image.shape == (21, 21)
+    assert tuple(image_plot.colorbar.levels()) == (0.1, 0.5)
+
+    plot(21, widget, clearWidget=True)
+    assert widget.subPlots[0] is not line_plot
+
+
+def test_pyqtgraph_large_traces(qtbot, monkeypatch):
+    """Check that traces with many points are clipped to the view and
+    downsampled, if their x values are sorted."""
+    from plottr.plot.base import PlotDataType
+    from plottr.plot.pyqtgraph import autoplot
+
+    getcfg = autoplot.getcfg
+    monkeypatch.setattr(
+        autoplot, 'getcfg',
+        lambda *names, default=None: 100 if names[-1] == 'line_lod_threshold'
+        else getcfg(*names, default=default))
+
+    def plot(x, plotDataType=PlotDataType.line1d):
+        with autoplot.FigureMaker() as fm:
+            fm.addData(x, np.sin(x), labels=['x', 'y'], plotDataType=plotDataType)
+        qtbot.addWidget(fm.widget)
+        return fm.widget.subPlots[0].plot.listDataItems()[0]
+
+    def has_lod(item):
+        return item.opts['clipToView'] and item.opts['autoDownsample'] \
+            and item.opts['downsampleMethod'] == 'peak'
+
+    item = plot(np.linspace(0, 1, 101))
+    assert has_lod(item)
+    assert item.opts['symbol'] is None
+
+    item = plot(np.linspace(0, 1, 100))
+    assert not has_lod(item)
+    assert item.opts['symbol'] is not None
+
+    # scatter data stays point-like.
+    item = plot(np.linspace(0, 1, 101), PlotDataType.scatter1d)
+    assert has_lod(item)
+    assert item.opts['symbol'] is not None and item.opts['pen'] is None
+
+    x = np.linspace(1, 0, 101)
+    item = plot(x)
+    assert has_lod(item)
+    assert np.array_equal(item.xData, x[::-1])
+    assert np.array_equal(item.yData, np.sin(x[::-1]))
+
+    for x in [np.sin(np.linspace(0, 10, 101)),
+              np.r_[np.linspace(0, 1, 100), np.nan]]:
+        item = plot(x)
+        assert not has_lod(item)
+        assert item.opts['symbol'] is not None
+
+
+def test_mpl_figure_update_in_place():
+    """Check that re-plotting with an unchanged layout updates the existing
+    matplotlib artists instead of re-creating the figure."""
+    from matplotlib.figure import Figure
+    from plottr.plot.base import PlotDataType
+    from plottr.plot.mpl.autoplot import FigureMaker
+
+    def plot(n, zmax=1., plotType=PlotType.image, previous=None):
+        x = np.linspace(0, 1, n)
+        xx, yy = np.meshgrid(x, x, indexing='ij')
+        with FigureMaker(fig, previous=previous) as fm:
+            fm.plotType = plotType
+            fm.addData(xx, yy, zmax * xx * yy, labels=['x', 'y', 'z'],
+                       plotDataType=PlotDataType.grid2d)
+        return fm
+
+    fig = Figure()
+    for plotType in [PlotType.image, PlotType.colormesh, PlotType.scatter2d]:
+        fm = plot(11, plotType=plotType)
+        ax = fig.axes[0]
+        artist, = fm.dataArtists()
+        assert not fm.updatedInPlace
+
+        fm2 = plot(11, plotType=plotType, previous=fm)
+        assert fm2.updatedInPlace and fm2.onlyDataChanged
+        assert fm2.dataArtists() == [artist] and fig.axes[0] is ax
+
+        fm3 = plot(11, zmax=4., plotType=plotType, previous=fm2)
+        assert fm3.updatedInPlace and not fm3.onlyDataChanged
+        assert fm3.dataArtists() == [artist] and artist.norm.vmax == 4.
+
+    # a different grid can't be shown by the same mesh
+    fm4 = plot(21, plotType=PlotType.colormesh, previous=fm3)
+    assert fm4.updatedInPlace is False
+    # changing the plot type changes the structure of the figure
+    fm5 = plot(21, plotType=PlotType.image, previous=fm4)
+    assert not fm5.updatedInPlace and fig.axes[0] is not ax
+
+    with FigureMaker(fig) as fm:
+        fm.plotType = PlotType.singletraces
+        fm.addData(np.arange(5.), np.arange(5.), labels=['x', 'y'],
+                   plotDataType=PlotDataType.line1d)
+    line, = fm.dataArtists()
+    with FigureMaker(fig, previous=fm) as fm:
+        fm.plotType = PlotType.singletraces
+        fm.addData(np.arange(10.), np.arange(10.), labels=['x', 'y'],
+                   plotDataType=PlotDataType.line1d)
+    assert fm.updatedInPlace and fm.dataArtists() == [line]
+    assert line.get_xdata().size == 10 and line.axes.get_xlim()[1] >= 9
+
+
+def test_pyqtgraph_scatter_colors(qtbot):
+    """Check that 2D scatter points are colored through a lookup table of
+    shared brushes."""
+    from plottr.plot.pyqtgraph.plots import PlotWithColorbar
+
+    plot = PlotWithColorbar()
+    qtbot.addWidget(plot)
+    x = np.arange(1000.)
+    z = np.linspace(0, 1, x.size)
+    z[0] = np.nan
+    plot.setScatter2d(x, x, z)
+    plot.colorbar.setLevels((0.25, 0.75))
+    plot._colorScatterPoints(plot.colorbar)
+
+    brushes = plot.scatter.data['brush']
+    assert len({id(b) for b in brushes}) <= plot.scatterLutSize + 1
+    assert brushes[0].color().alpha() == 0
+    assert brushes[1] is brushes[250]
+    assert brushes[-1] is brushes[750]
+    assert brushes[1] is not brushes[-1]
+
+
+def test_large_image_plot(monkeypatch):
+    """Check that large images are shown at the resolution of the axes, and
+    at full resolution where zoomed in."""
+    from plottr.plot.mpl import plotting
+
+    lod = {'image_lod_threshold': 1000, 'image_lod_pooling': 'mean'}
+    config_entry = plotting.config_entry
+    monkeypatch.setattr(
+        plotting, 'config_entry',
+        lambda *names, default=None: lod[names[-1]] if names[-1] in lod
+        else config_entry(*names, default=default))
+    x, y = np.meshgrid(np.linspace(0, 1, 2000), np.linspace(-1, 1, 1001),
+                       indexing='ij')
+    z = x * y
+    fig, ax = plt.subplots(1, 1, figsize=(2, 2), dpi=100)
+
+    # both axes are ~150 pixels, so we can reduce by a factor of 4.
+    im = colorplot2d(ax, x, y, z, PlotType.image)
+    assert im.get_array().shape == (251, 500)
+    assert im.get_extent() == [0, 1, -1, 1]
+
+    ax.set_xlim(0.5, 0.55)
+    ax.set_ylim(0, 0.1)
+    x0, x1, y0, y1 = im.get_extent()
+    assert x0 <= 0.5 and x1 >= 0.55 and y0 <= 0 and y1 >= 0.1
+    i0, j0 = round(x0 * 2000), round((y0 + 1) * 1001 / 2)
+    i1, j1 = round(x1 * 2000), round((y1 + 1) * 1001 / 2)
+    assert np.allclose(im.get_array(), z[i0:i1, j0:j1].T)
+
+    im = colorplot2d(ax, x, y, z, PlotType.colormesh)
+    assert im.get_array().shape == (500, 251)
+
+    # the pooling method is configurable.
+    lod['image_lod_pooling'] = 'max'
+    im = colorplot2d(ax, x, y, z, PlotType.colormesh)
+    assert np.isclose(im.get_array().max(), z.max())
+    plt.close(fig)
+
+    # axes without a size are not reduced (and must not hang).
+    from matplotlib.figure import Figure
+    ax = Figure(figsize=(0, 0)).add_subplot()
+    assert plotting._lodFactor(ax, (3000, 3000)) == 1
+    im = colorplot2d(ax, x, y, z, PlotType.image)
+    assert im.get_array().shape == (1001, 2000)
+
+
+def test_pyqtgraph_large_image(qtbot, monkeypatch):
+    """Check that large pyqtgraph images show the visible part at screen
+    resolution."""
+    from plottr.plot.pyqtgraph import plots
+
+    config_entry = plots.config_entry
+    monkeypatch.setattr(
+        plots, 'config_entry',
+        lambda *names, default=None: 1000 if names[-1] == 'image_lod_threshold'
+        else config_entry(*names, default=default))
+
+    plot = plots.PlotWithColorbar()
+    qtbot.addWidget(plot)
+    plot.resize(400, 400)
+    plot.show()
+    x, y = np.meshgrid(np.arange(2000.), np.arange(1000.), indexing='ij')
+    plot.setImage(x, y, x + y)
+    assert len(plot.imgPyramid.levels) == 4
+    assert plot.img.image.shape[0] < 2000
+
+    viewBox = plot.plot.getViewBox()
+    viewBox.setRange(xRange=(1000, 1100), yRange=(500, 550), padding=0)
+    rect = plot.img.mapRectToParent(plot.img.boundingRect())
+    assert rect.left() <= 1000 and rect.right() >= 1098
+    # zoomed in that far, we see the full resolution
+    assert np.isclose(rect.width() / plot.img.image.shape[0], 1999 / 2000)